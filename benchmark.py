@@ -0,0 +1,396 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import statistics
+from typing import Callable, Union
+from PyQt5.QtCore import(
+    QT_VERSION_STR,
+    QRectF
+)
+from PyQt5.QtGui import(
+    QImage,
+    QPainter
+)
+from PyQt5.QtWidgets import(
+    QApplication,
+    QGraphicsView
+)
+import modules.GraphSolver as gs
+import modules.QGraphicsViewManager as Q_GVM
+import modules.FileManager as fm
+import modules.GraphGenerator as gg
+import modules.MemoryReport as mr
+import modules.NodeOrder as node_order
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_BUDGET = 30.0
+
+class Benchmark:
+    def __init__(
+        self, 
+        sizes: list[int],
+        repeat: int = 3,
+        budget: float = DEFAULT_BUDGET,
+        max_connections: int = 3,
+        seed: int = 0,
+        memory: bool = False,
+        orders: tuple = ()
+    ) -> None:
+        """Runs the hot paths of the editor on generated graphs
+
+        Args:
+            sizes (list[int]): Amount of generated nodes for each run
+            repeat (int, optional): How often each measurement is repeated. Defaults to 3.
+            budget (float, optional): Seconds a single run may take before larger sizes are skipped. Defaults to DEFAULT_BUDGET.
+            max_connections (int, optional): Maximum connections per generated node. Defaults to 3.
+            seed (int, optional): Seed for the random generator. Defaults to 0.
+            memory (bool, optional): Whether the memory of each graph is measured as well. Defaults to False.
+            orders (tuple, optional): Node orders of NodeOrder.ORDERS the solver is measured with as well. Defaults to ().
+        """
+        self.sizes = sorted(sizes)
+        self.repeat = repeat
+        self.budget = budget
+        self.max_connections = max_connections
+        self.seed = seed
+        self.memory = memory
+        self.orders = tuple(orders)
+        
+        self.graphicsView = QGraphicsView()
+        self.graphicsView.resize(571, 271)
+        self.results = {}
+        self.skipped = set()
+    
+    def _new_qgvm(self) -> Q_GVM.QGraphicsViewManager:
+        """Returns an empty QGraphicsViewManager on the benchmark view
+
+        Returns:
+            Q_GVM.QGraphicsViewManager: QGraphicsViewManager
+        """
+        return Q_GVM.QGraphicsViewManager(self.graphicsView)
+    
+    def generate(
+        self, 
+        size: int
+    ) -> Q_GVM.QGraphicsViewManager:
+        """Generates a graph of the given size with the GraphGenerator
+
+        Args:
+            size (int): Amount of nodes
+
+        Returns:
+            Q_GVM.QGraphicsViewManager: QGraphicsViewManager holding the graph
+        """
+        random.seed(self.seed + size)
+        qgvm = self._new_qgvm()
+        
+        graph_gen = gg.GraphGenerator(size, self.max_connections, qgvm)
+        graph_gen.generate_nodes()
+        graph_gen.set_connections()
+        graph_gen.create_lines()
+        graph_gen.insert_to_graphicsview()
+        return qgvm
+    
+    def _solver(
+        self, 
+        qgvm: Q_GVM.QGraphicsViewManager,
+        order: str = None
+    ) -> gs.GraphSolver:
+        """Creates a GraphSolver from the first to the last node
+
+        Args:
+            qgvm (Q_GVM.QGraphicsViewManager): QGraphicsViewManager holding the graph
+            order (str, optional): Order the nodes are renumbered in by set_neighbors. Defaults to None.
+
+        Returns:
+            gs.GraphSolver: GraphSolver
+        """
+        start = (0, qgvm.objects[0])
+        end = (len(qgvm.objects) - 1, qgvm.objects[-1])
+        
+        graph_solver = gs.GraphSolver(
+            start = start,
+            end = end,
+            points = qgvm.objects,
+            lines = qgvm.lines,
+            graphicsView = qgvm,
+            edges = qgvm.edge_indices()
+        )
+        graph_solver.extract_end_nodes(start, end)
+        graph_solver.order = order
+        return graph_solver
+    
+    def measure(
+        self, 
+        name: str,
+        size: int,
+        func: Callable,
+        setup: Callable = None
+    ):
+        """Measures a function and stores the timings in self.results
+
+        Args:
+            name (str): Name of the benchmark
+            size (int): Size of the graph
+            func (Callable): Function that is measured, receives the result of setup
+            setup (Callable, optional): Function that is called before each run and not measured. Defaults to None.
+
+        Returns:
+            object: Result of the last run of func, None if the benchmark was skipped
+        """
+        entry = self.results.setdefault(name, {})
+        
+        if name in self.skipped:
+            entry[str(size)] = {'skipped': True}
+            return None
+        
+        runs = []
+        for _ in range(self.repeat):
+            arg = setup() if setup else None
+            
+            timestamp_start = time.perf_counter()
+            result = func(arg)
+            runs.append(time.perf_counter() - timestamp_start)
+            
+            if runs[-1] > self.budget:
+                self.skipped.add(name)
+                break
+        
+        entry[str(size)] = {
+            'min': min(runs),
+            'median': statistics.median(runs),
+            'runs': runs
+        }
+        print(f"{name:<24}{size:>10}  {statistics.median(runs):.6f}s")
+        return result
+    
+    def run_size(
+        self, 
+        size: int
+    ) -> None:
+        """Runs every benchmark for one graph size
+
+        Args:
+            size (int): Amount of generated nodes
+        """
+        qgvm = self.measure("GraphGenerator", size, lambda _: self.generate(size))
+        
+        def solver_with_neighbors(order: str = None) -> gs.GraphSolver:
+            graph_solver = self._solver(qgvm, order)
+            graph_solver.set_neighbors()
+            return graph_solver
+        
+        self.measure("set_neighbors", size, lambda solver: solver.set_neighbors(), lambda: self._solver(qgvm))
+        if "set_neighbors" in self.skipped:
+            self.skipped.add("solve_graph")
+        self.measure("solve_graph", size, lambda solver: solver.solve_graph(), solver_with_neighbors)
+        
+        for order in self.orders: # renumbering is paid for once in set_neighbors, the searches on the graph profit from it
+            if "set_neighbors" in self.skipped:
+                self.skipped.add(f"set_neighbors.{order}")
+            self.measure(f"set_neighbors.{order}", size, lambda solver: solver.set_neighbors(), lambda: self._solver(qgvm, order))
+            if f"set_neighbors.{order}" in self.skipped:
+                self.skipped.add(f"solve_graph.{order}")
+            self.measure(f"solve_graph.{order}", size, lambda solver: solver.solve_graph(), lambda: solver_with_neighbors(order))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "benchmark.ens")
+            file_manager = fm.FileManager(qgvm)
+            self.measure("convert_to_json", size, lambda _: file_manager.convert_to_json(filename))
+            
+            loaded = self._new_qgvm()
+            loader = fm.FileManager(loaded)
+            self.measure("convert_to_list", size, lambda _: loader.convert_to_list(filename), loaded.clear_objects)
+        
+        self.measure("refresh_scene", size, lambda _: qgvm.refresh_scene())
+        self.measure("paint", size, lambda _: self.paint(qgvm))
+        
+        if self.memory:
+            self.measure_memory(size, qgvm, file_manager)
+        
+        self.measure("unload_nodes", size, lambda _: self.unload(qgvm)) # last, it shrinks the graph
+    
+    def measure_memory(
+        self, 
+        size: int, 
+        qgvm: Q_GVM.QGraphicsViewManager, 
+        file_manager: fm.FileManager
+    ) -> None:
+        """Measures the memory of a graph and stores the bytes of each category in self.results
+
+        Args:
+            size (int): Size of the graph
+            qgvm (Q_GVM.QGraphicsViewManager): QGraphicsViewManager holding the graph
+            file_manager (fm.FileManager): FileManager of the graph
+        """
+        report = mr.MemoryReport(qgvm, file_manager).measure()
+        
+        values = {f"memory.{category}": report.total(category) for category in report.CATEGORIES}
+        values["memory.per_node"] = report.per_unit('node')
+        values["memory.per_edge"] = report.per_unit('edge')
+        for name, value in values.items():
+            self.results.setdefault(name, {})[str(size)] = {'bytes': value}
+        
+        print(f"{'memory':<24}{size:>10}  {report.total() / 1024:.1f}KiB, {report.per_unit('node'):.0f}B/node, {report.per_unit('edge'):.0f}B/edge")
+    
+    def paint(
+        self, 
+        qgvm: Q_GVM.QGraphicsViewManager
+    ) -> None:
+        """Paints the part of the scene the view starts on into an offscreen image
+
+        Args:
+            qgvm (Q_GVM.QGraphicsViewManager): QGraphicsViewManager holding the scene
+        """
+        image = QImage(self.graphicsView.width(), self.graphicsView.height(), QImage.Format_ARGB32)
+        painter = QPainter(image)
+        qgvm.scene.render(painter, QRectF(image.rect()), QRectF(image.rect()))
+        painter.end()
+    
+    def unload(
+        self, 
+        qgvm: Q_GVM.QGraphicsViewManager
+    ) -> None:
+        """Unloads the first tenth of the nodes like an evicted tile and refreshes the scene
+        
+        Raises a RuntimeError if a line does not end at its nodes anymore, the indices of the views shifted.
+
+        Args:
+            qgvm (Q_GVM.QGraphicsViewManager): QGraphicsViewManager holding the graph
+        """
+        qgvm.unload_nodes(qgvm.objects.ids[:len(qgvm.objects) // 10])
+        qgvm.refresh_scene()
+        
+        objects = qgvm.objects
+        for (u, v), line in qgvm.edges.edges.items():
+            if line is None:
+                continue
+            node1 = objects[objects.index_of_id(u)]
+            node2 = objects[objects.index_of_id(v)]
+            drawn = line.graphics_item.line()
+            ends = {(drawn.x1(), drawn.y1()), (drawn.x2(), drawn.y2())}
+            if ends != {(node1.x(), node1.y()), (node2.x(), node2.y())}:
+                raise RuntimeError(f"Line between {u} and {v} does not end at its nodes after unloading")
+    
+    def skip_size(
+        self, 
+        size: int
+    ) -> None:
+        """Marks every benchmark of a size as skipped without generating its graph
+
+        Args:
+            size (int): Amount of generated nodes
+        """
+        for entry in self.results.values():
+            entry[str(size)] = {'skipped': True}
+        print(f"{'skipped':<24}{size:>10}  over the budget of {self.budget}s")
+    
+    def run(self) -> dict:
+        """Runs every benchmark for every size
+        
+        Once a run of a size went over the budget every larger size is skipped, its graph is not generated either.
+
+        Returns:
+            dict: Machine-readable results including some information about the environment
+        """
+        for size in self.sizes:
+            if self.skipped: # a smaller size went over the budget, the larger ones would only take longer
+                self.skip_size(size)
+            else:
+                self.run_size(size)
+        
+        return {
+            'meta': {
+                'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'qt': QT_VERSION_STR,
+                'repeat': self.repeat,
+                'max_connections': self.max_connections,
+                'seed': self.seed,
+                'orders': list(self.orders)
+            },
+            'results': self.results
+        }
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    threshold: float = DEFAULT_THRESHOLD
+) -> list:
+    """Compares results against a baseline and returns every regression
+    
+    Timings are compared by their median, memory measurements by their bytes.
+
+    Args:
+        results (dict): Results of the current run
+        baseline (dict): Results of a previous run
+        threshold (float, optional): Allowed growth, 0.2 means 20% slower or larger. Defaults to DEFAULT_THRESHOLD.
+
+    Returns:
+        list: Tuples of (benchmark, size, baseline value, current value)
+    """
+    regressions = []
+    
+    for name, sizes in results['results'].items():
+        for size, timing in sizes.items():
+            old = baseline['results'].get(name, {}).get(size)
+            key = 'bytes' if 'bytes' in timing else 'median'
+            
+            if not old or key not in old or key not in timing:
+                continue
+            
+            if timing[key] > old[key] * (1 + threshold):
+                regressions.append((name, size, old[key], timing[key]))
+    return regressions
+
+
+def main(argv: Union[list, None] = None) -> int:
+    parser = argparse.ArgumentParser(description = "Benchmarks the hot paths of the editor")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = DEFAULT_SIZES)
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--budget", type = float, default = DEFAULT_BUDGET, help = "seconds per run before larger sizes are skipped")
+    parser.add_argument("--output", default = "benchmark_results.json")
+    parser.add_argument("--baseline", default = "benchmark_baseline.json")
+    parser.add_argument("--threshold", type = float, default = DEFAULT_THRESHOLD)
+    parser.add_argument("--save-baseline", action = "store_true")
+    parser.add_argument("--memory", action = "store_true", help = "measure the memory of each graph as well")
+    parser.add_argument("--orders", nargs = "*", choices = node_order.ORDERS, default = [], help = "node orders the solver is measured with as well")
+    args = parser.parse_args(argv)
+    
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = Benchmark(args.sizes, args.repeat, args.budget, memory = args.memory, orders = args.orders).run()
+    
+    with open(args.output, "w") as j:
+        json.dump(results, j, indent=4)
+    
+    if args.save_baseline:
+        with open(args.baseline, "w") as j:
+            json.dump(results, j, indent=4)
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"No baseline found at {args.baseline}")
+        return 0
+    
+    with open(args.baseline, "r") as j:
+        baseline = json.load(j)
+    
+    regressions = compare(results, baseline, args.threshold)
+    for name, size, old, new in regressions:
+        if name.startswith("memory."):
+            print(f"REGRESSION {name} @ {size}: {old:.0f}B -> {new:.0f}B")
+        else:
+            print(f"REGRESSION {name} @ {size}: {old:.6f}s -> {new:.6f}s")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,58 +1,198 @@
+import time
+_startup_timestamp = time.perf_counter_ns() # the startup phases are measured from here, before the imports
+
 import sys
 import random
+import logging
 import modules.core as core
-import modules.GraphSolver as gs
+import modules.utils as utils
 import modules.QGraphicsViewManager as Q_GVM
 import modules.FileManager as fm
-import modules.GraphGenerator as gg
 import modules.MoveAgent as ma
+import modules.Profiler as prof
+import modules.TracePlayer as tp
+import modules.EditJournal as ej
+import modules.ResultCache as rc
+import modules.palette as palette
 import PyQt5.QtWidgets as QtWidgets
-from typing import Union
-import time
-from PyQt5.QtCore import Qt
+from typing import(
+    Union,
+    Callable
+)
+from PyQt5.QtCore import(
+    Qt,
+    QPointF,
+    QRectF,
+    QThreadPool,
+    QTimer,
+    QCoreApplication
+)
 from PyQt5.QtGui import(
-    QMouseEvent, 
-    QColor
+    QMouseEvent,
+    QWheelEvent,
+    QPainterPath,
+    QPolygonF
 )
 from PyQt5.QtWidgets import(
     QGraphicsScene,
+    QGraphicsRectItem,
+    QGraphicsPathItem,
     QCheckBox,
     QSpinBox,
-    QFileDialog
+    QFileDialog,
+    QMessageBox,
+    QDialog,
+    QVBoxLayout,
+    QTableWidget,
+    QTableWidgetItem
 )
 from ui.editor_ui import *
 
+# imported on first use, none of them is needed to show the window
+gs = utils.lazy_import("modules.GraphSolver")
+gg = utils.lazy_import("modules.GraphGenerator")
+sw = utils.lazy_import("modules.SolveWorker")
+mr = utils.lazy_import("modules.MemoryReport")
+
+AUTOSAVE_PATH = ".autosave.ens"
+RESULT_CACHE_PATH = ".results.json"
+startup_log = logging.getLogger("editor.startup")
+_imports_timestamp = time.perf_counter_ns()
+
 class Editor(Ui_MainWindow):
     def __init__(
         self, 
         Form
     ) -> None:
         """Initializes the window and connects the functions
+        
+        Only what is needed to show the window happens here, the journal and the search
+        
+        for .ens files are started by deferred_startup once the event loop runs.
 
         Args:
             Form (_type_): Window UI
         """
         super().__init__()
+        self.startup_timings = {'imports': _imports_timestamp - _startup_timestamp} # phase -> nanoseconds
+        self._startup_last = _imports_timestamp
+        self.mark_startup("application") # creating the QApplication and everything else before the editor
+        
         self.setupUi(Form)
+        self.mark_startup("setupUi")
         
         self.QGVM = Q_GVM.QGraphicsViewManager(self.graphicsView)
         self.file_manager = fm.FileManager(self.QGVM)
         self.move_agent = ma.MoveAgent(self.QGVM)
+        self.trace_player = tp.TracePlayer(self.QGVM)
         self.selected_object = None
         self.status = 0
+        self.solver_stats = None
+        self.comparison_dialog = None # table of the last engine comparison
+        self.pan_origin = None # widget position of the last pan step while the middle button is held
+        self.area_item = None # rubber band or lasso while an area is selected
+        self.area_points = [] # scene positions of the area, the origin and the current corner or every lasso point
+        self.area_extend = False
+        
+        self.thread_pool = QThreadPool.globalInstance()
+        self.solve_worker = None
+        self.solve_request = 0
+        self.result_cache = rc.ResultCache(path = RESULT_CACHE_PATH)
+        self.cache_key = None # (content hash, source id, target id) of the running request if its result can be cached
         
         self.max_nodes = 25
         self.max_connections = 3
         
+        self.mark_startup("managers")
+        
+        self.profiler = prof.Profiler()
+        self.instrument_handlers()
+        
         self.connect_functions()
-        self.file_manager.load_ens_files(self.listWidget)
         self.set_defaults()
+        self.mark_startup("connect")
+        
+        QTimer.singleShot(0, self.deferred_startup)
+    
+    def mark_startup(
+        self, 
+        phase: str
+    ) -> None:
+        """Records how long a phase of the startup took, measured from the end of the previous phase
+
+        Args:
+            phase (str): Name of the phase
+        """
+        timestamp = time.perf_counter_ns()
+        self.startup_timings[phase] = timestamp - self._startup_last
+        self._startup_last = timestamp
+    
+    def deferred_startup(self) -> None:
+        """Starts the journal, loads the result cache and searches for .ens files once the window is shown
+        
+        The files are added to the list while they are found, the timings of the startup
+        
+        are logged when the search is done.
+        """
+        self.mark_startup("show")
+        self.start_journal()
+        self.mark_startup("journal")
+        self.result_cache.load()
+        self.mark_startup("results")
+        
+        self.file_scan_start = time.perf_counter_ns()
+        scanner = self.file_manager.scan_ens_files(self.listWidget, self.thread_pool, self.log_startup)
+        
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(scanner.cancel)
+            app.aboutToQuit.connect(self.result_cache.save)
+    
+    def log_startup(
+        self, 
+        found: int
+    ) -> None:
+        """Logs the timing of each phase of the startup
+
+        Args:
+            found (int): Amount of .ens files the search found
+        """
+        shown = sum(self.startup_timings[phase] for phase in ("imports", "application", "setupUi", "managers", "connect", "show"))
+        phases = " ".join(f"{phase}={elapsed / 1e6:.1f}ms" for phase, elapsed in self.startup_timings.items())
+        startup_log.info(
+            f"Window shown after {shown / 1e6:.1f}ms ({phases}), "
+            f"{found} .ens files found after {(time.perf_counter_ns() - self.file_scan_start) / 1e6:.1f}ms"
+        )
+    
+    def instrument_handlers(self) -> None:
+        """Wraps the event entry points so they can be profiled from the menu
+        """
+        self.profiler.instrument(self, [
+            "click_handler",
+            "mouseMoveEvent",
+            "wheel_handler",
+            "initialize_solution",
+            "finalize_solution",
+            "generate_graph",
+            "clear_all",
+            "change_point_status",
+            "refresh_scene",
+            "save_file",
+            "open_file"
+        ], "Editor")
+        self.profiler.instrument(self.QGVM, ["add_point", "refresh_scene", "redraw_objects"], "QGVM")
+        self.profiler.instrument(self.move_agent, ["select_objects", "highlight_selected_objects", "move_selected_objects"])
+        self.profiler.instrument(self.file_manager, ["load_selected_file", "convert_to_list", "convert_to_json"])
+        
+        self.graphicsView.paintEvent = self.profiler.wrap("Qt.paintEvent", self.graphicsView.paintEvent)
     
     def connect_functions(self) -> None:
         """Gives each button its function
         """
         self.graphicsView.mouseMoveEvent = self.mouseMoveEvent
         self.graphicsView.mousePressEvent = self.click_handler
+        self.graphicsView.mouseReleaseEvent = self.release_handler
+        self.graphicsView.wheelEvent = self.wheel_handler
         
         self.pointButton.clicked.connect(lambda: self.change_status(0))
         self.selectionButton.clicked.connect(lambda: self.change_status(1))
@@ -61,15 +201,32 @@ class Editor(Ui_MainWindow):
         self.startCheck.clicked.connect(lambda: self.change_point_status(self.startCheck))
         self.endCheck.clicked.connect(lambda: self.change_point_status(self.endCheck))
         
-        self.clearButton.clicked.connect(self.clear_all)
-        self.startButton.clicked.connect(self.initialize_solution)
-        self.generateButton.clicked.connect(self.generate_graph)
+        self.clearButton.clicked.connect(lambda: self.clear_all())
+        self.startButton.clicked.connect(lambda: self.initialize_solution())
+        self.compareButton.clicked.connect(lambda: self.initialize_comparison())
+        self.cancelButton.clicked.connect(lambda: self.cancel_solution())
+        self.generateButton.clicked.connect(lambda: self.generate_graph())
+        self.rangeButton.clicked.connect(lambda: self.initialize_range())
+        
+        self.playButton.clicked.connect(lambda: self.toggle_playback())
+        self.traceSlider.valueChanged.connect(self.trace_player.seek)
+        self.speedSpin.valueChanged.connect(self.trace_player.set_speed)
+        self.trace_player.step_changed.connect(self.show_trace_step)
         
         self.maxNodeSpin.valueChanged.connect(lambda: self.change_generator_config(self.maxNodeSpin))
         self.maxConSpin.valueChanged.connect(lambda: self.change_generator_config(self.maxConSpin))
         
-        self.saveAction.triggered.connect(self.save_file)
-        self.openAction.triggered.connect(self.open_file)
+        self.saveAction.triggered.connect(lambda: self.save_file())
+        self.saveTilesAction.triggered.connect(lambda: self.save_tiles())
+        self.openAction.triggered.connect(lambda: self.open_file())
+        self.exportStatsAction.triggered.connect(self.export_solver_stats)
+        self.componentsAction.triggered.connect(lambda: self.color_components())
+        
+        self.profilingAction.toggled.connect(self.profiler.set_enabled)
+        self.handlerStatsAction.triggered.connect(self.show_handler_stats)
+        self.saveProfileAction.triggered.connect(self.save_profile)
+        self.memoryReportAction.triggered.connect(self.show_memory_report)
+        self.resultCacheAction.triggered.connect(self.show_cache_stats)
         
         self.listWidget.itemClicked.connect(lambda: self.file_manager.load_selected_file(self.listWidget))
     
@@ -86,6 +243,55 @@ class Editor(Ui_MainWindow):
         self.maxConSpin.setValue(self.max_connections)
     
     
+    def start_journal(self) -> None:
+        """Recovers the work of a crashed session and starts journaling edits
+        
+        The journal is removed again when the editor is closed normally.
+        """
+        self.journal = ej.EditJournal(AUTOSAVE_PATH)
+        
+        if self.journal.has_recovery():
+            replayed = self.journal.recover(self.QGVM.objects, self.QGVM.edges, self.file_manager.load_dict)
+            self.QGVM.content_hash.rebuild(self.QGVM.objects, self.QGVM.edges) # replayed edits bypass record_edit
+            self.QGVM.lod.invalidate()
+            self.QGVM.last_node = self.QGVM.objects[-1].id if self.QGVM.objects else None
+            self.QGVM.mark_changed()
+            self.QGVM.refresh_scene()
+            
+            message = f"Recovered {len(self.QGVM.objects)} nodes ({replayed} edits)"
+            error = self.journal.take_error() # a broken edit only stops the replay, the rest is skipped
+            if error is not None:
+                message += f", the rest of the journal was skipped: {error}"
+            self.statusLabel.setText(message)
+        
+        self.journal.open()
+        self.QGVM.journal = self.journal
+        if self.QGVM.objects:
+            self.journal.compact(self.QGVM.snapshot(), self.file_manager.snapshot_to_dict)
+        
+        self.autosave_timer = QTimer()
+        self.autosave_timer.setInterval(int(self.journal.sync_interval * 1000))
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.autosave_timer.start()
+        
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.journal.discard)
+    
+    def autosave(self) -> None:
+        """Syncs the journal and compacts it into a snapshot once enough edits piled up
+        
+        A failed compaction of the background thread is reported here, on the main thread.
+        """
+        self.journal.sync()
+        
+        error = self.journal.take_error()
+        if error is not None:
+            self.statusLabel.setText(f"Autosave failed, the journal is kept: {error}")
+        
+        if self.journal.needs_compaction():
+            self.journal.compact(self.QGVM.snapshot(), self.file_manager.snapshot_to_dict)
+    
     def save_file(self) -> None:
         """Lets the user save the currently drawn nodes and lines
         
@@ -97,10 +303,92 @@ class Editor(Ui_MainWindow):
         )
         self.file_manager.convert_to_json(filename[0])
     
+    def save_tiles(self) -> None:
+        """Lets the user save the graph in the tiled layout
+        
+        Only the tiles around the viewport are loaded when the file is opened again.
+        """
+        filename = QFileDialog().getSaveFileName(
+            directory = ".\\",
+            filter = "Editor node system (*.ens)"
+        )
+        if filename[0]:
+            self.file_manager.convert_to_tiles(filename[0])
+    
+    def update_tiles(self) -> None:
+        """Streams in the tiles of an opened tiled file after the viewport moved
+        
+        Selections are dropped when nodes were loaded or evicted, their indices are not valid anymore.
+        
+        Tiles loaded for a query are held until it is done, then the cache shrinks back to its budget.
+        """
+        if self.solve_worker is None:
+            self.file_manager.release_tiles()
+        if self.file_manager.update_tiles():
+            self.selected_object = None
+            self.move_agent.clear_selection()
+    
+    def load_all_tiles(self) -> None:
+        """Loads every tile of an opened tiled file, a query on the resident tiles alone would miss paths
+        """
+        if self.file_manager.load_all_tiles():
+            self.selected_object = None
+            self.move_agent.clear_selection()
+    
+    def color_components(self) -> None:
+        """Colours every node and line by its connected component until the scene is refreshed
+        """
+        self.trace_player.unload()
+        components = self.QGVM.color_components()
+        self.statusLabel.setText(f"{components} components")
+    
+    def export_solver_stats(self) -> None:
+        """Lets the user save the stats of the last pathfinding query
+        
+        in a .json file.
+        """
+        if self.solver_stats is None:
+            self.statusLabel.setText("No solver stats to export yet!")
+            return
+        
+        filename = QFileDialog().getSaveFileName(
+            directory = ".\\",
+            filter = "JSON (*.json)"
+        )
+        if filename[0]:
+            self.solver_stats.to_json(filename[0])
+    
+    def show_handler_stats(self) -> None:
+        """Shows the calls and cumulative time of each profiled handler
+        """
+        report = self.profiler.report() or "Nothing has been profiled yet."
+        QMessageBox.information(None, "Handler stats", report)
+    
+    def show_memory_report(self) -> None:
+        """Shows how much memory the graph costs in the model, solver, scene and I/O buffers
+        """
+        report = mr.MemoryReport(self.QGVM, self.file_manager, self.trace_player.trace).measure()
+        QMessageBox.information(None, "Memory report", report.report())
+    
+    def show_cache_stats(self) -> None:
+        """Shows how many results are cached and how often a solve was answered from the cache
+        """
+        QMessageBox.information(None, "Result cache", self.result_cache.summary())
+    
+    def save_profile(self) -> None:
+        """Lets the user save the collected profile in a .pstats file
+        """
+        filename = QFileDialog().getSaveFileName(
+            directory = ".\\",
+            filter = "Profile (*.pstats)"
+        )
+        if filename[0]:
+            self.profiler.dump_stats(filename[0])
+    
     def open_file(self) -> None:
         """Lets the user open a file containing nodes and lines
         """
-        self.QGVM.objects.clear()
+        self.QGVM.clear_objects()
         
         filename = QFileDialog().getOpenFileName(
             directory = ".\\",
@@ -113,50 +401,161 @@ class Editor(Ui_MainWindow):
         self, 
         event: QMouseEvent
     ) -> None:
-        """Refreshes selection and sets text on debug label
+        """Refreshes selection, pans the view while the middle button is held and sets text on debug label
 
         Args:
             event (QMouseEvent): Mouse position / event
         """
+        if self.pan_origin is not None:
+            delta = event.pos() - self.pan_origin
+            self.pan_origin = event.pos()
+            self.QGVM.pan(delta.x(), delta.y())
+            self.update_tiles()
+        
+        if self.area_item is not None:
+            self.drag_area_selection(self.QGVM.map_to_scene(event))
+        
         self.refresh_selection()
-        self.debugLabel.setText(f"{event.x()} | {event.y()}")
+        pos = self.QGVM.map_to_scene(event)
+        self.debugLabel.setText(f"{round(pos.x())} | {round(pos.y())}")
+    
+    def wheel_handler(
+        self, 
+        event: QWheelEvent
+    ) -> None:
+        """Zooms in or out around the mouse cursor
+
+        Args:
+            event (QWheelEvent): Wheel event
+        """
+        self.QGVM.zoom(event.angleDelta().y() / 120)
+        self.update_tiles()
+    
+    def release_handler(
+        self, 
+        event: QMouseEvent
+    ) -> None:
+        """Stops panning when the middle button is released
+
+        Args:
+            event (QMouseEvent): Mouse release
+        """
+        if event.button() == Qt.MiddleButton:
+            self.pan_origin = None
+        
+        elif event.button() == Qt.LeftButton and self.area_item is not None:
+            self.finish_area_selection()
     
     def click_handler(
         self, 
         event: QMouseEvent
     ) -> None:
         """Handles which function should be called when clicking
+        
+        The middle button pans the view in every mode.
 
         Args:
             event (QMouseEvent): Mouse click
         """
+        if event.button() == Qt.MiddleButton:
+            self.pan_origin = event.pos()
+            return
+        
+        pos = self.QGVM.map_to_scene(event)
+        
         if self.status == 0:
             self.selected_object = None
-            self.QGVM.add_point(event)
+            self.QGVM.add_point(pos)
         
         elif self.status == 1:
             if event.button() == Qt.LeftButton:
-                obj = self.QGVM.get_clicked_object(event)
+                obj = self.QGVM.get_clicked_object(pos)
                 
                 if obj:
                     self.selected_object = obj
                     self.show_properties(obj)
+            
+            elif event.button() == Qt.RightButton and self.selected_object is not None:
+                obj = self.QGVM.get_clicked_object(pos)
+                
+                if obj and obj.id != self.selected_object.id:
+                    self.QGVM.toggle_edge(self.selected_object.id, obj.id)
         
         elif self.status == 2:
-            if event.button() == Qt.LeftButton:
-                self.move_agent.select_objects(event)
+            extend = bool(event.modifiers() & Qt.ControlModifier)
+            
+            if event.button() == Qt.LeftButton and not self.QGVM.get_clicked_object(pos):
+                self.start_area_selection(pos, lasso = bool(event.modifiers() & Qt.ShiftModifier), extend = extend)
+            elif event.button() == Qt.LeftButton:
+                self.move_agent.select_objects(pos, extend = extend)
                 self.move_agent.highlight_selected_objects()
             elif event.button() == Qt.RightButton:
-                self.move_agent.move_selected_objects(event)
+                self.move_agent.move_selected_objects(pos)
         
         self.refresh_selection()
     
+    def start_area_selection(
+        self, 
+        pos: QPointF, 
+        lasso: bool = False, 
+        extend: bool = False
+    ) -> None:
+        """Starts dragging a rubber band or a lasso on empty space
+
+        Args:
+            pos (QPointF): Mouse cursor in scene coordinates
+            lasso (bool, optional): Whether a free lasso is drawn instead of a rectangle. Defaults to False.
+            extend (bool, optional): Whether the nodes are added to the selection. Defaults to False.
+        """
+        self.area_points = [pos, pos] if not lasso else [pos]
+        self.area_extend = extend
+        self.area_item = QGraphicsPathItem() if lasso else QGraphicsRectItem(QRectF(pos, pos))
+        self.area_item.setPen(palette.rubber_band_pen())
+        self.area_item.setZValue(2)
+        self.graphicsView.scene().addItem(self.area_item) # the cluster scene while zoomed out
+    
+    def drag_area_selection(
+        self, 
+        pos: QPointF
+    ) -> None:
+        """Moves the corner of the rubber band or adds a point to the lasso
+
+        Args:
+            pos (QPointF): Mouse cursor in scene coordinates
+        """
+        if isinstance(self.area_item, QGraphicsRectItem):
+            self.area_points[1] = pos
+            self.area_item.setRect(QRectF(self.area_points[0], pos).normalized())
+            return
+        
+        self.area_points.append(pos)
+        path = QPainterPath()
+        path.addPolygon(QPolygonF(self.area_points))
+        path.closeSubpath()
+        self.area_item.setPath(path)
+    
+    def finish_area_selection(self) -> None:
+        """Selects every node inside the rubber band or lasso and removes it from the scene
+        """
+        if isinstance(self.area_item, QGraphicsRectItem):
+            self.move_agent.select_area(QRectF(*self.area_points).normalized(), extend = self.area_extend)
+        else:
+            self.move_agent.select_lasso(self.area_points, extend = self.area_extend)
+        
+        if self.area_item.scene() is not None:
+            self.area_item.scene().removeItem(self.area_item)
+        self.area_item = None
+        self.area_points = []
+        
+        self.move_agent.highlight_selected_objects()
+        self.statusbar.showMessage(f"{len(self.move_agent.selected_objects)} nodes selected")
+    
     def clear_all(self) -> None:
         """Clears everything
         """
         self.selected_object = None
-        self.QGVM.scene.clear()
-        self.QGVM.objects.clear()
+        self.file_manager.close_tiles()
+        self.QGVM.clear_objects()
     
     def show_properties(
         self, 
@@ -205,10 +604,10 @@ class Editor(Ui_MainWindow):
             self.statusLabel.setText("Drawing nodes")
         
         elif self.status == 1:
-            self.statusLabel.setText("Selecting nodes")
+            self.statusLabel.setText("Selecting nodes\nRight click connects / disconnects")
         
         elif self.status == 2:
-            self.statusLabel.setText("Moving nodes")
+            self.statusLabel.setText("Moving nodes\nDrag selects an area, Shift lassos, Ctrl adds")
     
     def refresh_scene(
         self,
@@ -233,78 +632,445 @@ class Editor(Ui_MainWindow):
         """
         if checkBox == self.startCheck:
             self.selected_object.is_start = self.startCheck.isChecked()
-            
-            if self.selected_object.is_start:
-                self.selected_object.color = QColor(0, 255, 0, 255)
-            else:
-                self.selected_object.color = QColor(0, 0, 0, 255)
         
         elif checkBox == self.endCheck:
             self.selected_object.is_end = self.endCheck.isChecked()
-            
-            if self.selected_object.is_end:
-                self.selected_object.color = QColor(255, 0, 0, 255)
-            else:
-                self.selected_object.color = QColor(0, 0, 0, 255)
         
-        self.refresh_scene()
+        self.selected_object.setState(palette.node_state(self.selected_object))
+        self.QGVM.mark_changed()
+        self.QGVM.record_edit("flag", node = self.selected_object)
     
-    def _set_start_end(self) -> Union[int, core.Knoten, None, None]:
-        """Sets the start and end node and returns them including their index in the nodes list
+    def _set_start_end(self) -> tuple[list, list]:
+        """Returns every start and end node including their index in the nodes list
 
         Returns:
-            Union[(int, core.Knoten), (None, None)]: Either returns the index and node or None
+            tuple[list, list]: Lists of (index, node) of the start and end nodes, both empty if one of them is missing
         """
+        starts = []
+        ends = []
+        
         for i, node in enumerate(self.QGVM.objects):
             if node.is_start:
-                start = (i, node)
+                starts.append((i, node))
             
             elif node.is_end:
-                end = (i, node)
+                ends.append((i, node))
         
-        try:
-            start, end
-        except:
+        if not starts or not ends:
             self.statusLabel.setText("Start or End node is not defined!")
-            return (None, None)
-        return (start, end)
+            return ([], [])
+        return (starts, ends)
     
     def initialize_solution(self) -> None:
         """Initializes the pathfinding
+        
+        A snapshot of the graph is solved in the thread pool,
+        
+        a request that is still running is cancelled first. Queries between one start
+        
+        and one end node are answered from the result cache if the graph was solved before.
+        """
+        self.load_all_tiles()
+        self.trace_player.unload()
+        self.traceSlider.setMaximum(0)
+        self.refresh_scene()
+        starts, ends = self._set_start_end()
+        
+        if starts and ends:
+            self.cancel_solution()
+            
+            snapshot = self.QGVM.snapshot()
+            starts = [(i, snapshot.points[i]) for i, _ in starts]
+            ends = [(i, snapshot.points[i]) for i, _ in ends]
+            
+            self.cache_key = None
+            if len(starts) == 1 and len(ends) == 1 and self.routeSpin.value() == 1 and not self.recordCheck.isChecked():
+                self.cache_key = (snapshot.content_hash, starts[0][1].id, ends[0][1].id)
+                cached = self.result_cache.get(*self.cache_key)
+                if cached is not None:
+                    self.show_cached_solution(snapshot, *cached)
+                    return
+            
+            graph_solver = gs.GraphSolver(
+                start = starts[0], 
+                end = ends[0], 
+                points = snapshot.points,
+                lines = snapshot.lines,
+                graphicsView = self.QGVM,
+                edges = snapshot.edges,
+                components = snapshot.components
+            )
+            graph_solver.extract_terminals(starts, ends)
+            graph_solver.all_targets = self.allTargetsCheck.isChecked()
+            graph_solver.record_trace = self.recordCheck.isChecked()
+            graph_solver.routes = self.routeSpin.value()
+            graph_solver.max_overlap = self.overlapSpin.value() / 100
+            graph_solver.parallel_spurs = self.parallelCheck.isChecked()
+            
+            self._start_worker(graph_solver, snapshot.version, self.finalize_solution)
+    
+    def initialize_range(self) -> None:
+        """Finds every node within the bands of the range tab around the start nodes
+        
+        The bounded search runs on a snapshot in the thread pool like the pathfinding.
+        """
+        try:
+            thresholds = sorted({float(value) for value in self.bandEdit.text().replace(";", ",").split(",") if value.strip()})
+        except ValueError:
+            thresholds = []
+        
+        if not thresholds or thresholds[0] <= 0:
+            self.statusLabel.setText("Bands have to be positive distances like 100, 200, 300")
+            return
+        
+        self.load_all_tiles()
+        self.trace_player.unload()
+        self.traceSlider.setMaximum(0)
+        self.refresh_scene()
+        
+        snapshot = self.QGVM.snapshot()
+        starts = [(i, point) for i, point in enumerate(snapshot.points) if point.is_start]
+        if not starts:
+            self.statusLabel.setText("Start node is not defined!")
+            return
+        
+        self.cancel_solution()
+        graph_solver = gs.GraphSolver(
+            start = starts[0], 
+            end = starts[0], 
+            points = snapshot.points,
+            lines = snapshot.lines,
+            graphicsView = self.QGVM,
+            edges = snapshot.edges,
+            components = snapshot.components
+        )
+        graph_solver.extract_terminals(starts, starts[:1]) # a range query has no end node
+        graph_solver.thresholds = thresholds
+        self._start_worker(graph_solver, snapshot.version, self.finalize_range)
+    
+    def initialize_comparison(self) -> None:
+        """Runs every engine of the GraphSolver on the first start and end node
+        
+        The engines are compared on a snapshot in the thread pool like the pathfinding.
         """
+        self.load_all_tiles()
+        self.trace_player.unload()
+        self.traceSlider.setMaximum(0)
         self.refresh_scene()
-        start, end = self._set_start_end()
+        starts, ends = self._set_start_end()
         
-        if start and end:
+        if starts and ends:
+            self.cancel_solution()
+            
+            snapshot = self.QGVM.snapshot()
+            start = (starts[0][0], snapshot.points[starts[0][0]])
+            end = (ends[0][0], snapshot.points[ends[0][0]])
+            
             graph_solver = gs.GraphSolver(
                 start = start, 
                 end = end, 
-                points = self.QGVM.objects,
-                lines = self.QGVM.lines,
-                graphicsView = self.QGVM
+                points = snapshot.points,
+                lines = snapshot.lines,
+                graphicsView = self.QGVM,
+                edges = snapshot.edges,
+                components = snapshot.components
             )
             graph_solver.extract_end_nodes(start, end)
-            graph_solver.set_neighbors()
-            self.finalize_solution(graph_solver)
+            graph_solver.engines = tuple(gs.GraphSolver.ENGINES)
+            self.cache_key = (snapshot.content_hash, start[1].id, end[1].id)
+            
+            self._start_worker(graph_solver, snapshot.version, self.finalize_comparison)
+    
+    def show_cached_solution(
+        self, 
+        snapshot: "GraphSnapshot", 
+        distance: float, 
+        path: list
+    ) -> None:
+        """Draws a path that was taken from the result cache
+
+        Args:
+            snapshot (GraphSnapshot): Snapshot of the current graph
+            distance (float): Distance of the path
+            path (list): Ids of the nodes of the path
+        """
+        points = [snapshot.points[self.QGVM.objects.index_of_id(node_id)] for node_id in path]
+        for i in range(1, len(points)):
+            self.QGVM.add_item(core.Kante(points[i - 1], points[i], palette.PATH))
+        
+        self.statusLabel.setText(f"Total distance: {round(distance, 2)}px.\tCached result\nNodes on the path: {len(points)}")
+        self.statusbar.showMessage(f"Result cache: {self.result_cache.summary()}")
+    
+    def _start_worker(
+        self, 
+        graph_solver: "gs.GraphSolver", 
+        version: int, 
+        finished: Callable
+    ) -> None:
+        """Runs a solver in the thread pool as the current request
+
+        Args:
+            graph_solver (gs.GraphSolver): Solver working on a snapshot
+            version (int): Version of the graph the snapshot was taken of
+            finished (Callable): Slot that receives the request id and the result
+        """
+        self.solve_request += 1
+        self.solve_worker = sw.SolveWorker(self.solve_request, graph_solver, version)
+        self.solve_worker.signals.progress.connect(self.show_solve_progress)
+        self.solve_worker.signals.finished.connect(finished)
+        self.solve_worker.signals.cancelled.connect(lambda request_id: self._end_solution(request_id, "Solving cancelled"))
+        self.solve_worker.signals.failed.connect(lambda request_id, error: self._end_solution(request_id, f"Solving failed: {error}"))
+        
+        self.cancelButton.setEnabled(True)
+        self.statusLabel.setText("Solving...")
+        self.thread_pool.start(self.solve_worker)
+    
+    def cancel_solution(self) -> None:
+        """Cancels the running pathfinding request if there is one
+        """
+        if self.solve_worker is not None:
+            self.solve_worker.cancel()
+            self._end_solution(self.solve_worker.request_id, "Solving cancelled")
+    
+    def _is_current_request(
+        self, 
+        request_id: int
+    ) -> bool:
+        """Returns whether or not the request is the one that is running right now
+
+        Args:
+            request_id (int): Id of the request
+
+        Returns:
+            bool: True if the results of the request should be shown
+        """
+        return self.solve_worker is not None and self.solve_worker.request_id == request_id
+    
+    def _end_solution(
+        self, 
+        request_id: int, 
+        message: str
+    ) -> None:
+        """Stops tracking a request and shows a message
+
+        Args:
+            request_id (int): Id of the request
+            message (str): Message for the status label
+        """
+        if self._is_current_request(request_id):
+            self.solve_worker = None
+            self.cancelButton.setEnabled(False)
+            self.statusLabel.setText(message)
+    
+    def show_solve_progress(
+        self, 
+        request_id: int, 
+        settled: int
+    ) -> None:
+        """Shows how many nodes the running request has settled
+
+        Args:
+            request_id (int): Id of the request
+            settled (int): Settled nodes
+        """
+        if self._is_current_request(request_id):
+            self.statusbar.showMessage(f"Solving... {settled} nodes settled")
     
     def finalize_solution(
         self, 
-        gs: gs.GraphSolver
+        request_id: int, 
+        result: tuple
     ) -> None:
-        """Finalizes the path finding
+        """Finalizes the path finding and draws the path
+        
+        Results of stale requests are ignored.
 
         Args:
-            gs (gs.GraphSolver): GraphSolver
+            request_id (int): Id of the request
+            result (tuple): Path, distance and SolverStats returned by GraphSolver.solve_graph
         """
-        timestamp_start = time.time()
-        path, distance, nodes_traveled = gs.solve_graph()
-        timestamp_end = time.time()
+        if not self._is_current_request(request_id):
+            return
+        
+        graph_solver = self.solve_worker.graph_solver
+        version = self.solve_worker.version
+        self.solve_worker = None
+        self.cancelButton.setEnabled(False)
+        
+        path, distance, stats = result
+        self.solver_stats = stats
+        self.statusbar.showMessage(stats.summary())
+        
+        if stats.unreachable:
+            self.statusLabel.setText("Unreachable: no end point is connected to a start point")
+            return
+        
+        for (route, _), state in zip(graph_solver.alternatives[1:], palette.ROUTES[1:]): # drawn below the shortest path
+            for i in range(1, len(route)):
+                graph_solver.connect_points(route[i - 1], route[i], state)
+        
+        for _, _, route, _ in graph_solver.target_routes[1:]:
+            for i in range(1, len(route)):
+                graph_solver.connect_points(route[i - 1], route[i], palette.PATH)
         
         for i in range(len(path)):
             if i > 0:
-                gs.connect_points(path[i - 1], path[i], QColor(255, 0, 128, 255))
+                graph_solver.connect_points(path[i - 1], path[i], palette.PATH)
+        
+        if self.cache_key is not None:
+            self.result_cache.put(*self.cache_key, distance, [point.id for point in path])
+        
+        status = f"Total distance: {round(distance, 2)}px.\tTime: {stats.total_ns() / 1e6:.3f}ms\nNodes settled: {stats.settled}"
+        if len(graph_solver.sources) > 1 or len(graph_solver.targets) > 1:
+            status += "\t" + ", ".join(
+                f"{graph_solver.points[source].id} -> {graph_solver.points[target].id}: {round(d, 2)}px"
+                for source, target, _, d in graph_solver.target_routes
+            )
+        if len(graph_solver.alternatives) > 1:
+            status += "\tRoutes: " + ", ".join(f"{round(d, 2)}px" for _, d in graph_solver.alternatives)
+        self.statusLabel.setText(status)
+        
+        if graph_solver.trace is not None:
+            self.trace_player.load(graph_solver.trace, version)
+            self.traceSlider.setMaximum(len(graph_solver.trace))
+    
+    def finalize_range(
+        self, 
+        request_id: int, 
+        result: "gs.RangeResult"
+    ) -> None:
+        """Colours the nodes in range by their band
+        
+        Results of stale requests or of a graph that was edited meanwhile are ignored.
+
+        Args:
+            request_id (int): Id of the request
+            result (gs.RangeResult): Nodes in range returned by GraphSolver.range_query
+        """
+        if not self._is_current_request(request_id):
+            return
+        
+        stats = self.solve_worker.graph_solver.stats
+        version = self.solve_worker.version
+        self.solve_worker = None
+        self.cancelButton.setEnabled(False)
+        self.solver_stats = stats
+        self.statusbar.showMessage(stats.summary())
+        
+        if version != self.QGVM.version:
+            self.statusLabel.setText("The graph changed while searching, run the range query again")
+            return
+        
+        self.QGVM.color_bands(result)
+        bands = result.by_band()
+        self.statusLabel.setText(f"{len(result)} nodes in range\t" + ", ".join(
+            f"<= {round(threshold, 2)}px: {len(band)}" for threshold, band in zip(result.thresholds, bands)
+        ))
+    
+    def finalize_comparison(
+        self, 
+        request_id: int, 
+        runs: list
+    ) -> None:
+        """Shows the timings of every engine and colours the region each one explored
+        
+        Results of stale requests are ignored, the regions are only coloured if the graph was not edited meanwhile.
+
+        Args:
+            request_id (int): Id of the request
+            runs (list): EngineRun of each engine returned by GraphSolver.compare_engines
+        """
+        if not self._is_current_request(request_id):
+            return
+        
+        graph_solver = self.solve_worker.graph_solver
+        version = self.solve_worker.version
+        self.solve_worker = None
+        self.cancelButton.setEnabled(False)
+        self.solver_stats = runs[0].stats
+        self.statusbar.showMessage(runs[0].stats.summary())
+        
+        for run in runs:
+            if not run.stats.unreachable:
+                self.result_cache.put(*self.cache_key, run.distance, [point.id for point in run.path], run.engine)
+        
+        if graph_solver.engines_agree(runs):
+            status = f"Engines agree on {round(runs[0].distance, 2)}px"
+        else:
+            status = "Engines disagree: " + ", ".join(f"{run.engine} {round(run.distance, 2)}px" for run in runs)
+        
+        if version != self.QGVM.version:
+            status += "\tThe graph changed while comparing, regions are not shown"
+        else:
+            self.QGVM.color_explored(runs)
+            path = runs[0].path
+            for i in range(1, len(path)):
+                graph_solver.connect_points(path[i - 1], path[i], palette.PATH)
+        
+        self.statusLabel.setText(status)
+        self.show_comparison(runs)
+    
+    def show_comparison(
+        self, 
+        runs: list
+    ) -> None:
+        """Shows the runs of an engine comparison side by side in a table
+        
+        Each engine is shaded in the colour its explored region is drawn in.
+
+        Args:
+            runs (list): EngineRun of each engine returned by GraphSolver.compare_engines
+        """
+        columns = ("Engine", "Distance", "Wall time", "Settled", "Pushes", "Peak memory")
+        table = QTableWidget(len(runs), len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        
+        for row, run in enumerate(runs):
+            cells = (
+                run.engine,
+                f"{round(run.distance, 2)}px",
+                f"{run.wall_ns / 1e6:.3f}ms",
+                str(run.stats.settled),
+                str(run.stats.pushes),
+                f"{run.peak_bytes / 1024:.1f}KiB"
+            )
+            for column, text in enumerate(cells):
+                table.setItem(row, column, QTableWidgetItem(text))
+            table.item(row, 0).setBackground(palette.engine_brush(row))
+        table.resizeColumnsToContents()
+        
+        self.comparison_dialog = QDialog()
+        self.comparison_dialog.setWindowTitle("Engine comparison")
+        layout = QVBoxLayout(self.comparison_dialog)
+        layout.addWidget(table)
+        self.comparison_dialog.resize(table.horizontalHeader().length() + 40, 60 + 30 * len(runs))
+        self.comparison_dialog.show()
+    
+    def toggle_playback(self) -> None:
+        """Plays or pauses the recorded exploration of the last search
+        """
+        if self.trace_player.is_playing():
+            self.trace_player.pause()
+        else:
+            self.trace_player.play()
+        self.playButton.setText("Pause" if self.trace_player.is_playing() else "Play")
+    
+    def show_trace_step(
+        self, 
+        step: int
+    ) -> None:
+        """Moves the slider to the step the playback is at
+
+        Args:
+            step (int): Step
+        """
+        self.traceSlider.blockSignals(True)
+        self.traceSlider.setValue(step)
+        self.traceSlider.blockSignals(False)
         
-        self.statusLabel.setText(f"Total distance: {round(distance, 2)}px.\tTime: {timestamp_end - timestamp_start}s\nNodes traveled: {nodes_traveled}")
+        if not self.trace_player.is_playing():
+            self.playButton.setText("Play")
     
     def change_generator_config(
         self, 
@@ -337,13 +1103,18 @@ class Editor(Ui_MainWindow):
     
     def move_selected_node(self, event: QMouseEvent) -> None:
         if self.selected_object:
-            self.selected_object.pos = [event.x(), event.y()]
+            pos = self.QGVM.map_to_scene(event)
+            self.selected_object.pos = [pos.x(), pos.y()]
+            self.QGVM.mark_changed()
+            self.QGVM.record_edit("move", node = self.selected_object)
             self.refresh_scene()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
     app = QtWidgets.QApplication(sys.argv)
     Form = QtWidgets.QMainWindow()
     
     ui = Editor(Form)
     Form.show()
+    ui.QGVM.reset_view()
     sys.exit(app.exec_())
\ No newline at end of file
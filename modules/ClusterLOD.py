@@ -0,0 +1,396 @@
+from PyQt5.QtWidgets import(
+    QGraphicsScene,
+    QGraphicsEllipseItem,
+    QGraphicsLineItem,
+    QGraphicsItem
+)
+import math
+import modules.palette as palette
+
+LOD_ZOOM = 0.35 # below this zoom clusters are drawn instead of single nodes
+BASE_CELL = 32 # width and height of a cell of the finest level in scene units
+LEVELS = 12 # each level doubles the cell size of the previous one
+CLUSTER_PIXELS = 16 # cells are at least this wide on the screen
+
+class ClusterLevel:
+    def __init__(
+        self,
+        cell_size: float
+    ) -> None:
+        """One level of the grid pyramid, aggregates nodes per cell and edges per pair of cells
+
+        Args:
+            cell_size (float): Width and height of a cell in scene units
+        """
+        self.cell_size = cell_size
+        self.cells = {} # (cx, cy) -> [nodes, sum of x, sum of y]
+        self.bundles = {} # (cell, cell) -> edges between the two cells
+        
+        self.dirty_cells = set()
+        self.dirty_bundles = set()
+    
+    def cell_of(
+        self,
+        pos: tuple[float, float]
+    ) -> tuple[int, int]:
+        """Returns the cell a position lies in
+
+        Args:
+            pos (tuple[float, float]): Position
+
+        Returns:
+            tuple[int, int]: Column and row of the cell
+        """
+        return (math.floor(pos[0] / self.cell_size), math.floor(pos[1] / self.cell_size))
+    
+    def add_node(
+        self,
+        pos: tuple[float, float],
+        sign: int = 1
+    ) -> None:
+        """Adds a node to the cell of its position, a sign of -1 removes it
+
+        Args:
+            pos (tuple[float, float]): Position of the node
+            sign (int, optional): 1 to add, -1 to remove. Defaults to 1.
+        """
+        cell = self.cell_of(pos)
+        entry = self.cells.setdefault(cell, [0, 0.0, 0.0])
+        entry[0] += sign
+        entry[1] += sign * pos[0]
+        entry[2] += sign * pos[1]
+        
+        if entry[0] == 0:
+            del self.cells[cell]
+        self.dirty_cells.add(cell)
+    
+    def add_edge(
+        self,
+        pos1: tuple[float, float],
+        pos2: tuple[float, float],
+        sign: int = 1
+    ) -> None:
+        """Adds an edge to the bundle between the cells of its nodes, a sign of -1 removes it
+
+        Edges inside a single cell are not drawn and not counted.
+
+        Args:
+            pos1 (tuple[float, float]): Position of the first node
+            pos2 (tuple[float, float]): Position of the second node
+            sign (int, optional): 1 to add, -1 to remove. Defaults to 1.
+        """
+        cell1, cell2 = self.cell_of(pos1), self.cell_of(pos2)
+        if cell1 == cell2:
+            return
+        
+        key = (cell1, cell2) if cell1 <= cell2 else (cell2, cell1)
+        count = self.bundles.get(key, 0) + sign
+        
+        if count:
+            self.bundles[key] = count
+        else:
+            del self.bundles[key]
+        self.dirty_bundles.add(key)
+
+class ClusterLOD:
+    def __init__(
+        self,
+        QGVM: "QGraphicsViewManager"
+    ) -> None:
+        """Draws aggregated clusters instead of single nodes while the view is zoomed out
+
+        Node positions are aggregated into a pyramid of grids, each level doubling the cell size.
+        
+        The pyramid is built once and then only updated with the edits record_edit reports.
+        
+        While zoomed out the view shows a second scene with one glyph per cell and one bundled
+
+        line per pair of connected cells, the scene of the single items is left untouched.
+
+        Args:
+            QGVM (QGraphicsViewManager): QGraphicsViewManager whose graph is clustered
+        """
+        self.qgvm = QGVM
+        self.levels = [ClusterLevel(BASE_CELL * 2 ** k) for k in range(LEVELS)]
+        
+        self.scene = QGraphicsScene(self.qgvm.graphicsView)
+        self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.scene.setSceneRect(self.qgvm.scene.sceneRect())
+        
+        self.positions = {} # node id -> position the pyramid knows
+        self.pending = None # edits since the last sync, None if the pyramid has to be rebuilt
+        self.qgvm.edit_listeners.append(self.note_edit)
+        
+        self.level = None # index of the level whose glyphs are in the scene
+        self.glyphs = {} # cell -> QGraphicsEllipseItem
+        self.bundles = {} # (cell, cell) -> QGraphicsLineItem
+        self.active = False
+    
+    def note_edit(
+        self,
+        op: str,
+        node: "core.Knoten" = None,
+        edge: tuple[int, int] = None
+    ) -> None:
+        """Queues an edit until the next sync, the edit is stored with the positions and neighbours it needs
+        
+        Once more edits are queued than the pyramid has nodes, rebuilding it is cheaper and the queue is dropped.
+
+        Args:
+            op (str): Operation, one of EditJournal.OPERATIONS
+            node (core.Knoten, optional): Node after the edit. Defaults to None.
+            edge (tuple[int, int], optional): Ids of the nodes of a linked or unlinked edge. Defaults to None.
+        """
+        if self.pending is None or op == "flag":
+            return
+        if op == "clear" or len(self.pending) > len(self.positions):
+            self.pending = None
+            return
+        
+        if op in ("link", "unlink"):
+            self.pending.append((op, edge))
+        else:
+            # edges are counted between the cells of their nodes, so the edges of a moved or deleted node go with it
+            pos = (node.x() + 5, node.y() + 5) # centre of the node
+            self.pending.append((op, (node.id, pos, tuple(self.qgvm.edges.neighbors(node.id)))))
+    
+    def invalidate(self) -> None:
+        """Rebuilds the pyramid on the next sync, needed after the graph was changed without record_edit
+        """
+        self.pending = None
+    
+    def sync(self) -> None:
+        """Applies the edits queued since the last sync to the pyramid or rebuilds it
+        """
+        if self.pending is None:
+            self._rebuild_pyramid()
+            return
+        
+        positions = self.positions
+        for op, data in self.pending:
+            if op == "link":
+                self._add_edge(positions[data[0]], positions[data[1]], 1)
+            elif op == "unlink":
+                self._add_edge(positions[data[0]], positions[data[1]], -1)
+            elif op == "add":
+                node_id, pos, neighbors = data
+                positions[node_id] = pos
+                self._add_node(pos, 1)
+            else:
+                node_id, pos, neighbors = data
+                old = positions.pop(node_id)
+                for v in neighbors:
+                    self._add_edge(old, positions[v], -1)
+                self._add_node(old, -1)
+                
+                if op == "move":
+                    positions[node_id] = pos
+                    self._add_node(pos, 1)
+                    for v in neighbors:
+                        self._add_edge(pos, positions[v], 1)
+        self.pending.clear()
+    
+    def _rebuild_pyramid(self) -> None:
+        """Aggregates every node and edge of the graph again, the shown level is redrawn with the next update
+        """
+        objects = self.qgvm.objects
+        self.levels = [ClusterLevel(BASE_CELL * 2 ** k) for k in range(LEVELS)]
+        self.positions = {node_id: (x + 5, y + 5) for node_id, x, y in zip(objects.ids, objects.xs, objects.ys)} # centres of the nodes
+        
+        for pos in self.positions.values():
+            self._add_node(pos, 1)
+        for u, v in self.qgvm.edges:
+            self._add_edge(self.positions[u], self.positions[v], 1)
+        
+        self.pending = []
+        self.level = None
+    
+    def _add_node(
+        self,
+        pos: tuple[float, float],
+        sign: int
+    ) -> None:
+        """Adds or removes a node on every level
+
+        Args:
+            pos (tuple[float, float]): Position of the node
+            sign (int): 1 to add, -1 to remove
+        """
+        for level in self.levels:
+            level.add_node(pos, sign)
+    
+    def _add_edge(
+        self,
+        pos1: tuple[float, float],
+        pos2: tuple[float, float],
+        sign: int
+    ) -> None:
+        """Adds or removes an edge on every level
+
+        Args:
+            pos1 (tuple[float, float]): Position of the first node
+            pos2 (tuple[float, float]): Position of the second node
+            sign (int): 1 to add, -1 to remove
+        """
+        for level in self.levels:
+            level.add_edge(pos1, pos2, sign)
+    
+    def level_for(
+        self,
+        scale: float
+    ) -> int:
+        """Returns the finest level whose cells are at least CLUSTER_PIXELS wide on the screen
+
+        Args:
+            scale (float): Zoom of the view
+
+        Returns:
+            int: Index of the level
+        """
+        for k, level in enumerate(self.levels):
+            if level.cell_size * scale >= CLUSTER_PIXELS:
+                return k
+        return LEVELS - 1
+    
+    def update(self) -> None:
+        """Switches between clusters and single items for the current zoom and redraws changed clusters
+        """
+        scale = self.qgvm.graphicsView.transform().m11()
+        
+        if scale >= LOD_ZOOM:
+            self._show(self.qgvm.scene)
+            self.active = False
+            return
+        
+        self.sync()
+        k = self.level_for(scale)
+        
+        if k != self.level:
+            self._rebuild(k)
+        else:
+            self._redraw_dirty()
+        
+        self._show(self.scene)
+        self.active = True
+    
+    def _show(
+        self,
+        scene: QGraphicsScene
+    ) -> None:
+        """Shows a scene in the view without moving the visible area
+
+        Args:
+            scene (QGraphicsScene): Scene of the clusters or of the single items
+        """
+        view = self.qgvm.graphicsView
+        if view.scene() is scene:
+            return
+        
+        center = view.mapToScene(view.viewport().rect().center())
+        view.setScene(scene)
+        view.centerOn(center)
+    
+    def _rebuild(
+        self,
+        k: int
+    ) -> None:
+        """Replaces every glyph and bundle with the ones of another level
+
+        Args:
+            k (int): Index of the level
+        """
+        self.scene.clear()
+        self.glyphs.clear()
+        self.bundles.clear()
+        self.level = k
+        
+        level = self.levels[k]
+        level.dirty_cells = set(level.cells)
+        level.dirty_bundles = set(level.bundles)
+        self._redraw_dirty()
+    
+    def _redraw_dirty(self) -> None:
+        """Redraws the glyphs and bundles of the shown level that changed
+        
+        Items of emptied cells are removed before any item is added, removing and adding
+        
+        in turns makes the scene process its pending removals on every single add.
+        """
+        level = self.levels[self.level]
+        
+        # a bundle ends in the centroids of its cells, so it is redrawn if one of them changed
+        dirty_bundles = level.dirty_bundles | {key for key in self.bundles if key[0] in level.dirty_cells or key[1] in level.dirty_cells}
+        
+        for cell in level.dirty_cells:
+            if cell not in level.cells and cell in self.glyphs:
+                self.scene.removeItem(self.glyphs.pop(cell))
+        for key in dirty_bundles:
+            if key not in level.bundles and key in self.bundles:
+                self.scene.removeItem(self.bundles.pop(key))
+        
+        for cell in level.dirty_cells:
+            if cell in level.cells:
+                self.glyphs[cell] = self._glyph(level.cells[cell], self.glyphs.get(cell))
+        for key in dirty_bundles:
+            if key in level.bundles:
+                self.bundles[key] = self._bundle(level, key, self.bundles.get(key))
+        
+        level.dirty_cells.clear()
+        level.dirty_bundles.clear()
+    
+    def _glyph(
+        self,
+        entry: list,
+        glyph: QGraphicsEllipseItem = None
+    ) -> QGraphicsEllipseItem:
+        """Creates or updates the glyph of a cell, its size grows with the amount of nodes
+
+        Args:
+            entry (list): [nodes, sum of x, sum of y] of the cell
+            glyph (QGraphicsEllipseItem, optional): Glyph that is updated. Defaults to None.
+
+        Returns:
+            QGraphicsEllipseItem: Glyph at the centroid of the cell
+        """
+        count, sx, sy = entry
+        radius = min(3 + 1.5 * math.log2(count), CLUSTER_PIXELS / 2)
+        
+        if glyph is None:
+            glyph = QGraphicsEllipseItem()
+            glyph.setFlag(QGraphicsItem.ItemIgnoresTransformations) # constant size on the screen
+            glyph.setPen(palette.pen(palette.CLUSTER))
+            glyph.setBrush(palette.brush(palette.CLUSTER))
+            glyph.setZValue(1)
+            self.scene.addItem(glyph)
+        
+        glyph.setRect(-radius, -radius, 2 * radius, 2 * radius)
+        glyph.setPos(sx / count, sy / count)
+        glyph.setToolTip(f"{count} nodes")
+        return glyph
+    
+    def _bundle(
+        self,
+        level: ClusterLevel,
+        key: tuple,
+        line: QGraphicsLineItem = None
+    ) -> QGraphicsLineItem:
+        """Creates or updates the line that bundles every edge between two cells, its width grows with the amount of edges
+
+        Args:
+            level (ClusterLevel): Shown level
+            key (tuple): Cells of the bundle
+            line (QGraphicsLineItem, optional): Line that is updated. Defaults to None.
+
+        Returns:
+            QGraphicsLineItem: Line between the centroids of the cells
+        """
+        (count1, sx1, sy1), (count2, sx2, sy2) = level.cells[key[0]], level.cells[key[1]]
+        width = 1 + int(math.log2(level.bundles[key]))
+        
+        if line is None:
+            line = QGraphicsLineItem()
+            self.scene.addItem(line)
+        
+        line.setLine(sx1 / count1, sy1 / count1, sx2 / count2, sy2 / count2)
+        line.setPen(palette.bundle_pen(width))
+        return line
\ No newline at end of file
@@ -0,0 +1,312 @@
+import modules.core as core
+
+class Components:
+    def __init__(self) -> None:
+        """Union-find over node ids, nodes that were never united are their own component
+        
+        Unions are applied right away, removing an edge can split a component so it only
+        
+        marks the index as dirty and it is rebuilt from the edges on the next query.
+        """
+        self.parent = {} # node id -> parent id, roots are missing or point to themselves
+        self.size = {} # root id -> amount of nodes in its component
+        self.dirty = False
+    
+    def find(
+        self,
+        u: int
+    ) -> int:
+        """Returns the root of the component of a node, paths are halved on the way
+
+        Args:
+            u (int): Id of the node
+
+        Returns:
+            int: Id of the root
+        """
+        parent = self.parent
+        while parent.get(u, u) != u:
+            parent[u] = parent.get(parent[u], parent[u])
+            u = parent[u]
+        return u
+    
+    def union(
+        self,
+        u: int,
+        v: int
+    ) -> None:
+        """Merges the components of two nodes, the smaller one is hung below the larger one
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+        """
+        root_u, root_v = self.find(u), self.find(v)
+        if root_u == root_v:
+            return
+        
+        size_u, size_v = self.size.get(root_u, 1), self.size.get(root_v, 1)
+        if size_u < size_v:
+            root_u, root_v = root_v, root_u
+        
+        self.parent[root_v] = root_u
+        self.size[root_u] = size_u + size_v
+        self.size.pop(root_v, None)
+    
+    def rebuild(
+        self,
+        edges: dict
+    ) -> None:
+        """Builds the components from scratch
+
+        Args:
+            edges (dict): Edges as (u, v) keys
+        """
+        self.clear()
+        for u, v in edges:
+            self.union(u, v)
+    
+    def clear(self) -> None:
+        """Forgets every component
+        """
+        self.parent.clear()
+        self.size.clear()
+        self.dirty = False
+
+
+class EdgeStore:
+    def __init__(self) -> None:
+        """Canonical set of the undirected edges of the graph
+
+        Every edge is stored once under the ordered pair (smaller id, larger id)
+
+        of its nodes, so inserting, removing and looking up an edge is O(1).
+
+        incident maps each node id to the ids of its neighbors.
+        """
+        self.edges = {} # (u, v) -> core.Kante or None if it has not been drawn yet
+        self.incident = {} # node id -> set of neighbor ids
+        self.undrawn = set() # keys of the edges without a line
+        self.components = Components()
+        self.version = 0 # bumped whenever an edge is added or removed
+    
+    @staticmethod
+    def key(
+        u: int,
+        v: int
+    ) -> tuple[int, int]:
+        """Returns the ordered key of the edge between two nodes
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+
+        Returns:
+            tuple[int, int]: (smaller id, larger id)
+        """
+        return (u, v) if u <= v else (v, u)
+    
+    def add(
+        self,
+        u: int,
+        v: int,
+        line: core.Kante = None
+    ) -> bool:
+        """Adds the edge between two nodes, duplicates, reversed duplicates and loops are ignored
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+            line (core.Kante, optional): Drawn edge. Defaults to None.
+
+        Returns:
+            bool: True if the edge is new
+        """
+        key = self.key(u, v)
+        if u == v or key in self.edges:
+            return False
+        
+        self.edges[key] = line
+        self.version += 1
+        if line is None:
+            self.undrawn.add(key)
+        self.incident.setdefault(u, set()).add(v)
+        self.incident.setdefault(v, set()).add(u)
+        
+        if not self.components.dirty:
+            self.components.union(u, v)
+        return True
+    
+    def remove(
+        self,
+        u: int,
+        v: int
+    ) -> core.Kante:
+        """Removes the edge between two nodes
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+
+        Returns:
+            core.Kante: Drawn edge that has to be removed from the scene, None if there is none
+        """
+        key = self.key(u, v)
+        if key not in self.edges:
+            return None
+        
+        line = self.edges.pop(key)
+        self.version += 1
+        self.undrawn.discard(key)
+        self.components.dirty = True
+        self.incident.get(u, set()).discard(v)
+        self.incident.get(v, set()).discard(u)
+        return line
+    
+    def remove_node(
+        self,
+        u: int
+    ) -> list[core.Kante]:
+        """Removes every edge of a node
+
+        Args:
+            u (int): Id of the node
+
+        Returns:
+            list[core.Kante]: Drawn edges that have to be removed from the scene
+        """
+        lines = [self.remove(u, v) for v in list(self.incident.get(u, ()))]
+        self.incident.pop(u, None)
+        return [line for line in lines if line is not None]
+    
+    def has(
+        self,
+        u: int,
+        v: int
+    ) -> bool:
+        """Returns whether or not two nodes are connected
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+
+        Returns:
+            bool: True if the edge exists
+        """
+        return self.key(u, v) in self.edges
+    
+    def neighbors(
+        self,
+        u: int
+    ) -> set[int]:
+        """Returns the ids of every node connected to a node
+
+        Args:
+            u (int): Id of the node
+
+        Returns:
+            set[int]: Ids of the neighbors, must not be changed
+        """
+        return self.incident.get(u, set())
+    
+    def component(
+        self,
+        u: int
+    ) -> int:
+        """Returns the component of a node, the index is rebuilt first if edges were removed
+
+        Args:
+            u (int): Id of the node
+
+        Returns:
+            int: Id of the root of the component, the same for every node of it
+        """
+        if self.components.dirty:
+            self.components.rebuild(self.edges)
+        return self.components.find(u)
+    
+    def connected(
+        self,
+        u: int,
+        v: int
+    ) -> bool:
+        """Returns whether or not there is any path between two nodes
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+
+        Returns:
+            bool: True if both nodes are in the same component
+        """
+        return self.component(u) == self.component(v)
+    
+    def line(
+        self,
+        u: int,
+        v: int
+    ) -> core.Kante:
+        """Returns the drawn edge between two nodes
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+
+        Returns:
+            core.Kante: Drawn edge, None if there is no edge or it has not been drawn yet
+        """
+        return self.edges.get(self.key(u, v))
+    
+    def set_line(
+        self,
+        u: int,
+        v: int,
+        line: core.Kante
+    ) -> None:
+        """Stores the drawn edge of an existing edge
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+            line (core.Kante): Drawn edge
+        """
+        key = self.key(u, v)
+        self.edges[key] = line
+        self.undrawn.discard(key)
+    
+    def lines(self) -> list[core.Kante]:
+        """Returns every drawn edge
+
+        Returns:
+            list[core.Kante]: Drawn edges
+        """
+        return [line for line in self.edges.values() if line is not None]
+    
+    def clear(self) -> None:
+        """Removes every edge
+        """
+        self.edges.clear()
+        self.incident.clear()
+        self.undrawn.clear()
+        self.components.clear()
+        self.version += 1
+    
+    def to_list(self) -> list[list[int]]:
+        """Returns the edges as pairs of node ids like they are stored in .ens files
+
+        Returns:
+            list[list[int]]: [[u, v], ...]
+        """
+        return [list(key) for key in self.edges]
+    
+    def __len__(self) -> int:
+        return len(self.edges)
+    
+    def __iter__(self):
+        return iter(self.edges)
+    
+    def __contains__(self, edge: tuple) -> bool:
+        return self.key(*edge) in self.edges
+    
+    def __repr__(self) -> str:
+        return f"EdgeStore({len(self)} edges)"
\ No newline at end of file
@@ -0,0 +1,382 @@
+import os
+import json
+import time
+import threading
+import modules.core as core
+from modules.GraphSnapshot import GraphSnapshot
+from modules.EdgeStore import EdgeStore
+from typing import Callable
+
+class EditJournal:
+    OPERATIONS = ('add', 'move', 'delete', 'flag', 'clear', 'link', 'unlink')
+    
+    def __init__(
+        self,
+        path: str,
+        sync_interval: float = 2.0,
+        compact_after: int = 5000,
+        buffer_size: int = 64 * 1024
+    ) -> None:
+        """Append-only journal of edits that is used to recover after a crash
+
+        Edits are appended to <path>.journal through a buffered writer and
+
+        fsynced at most every sync_interval seconds. From time to time the whole
+
+        graph is written into the .ens snapshot at path and the journal is started over.
+
+        Args:
+            path (str): Filename of the .ens snapshot
+            sync_interval (float, optional): Seconds between two fsyncs. Defaults to 2.0.
+            compact_after (int, optional): Edits after which a compaction is due. Defaults to 5000.
+            buffer_size (int, optional): Size of the write buffer in bytes. Defaults to 64 * 1024.
+        """
+        self.snapshot_path = path
+        self.journal_path = f"{path}.journal"
+        self.rotated_path = f"{path}.journal.1"
+        
+        self.sync_interval = sync_interval
+        self.compact_after = compact_after
+        self.buffer_size = buffer_size
+        
+        self.seq = 0
+        self.pending = 0 # edits since the last compaction
+        self.stale = False # the graph was loaded without journaling it, only a compaction can recover it
+        self.error = None # exception of the last failed compaction until the main thread takes it
+        
+        self._file = None
+        self._last_sync = time.monotonic()
+        self._compactor = None
+    
+    def open(self) -> None:
+        """Opens the journal for appending
+        """
+        self._file = open(self.journal_path, "a", buffering=self.buffer_size)
+    
+    def append(
+        self,
+        op: str,
+        node: core.Knoten = None,
+        edge: tuple[int, int] = None
+    ) -> None:
+        """Appends an edit to the journal
+        
+        Nodes are journaled by their id, indices shift whenever the graph is loaded or tiles are evicted.
+
+        Args:
+            op (str): Operation, one of OPERATIONS
+            node (core.Knoten, optional): Node after the edit. Defaults to None.
+            edge (tuple[int, int], optional): Ids of the nodes of a linked or unlinked edge. Defaults to None.
+        """
+        if self._file is None:
+            return
+        
+        self.seq += 1
+        self.pending += 1
+        entry = {'seq': self.seq, 'op': op}
+        
+        if node is not None:
+            entry.update(
+                id = node.id,
+                x = node.x(),
+                y = node.y(),
+                is_start = node.is_start,
+                is_end = node.is_end
+            )
+        if edge is not None:
+            entry['edge'] = list(edge)
+        
+        self._file.write(json.dumps(entry) + "\n")
+        
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+    
+    def sync(self) -> None:
+        """Flushes the write buffer and fsyncs the journal
+        """
+        if self._file is None:
+            return
+        
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+    
+    def needs_compaction(self) -> bool:
+        """Returns whether or not enough edits piled up or the journal is stale
+
+        Returns:
+            bool: True if a compaction is due and none is running
+        """
+        return (self.stale or self.pending >= self.compact_after) and not self.is_compacting()
+    
+    def is_compacting(self) -> bool:
+        """Returns whether or not a compaction is running
+
+        Returns:
+            bool: True while the snapshot is written
+        """
+        return self._compactor is not None and self._compactor.is_alive()
+    
+    def compact(
+        self,
+        snapshot: GraphSnapshot,
+        serialize: Callable
+    ) -> None:
+        """Writes the snapshot into the .ens file in the background
+
+        The current journal is rotated first. Edits made while the snapshot is written
+
+        go into the new journal, the rotated one is deleted once the snapshot is on disk.
+
+        Args:
+            snapshot (GraphSnapshot): Snapshot that contains every edit up to now
+            serialize (Callable): Turns the snapshot into the .ens dictionary
+        """
+        if self._file is None or self.is_compacting():
+            return
+        
+        self.sync()
+        self._file.close()
+        self._rotate()
+        self.open()
+        
+        self.pending = 0
+        stale, self.stale = self.stale, False
+        self._compactor = threading.Thread(
+            target = self._write_snapshot,
+            args = (snapshot, serialize, self.seq, stale),
+            daemon = True
+        )
+        self._compactor.start()
+    
+    def _rotate(self) -> None:
+        """Moves the journal to the rotated journal
+        
+        If a rotated journal is left over from a failed compaction the journal is appended to it.
+        """
+        if not os.path.exists(self.rotated_path):
+            os.replace(self.journal_path, self.rotated_path)
+            return
+        
+        with open(self.journal_path, "r") as src, open(self.rotated_path, "a") as dst:
+            dst.write("\n" + src.read()) # a torn last line must not swallow the first entry
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.remove(self.journal_path)
+    
+    def _write_snapshot(
+        self,
+        snapshot: GraphSnapshot,
+        serialize: Callable,
+        seq: int,
+        stale: bool = False
+    ) -> None:
+        """Writes the snapshot atomically and removes the rotated journal
+        
+        If writing fails the rotated journal is kept, so recovery still works, and the
+        
+        exception is stored in self.error for the main thread to report.
+
+        Args:
+            snapshot (GraphSnapshot): Snapshot of the graph
+            serialize (Callable): Turns the snapshot into the .ens dictionary
+            seq (int): Sequence number of the last edit contained in the snapshot
+            stale (bool, optional): Whether the journal was stale before, it is marked stale again on failure. Defaults to False.
+        """
+        try:
+            data = serialize(snapshot)
+            data['journal_seq'] = seq
+            
+            temp_path = f"{self.snapshot_path}.tmp"
+            with open(temp_path, "w") as j:
+                json.dump(data, j)
+                j.flush()
+                os.fsync(j.fileno())
+            
+            os.replace(temp_path, self.snapshot_path)
+            os.remove(self.rotated_path)
+        except Exception as error:
+            self.error = error
+            self.stale = self.stale or stale
+    
+    def take_error(self) -> Exception:
+        """Returns the exception of the last failed compaction once
+
+        Returns:
+            Exception: Exception or None if no compaction failed since the last call
+        """
+        error, self.error = self.error, None
+        return error
+    
+    def wait(self) -> None:
+        """Waits for a running compaction
+        """
+        if self._compactor is not None:
+            self._compactor.join()
+    
+    def has_recovery(self) -> bool:
+        """Returns whether or not there is anything left from a previous session
+
+        Returns:
+            bool: True if a snapshot or journal exists
+        """
+        return any(os.path.exists(path) for path in (self.snapshot_path, self.rotated_path, self.journal_path))
+    
+    def recover(
+        self,
+        objects: list,
+        edges: EdgeStore,
+        load: Callable
+    ) -> int:
+        """Loads the last snapshot and replays every journaled edit on top of it
+        
+        An edit that does not fit the graph, like one of a node the snapshot does not contain, stops
+        
+        the replay. The exception is stored in self.error, so the recovered part can still be used.
+
+        Args:
+            objects (list): List of nodes the graph is recovered into
+            edges (EdgeStore): Edges the graph is recovered into
+            load (Callable): Appends the nodes and edges of a .ens dictionary to the graph
+
+        Returns:
+            int: Amount of replayed edits
+        """
+        snapshot_seq = 0
+        
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as j:
+                data = json.load(j)
+            snapshot_seq = data.get('journal_seq', 0)
+            load(data)
+        
+        replayed = 0
+        self.seq = snapshot_seq
+        
+        for path in (self.rotated_path, self.journal_path):
+            for entry in self._read_entries(path):
+                if entry['seq'] > snapshot_seq and self.error is None:
+                    try:
+                        self._apply(objects, edges, entry)
+                        replayed += 1
+                    except (KeyError, IndexError, ValueError) as error:
+                        self.error = error
+                self.seq = max(self.seq, entry['seq'])
+        return replayed
+    
+    def _read_entries(
+        self,
+        path: str
+    ) -> list:
+        """Reads the entries of a journal, torn and empty lines are skipped
+
+        Args:
+            path (str): Filename of the journal
+
+        Returns:
+            list: Entries
+        """
+        if not os.path.exists(path):
+            return []
+        
+        entries = []
+        with open(path, "r") as j:
+            for line in j:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+    
+    def _apply(
+        self,
+        objects: list,
+        edges: EdgeStore,
+        entry: dict
+    ) -> None:
+        """Applies a single edit to the list of nodes and edges
+        
+        Raises a ValueError if the edit names a node that is not in the graph or adds one that already is.
+
+        Args:
+            objects (list): List of nodes
+            edges (EdgeStore): Edges
+            entry (dict): Journal entry
+        """
+        op = entry['op']
+        
+        if op == "clear":
+            objects.clear()
+            edges.clear()
+        
+        elif op == "add":
+            if objects.index_of_id(entry['id']) is not None:
+                raise ValueError(f"Edit {entry['seq']} adds node {entry['id']} twice")
+            node = core.Knoten([entry['x'], entry['y']])
+            node.id = entry['id']
+            node.is_start = entry['is_start']
+            node.is_end = entry['is_end']
+            core.reserve_id(node.id)
+            objects.append(node)
+        
+        elif op == "move":
+            objects[self._index_of(objects, entry, entry['id'])].pos = [entry['x'], entry['y']]
+        
+        elif op == "flag":
+            node = objects[self._index_of(objects, entry, entry['id'])]
+            node.is_start = entry['is_start']
+            node.is_end = entry['is_end']
+        
+        elif op == "delete":
+            index = self._index_of(objects, entry, entry['id'])
+            edges.remove_node(entry['id'])
+            objects.pop(index)
+        
+        elif op == "link":
+            for node_id in entry['edge']:
+                self._index_of(objects, entry, node_id)
+            edges.add(*entry['edge'])
+        
+        elif op == "unlink":
+            edges.remove(*entry['edge'])
+    
+    def _index_of(
+        self,
+        objects: list,
+        entry: dict,
+        node_id: int
+    ) -> int:
+        """Returns the index of a node an edit names, a ValueError is raised if it is not in the graph
+
+        Args:
+            objects (list): List of nodes
+            entry (dict): Journal entry
+            node_id (int): Id of the node
+
+        Returns:
+            int: Index
+        """
+        index = objects.index_of_id(node_id)
+        if index is None:
+            raise ValueError(f"Edit {entry['seq']} names node {node_id} that is not in the graph")
+        return index
+    
+    def close(self) -> None:
+        """Flushes and closes the journal
+        """
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+    
+    def discard(self) -> None:
+        """Closes the journal and removes every autosave file
+
+        Called when the editor is closed normally.
+        """
+        self.wait()
+        self.close()
+        
+        for path in (self.snapshot_path, self.rotated_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
\ No newline at end of file
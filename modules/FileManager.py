@@ -2,10 +2,79 @@ from PyQt5.QtWidgets import(
     QListWidget, 
     QListWidgetItem
 )
+from PyQt5.QtCore import(
+    QObject,
+    QRunnable,
+    QThreadPool,
+    pyqtSignal
+)
 import json
 import os
+from typing import Callable
 import modules.core as core
+import modules.utils as utils
 from modules.QGraphicsViewManager import QGraphicsViewManager
+from modules.GraphSnapshot import GraphSnapshot
+from modules.NodeStore import(
+    START,
+    END
+)
+
+tg = utils.lazy_import("modules.TiledGraph") # only needed for tiled files
+
+class ScanSignals(QObject):
+    found = pyqtSignal(list) # batch of .ens files
+    finished = pyqtSignal(int) # amount of .ens files found
+
+
+class EnsScanner(QRunnable):
+    BATCH_SIZE = 64 # files per found signal
+    
+    def __init__(
+        self, 
+        file_manager: "FileManager", 
+        root: str = "."
+    ) -> None:
+        """Looks for .ens files inside a QThreadPool, so large directories do not block the window
+        
+        The files are delivered in batches through the signals in the GUI thread.
+
+        Args:
+            file_manager (FileManager): FileManager whose iter_ens_files is used
+            root (str, optional): Directory that is searched. Defaults to ".".
+        """
+        super().__init__()
+        self.file_manager = file_manager
+        self.root = root
+        self.signals = ScanSignals()
+        self.cancelled = False
+        self.setAutoDelete(False)
+    
+    def cancel(self) -> None:
+        """Stops the search at the next file
+        """
+        self.cancelled = True
+    
+    def run(self) -> None:
+        """Walks the directory and emits the .ens files in batches
+        """
+        batch = []
+        found = 0
+        
+        for filename in self.file_manager.iter_ens_files(self.root):
+            if self.cancelled:
+                return
+            
+            batch.append(filename)
+            found += 1
+            if len(batch) >= self.BATCH_SIZE:
+                self.signals.found.emit(batch)
+                batch = []
+        
+        if batch:
+            self.signals.found.emit(batch)
+        self.signals.finished.emit(found)
+
 
 class FileManager:
     def __init__(self, QGVM: QGraphicsViewManager) -> None:
@@ -16,63 +85,259 @@ class FileManager:
         """
         self.qgvm = QGVM
         self.nodes = self.qgvm.objects
-        self.json = {
-            'points': {}
-        }
+        
+        self.tiles = None # TileCache of an opened tiled file
+        self.scanner = None # EnsScanner of the last search for .ens files
     
     def convert_to_json(
         self, 
         filename: str
     ) -> None:
-        """ Converts the nodes into a .json-style format
+        """ Converts a snapshot of the nodes into a .json-style format
+        
+        The dictionary is only kept while it is written.
 
         Args:
             filename (str): Filename
         """
-        self.json['points'].clear()
+        self.load_all_tiles() # a tiled file is only partially loaded
         
-        for i, node in enumerate(self.nodes):
+        try:
+            data = self.snapshot_to_dict(self.qgvm.snapshot())
+            
+            with open(f"{filename}", "w") as j:
+                json.dump(data, j, indent=4)
+        finally:
+            self.release_tiles()
+    
+    def snapshot_to_dict(
+        self, 
+        snapshot: GraphSnapshot
+    ) -> dict:
+        """Converts a snapshot into the dictionary that is stored in .ens files
+        
+        Only reads the snapshot, so it can be called from other threads.
+
+        Args:
+            snapshot (GraphSnapshot): Snapshot of the graph
+
+        Returns:
+            dict: .ens content
+        """
+        data = {
+            'points': {}
+        }
+        
+        flags = snapshot.flags
+        for i, (node_id, x, y) in enumerate(zip(snapshot.ids, snapshot.xs, snapshot.ys)):
             json_obj = {
-                'id': node.id,
-                'x': node.x(),
-                'y': node.y(),
-                'is_start': node.is_start,
-                'is_end': node.is_end
+                'id': node_id,
+                'x': x,
+                'y': y,
+                'is_start': bool(flags[i] & START),
+                'is_end': bool(flags[i] & END)
             }
-            self.json['points'][i] = json_obj
+            data['points'][i] = json_obj
         
-        with open(f"{filename}", "w") as j:
-            json.dump(self.json, j, indent=4)
+        ids = snapshot.ids
+        data['edges'] = [[ids[i], ids[j]] for i, j in snapshot.edges]
+        return data
+    
+    def convert_to_tiles(
+        self, 
+        filename: str, 
+        tile_size: float = None
+    ) -> None:
+        """Saves the graph in the tiled layout, so it can be loaded partially
+
+        Args:
+            filename (str): Filename
+            tile_size (float, optional): Width and height of a tile. Defaults to tg.TILE_SIZE.
+        """
+        self.load_all_tiles()
+        try:
+            tg.write_tiles(filename, self.snapshot_to_dict(self.qgvm.snapshot()), tile_size or tg.TILE_SIZE)
+        finally:
+            self.release_tiles()
     
     def convert_to_list(self, filename: str) -> None:
         """Converts the .json back into a list of objects
+        
+        Tiled files are opened instead, only the tiles in the viewport are loaded.
 
         Args:
             filename (str): Filename
         """
+        self.close_tiles()
+        
+        if tg.is_tiled(filename):
+            self.open_tiles(filename)
+            return
+        
         with open(f"{filename}", "r") as j:
             json_nodes = json.load(j)
         
+        self.load_dict(json_nodes)
+    
+    def load_dict(
+        self, 
+        json_nodes: dict
+    ) -> None:
+        """Appends the nodes and edges of a .ens dictionary to the graph
+
+        Args:
+            json_nodes (dict): .ens content
+        """
+        if 'edges' not in json_nodes:
+            self.load_legacy_dict(json_nodes)
+            return
+        
+        with self.qgvm.bulk_load():
+            for i, node in json_nodes['points'].items():
+                new_node = core.Knoten([node['x'], node['y']])
+                new_node.id = node['id']
+                new_node.is_start = node['is_start']
+                new_node.is_end = node['is_end']
+                core.reserve_id(new_node.id)
+                
+                self.nodes.append(new_node)
+                self.qgvm.record_edit("add", node = new_node)
+                self.qgvm.last_node = new_node.id
+            
+            for u, v in json_nodes['edges']:
+                self.qgvm.add_edge(u, v)
+        self.qgvm.mark_changed()
+    
+    def open_tiles(
+        self, 
+        filename: str, 
+        budget: int = None
+    ) -> None:
+        """Opens a tiled file and loads the tiles in the viewport
+
+        Args:
+            filename (str): Filename
+            budget (int, optional): Bytes of resident tiles. Defaults to tg.MEMORY_BUDGET.
+        """
+        self.close_tiles()
+        self.tiles = tg.TileCache(tg.TileReader(filename), self.load_dict, self.qgvm.unload_nodes, budget or tg.MEMORY_BUDGET)
+        self.qgvm.edit_listeners.append(self.tiles.note_edit)
+        self.update_tiles()
+    
+    def update_tiles(self) -> bool:
+        """Loads the tiles the viewport moved to and evicts the least recently used ones
+
+        Returns:
+            bool: True if nodes were loaded or removed, views of nodes taken before are invalid then
+        """
+        if self.tiles is None:
+            return False
+        
+        changed = self.tiles.update(self.qgvm.visible_rect())
+        if changed:
+            self.qgvm.redraw_objects()
+        return changed
+    
+    def load_all_tiles(self) -> bool:
+        """Loads every tile of an opened tiled file, needed before the whole graph is saved or solved
+        
+        Evicted tiles left their edges in the content hash, so it is rebuilt once everything is loaded.
+
+        Returns:
+            bool: True if nodes were loaded, views of nodes taken before are invalid then
+        """
+        if self.tiles is None or not self.tiles.load_all():
+            return False
+        
+        self.qgvm.content_hash.rebuild(self.qgvm.objects, self.qgvm.edges)
+        self.qgvm.redraw_objects()
+        return True
+    
+    def release_tiles(self) -> None:
+        """Lets the tiles loaded by load_all_tiles be evicted again once the save or solve is done
+        """
+        if self.tiles is not None:
+            self.tiles.release()
+    
+    def close_tiles(self) -> None:
+        """Forgets the opened tiled file, the loaded nodes stay in the graph
+        """
+        if self.tiles is not None:
+            self.tiles.close()
+            self.qgvm.edit_listeners.remove(self.tiles.note_edit)
+            self.tiles = None
+    
+    def load_legacy_dict(
+        self, 
+        json_nodes: dict
+    ) -> None:
+        """Appends the nodes of a .ens dictionary without edges to the graph
+        
+        Older files connect each node with the previous one and use copies on the same position
+        
+        to branch off, so nodes on the same position are merged into one and chained together.
+        
+        The ids of these files are not unique, new ones are given out.
+
+        Args:
+            json_nodes (dict): .ens content
+        """
+        merged = {} # position -> [x, y, is_start, is_end]
+        chain = []
+        
         for i, node in json_nodes['points'].items():
-            new_node = core.Knoten([node['x'], node['y']])
-            new_node.id = node['id']
-            new_node.is_start = node['is_start']
-            new_node.is_end = node['is_end']
+            pos = (node['x'], node['y'])
+            entry = merged.setdefault(pos, [node['x'], node['y'], False, False])
+            entry[2] = entry[2] or node['is_start']
+            entry[3] = entry[3] or node['is_end']
+            chain.append(pos)
+        
+        ids = {}
+        with self.qgvm.bulk_load():
+            for pos, (x, y, is_start, is_end) in merged.items():
+                new_node = core.Knoten([x, y])
+                new_node.is_start = is_start
+                new_node.is_end = is_end
+                ids[pos] = new_node.id
+                
+                self.nodes.append(new_node)
+                self.qgvm.record_edit("add", node = new_node)
             
-            self.nodes.append(new_node)
+            for i in range(1, len(chain)):
+                self.qgvm.add_edge(ids[chain[i - 1]], ids[chain[i]])
+        
+        if chain:
+            self.qgvm.last_node = ids[chain[-1]]
+        self.qgvm.mark_changed()
+    
+    def iter_ens_files(
+        self, 
+        root: str = "."
+    ):
+        """Yields every .ens file in a directory and its subdirectories as soon as it is found
+        
+        Hidden files like the autosave are skipped.
+
+        Args:
+            root (str, optional): Directory. Defaults to ".".
+
+        Yields:
+            str: Path of a .ens file
+        """
+        for cdir, subdirs, files in os.walk(root):
+            for file in files:
+                if file.endswith(".ens") and not file.startswith("."):
+                    yield f"{cdir}/{file}"
     
     def get_ens_files(self) -> list:
         """Returns a list of all .ens files in the current directory
+        
+        Hidden files like the autosave are skipped.
 
         Returns:
             list: List of .ens files
         """
-        ens = []
-        for cdir, subdirs, files in os.walk("."):
-            for file in files:
-                if file.endswith(".ens"):
-                    ens.append(f"{cdir}/{file}")
-        return ens
+        return list(self.iter_ens_files())
     
     def load_ens_files(
         self, 
@@ -87,6 +352,36 @@ class FileManager:
         for file in ens_files:
             listWidget.addItem(QListWidgetItem(file))
     
+    def scan_ens_files(
+        self, 
+        listWidget: QListWidget, 
+        thread_pool: QThreadPool,
+        on_finished: Callable = None
+    ) -> EnsScanner:
+        """Adds the .ens files to the QListWidget while they are found in the thread pool
+        
+        A search that is still running is cancelled first. Every slot is connected before
+        
+        the search starts, a fast search could emit its signals before a later connect.
+
+        Args:
+            listWidget (QListWidget): QListWidget
+            thread_pool (QThreadPool): Thread pool the search runs in
+            on_finished (Callable, optional): Called with the amount of found files once every file was added. Defaults to None.
+
+        Returns:
+            EnsScanner: Running search
+        """
+        if self.scanner is not None:
+            self.scanner.cancel()
+        
+        self.scanner = EnsScanner(self)
+        self.scanner.signals.found.connect(lambda files: listWidget.addItems(files))
+        if on_finished is not None:
+            self.scanner.signals.finished.connect(on_finished)
+        thread_pool.start(self.scanner)
+        return self.scanner
+    
     def load_selected_file(
         self, 
         listWidget: QListWidget
@@ -96,6 +391,6 @@ class FileManager:
         Args:
             listWidget (QListWidget): QListWidget
         """
-        self.qgvm.objects.clear()
+        self.qgvm.clear_objects()
         self.convert_to_list(listWidget.currentItem().text())
         self.qgvm.refresh_scene()
\ No newline at end of file
@@ -1,4 +1,3 @@
-from PyQt5.QtWidgets import QGraphicsLineItem
 from modules.QGraphicsViewManager import QGraphicsViewManager
 import modules.core as core
 import random
@@ -28,7 +27,7 @@ class GraphGenerator:
         self.gv_height = graphicsView.graphicsView.height()
         
         self.nodes = {i: {'node': {}, 'connections': {}} for i in range(self.max_points)}
-        self.lines = []
+        self.edges = [] # unique (i, j) pairs with i < j
     
     def generate_nodes(self) -> None:
         """Generates randomly placed nodes on the graph
@@ -57,32 +56,44 @@ class GraphGenerator:
             connections = []
             
             for _ in range(random.randint(1, self.max_connections)):
-                connect_node = random.choice(self.nodes)
+                connect_index = random.randrange(self.max_points)
                 
-                if not connect_node in connections:
-                    connections.append(connect_node)
+                if not connect_index in connections:
+                    connections.append(connect_index)
             
             self.nodes[i]['connections'] = connections
     
     def create_lines(self) -> None:
-        """Converts every node and connected node into a list of lines 
+        """Converts every node and connected node into a list of unique edges 
         
         that can be drawn on the graphicsView and used to calculate
         
         the shortest route using the algorithm in .GraphSolver
+        
+        Loops, duplicates and reversed duplicates are left out.
         """
+        seen = set()
+        
         for i, node in self.nodes.items():
-            for connection in node['connections']:
-                line = core.Kante(
-                    core.Knoten([node['node'].x(), node['node'].y()]),
-                    core.Knoten([connection['node'].x(), connection['node'].y()])
-                )
-                self.lines.append(line)
+            for j in node['connections']:
+                edge = (i, j) if i < j else (j, i)
+                
+                if i != j and edge not in seen:
+                    seen.add(edge)
+                    self.edges.append(edge)
     
     def insert_to_graphicsview(self) -> None:
-        """Inserts each individual node into the graphicsView and then lets it draw them
+        """Inserts each node once and connects them, then lets the graphicsView draw them
         """
-        for line in self.lines:
-            self.gv.objects.append(line.pos1)
-            self.gv.objects.append(line.pos2)
+        nodes = [self.nodes[i]['node'] for i in range(self.max_points)]
+        
+        for node in nodes:
+            self.gv.objects.append(node)
+            self.gv.record_edit("add", node = node)
+        
+        for i, j in self.edges:
+            self.gv.add_edge(nodes[i].id, nodes[j].id)
+        
+        self.gv.last_node = nodes[-1].id if nodes else None
+        self.gv.mark_changed()
         self.gv.redraw_objects()
\ No newline at end of file
@@ -0,0 +1,216 @@
+from collections.abc import Sequence
+from typing import Union
+import modules.core as core
+from modules.NodeStore import(
+    NodeStore,
+    START,
+    END
+)
+
+class PointSnapshot:
+    __slots__ = ('id', 'pos', 'is_start', 'is_end')
+    
+    def __init__(
+        self, 
+        node: core.Knoten
+    ) -> None:
+        """Immutable copy of a node that can be read from other threads
+
+        Args:
+            node (core.Knoten): Node that is copied
+        """
+        self.id = node.id
+        self.pos = (node.x(), node.y())
+        self.is_start = node.is_start
+        self.is_end = node.is_end
+    
+    @classmethod
+    def from_dict(
+        cls, 
+        node: dict
+    ) -> "PointSnapshot":
+        """Creates the copy of a node straight from its .ens dictionary, no core.Knoten is needed
+
+        Args:
+            node (dict): Node like FileManager.snapshot_to_dict stores it
+
+        Returns:
+            PointSnapshot: Copy of the node
+        """
+        point = cls.__new__(cls)
+        point.id = node['id']
+        point.pos = (node['x'], node['y'])
+        point.is_start = node['is_start']
+        point.is_end = node['is_end']
+        return point
+    
+    def x(self) -> float:
+        """Returns the x position of the node
+
+        Returns:
+            float: x position
+        """
+        return self.pos[0]
+    
+    def y(self) -> float:
+        """Returns the y position of the node
+
+        Returns:
+            float: y position
+        """
+        return self.pos[1]
+    
+    def __repr__(self) -> str:
+        """Returns a string identifying the snapshot
+
+        Returns:
+            str: the string
+        """
+        return f"PointSnapshot(id={self.id}, pos={self.pos})"
+
+
+class LineSnapshot:
+    __slots__ = ('pos1', 'pos2')
+    
+    def __init__(
+        self, 
+        pos1: PointSnapshot, 
+        pos2: PointSnapshot
+    ) -> None:
+        """Immutable copy of an edge
+
+        Args:
+            pos1 (PointSnapshot): First end of the edge
+            pos2 (PointSnapshot): Second end of the edge
+        """
+        self.pos1 = pos1
+        self.pos2 = pos2
+
+
+class SnapshotPoints(Sequence):
+    def __init__(
+        self,
+        snapshot: "GraphSnapshot"
+    ) -> None:
+        """Nodes of a snapshot, the PointSnapshot of a node is only built when it is accessed
+
+        Args:
+            snapshot (GraphSnapshot): Snapshot whose columns are read
+        """
+        self.snapshot = snapshot
+        self._points = [None] * len(snapshot.ids)
+    
+    def __getitem__(
+        self,
+        index: Union[int, slice]
+    ) -> Union[PointSnapshot, tuple]:
+        """Returns the copy of a node, built from the columns of the snapshot on first access
+
+        Args:
+            index (Union[int, slice]): Index of the node or a slice of indices
+
+        Returns:
+            Union[PointSnapshot, tuple]: Copy of the node or a tuple of copies for a slice
+        """
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        
+        point = self._points[index]
+        if point is None:
+            snapshot = self.snapshot
+            point = PointSnapshot.__new__(PointSnapshot)
+            point.id = snapshot.ids[index]
+            point.pos = (snapshot.xs[index], snapshot.ys[index])
+            point.is_start = bool(snapshot.flags[index] & START)
+            point.is_end = bool(snapshot.flags[index] & END)
+            self._points[index] = point # two threads may build the same node, both copies are equal
+        return point
+    
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+    
+    def __len__(self) -> int:
+        return len(self._points)
+
+
+class SnapshotLines(Sequence):
+    def __init__(
+        self,
+        snapshot: "GraphSnapshot"
+    ) -> None:
+        """Edges of a snapshot, the LineSnapshot of an edge is only built when it is accessed
+
+        Args:
+            snapshot (GraphSnapshot): Snapshot whose edges are read
+        """
+        self.snapshot = snapshot
+    
+    def __getitem__(
+        self,
+        index: Union[int, slice]
+    ) -> Union[LineSnapshot, tuple]:
+        """Returns the copy of an edge
+
+        Args:
+            index (Union[int, slice]): Index of the edge or a slice of indices
+
+        Returns:
+            Union[LineSnapshot, tuple]: Copy of the edge or a tuple of copies for a slice
+        """
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        
+        i, j = self.snapshot.edges[index]
+        return LineSnapshot(self.snapshot.points[i], self.snapshot.points[j])
+    
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+    
+    def __len__(self) -> int:
+        return len(self.snapshot.edges)
+
+
+class GraphSnapshot:
+    def __init__(
+        self, 
+        objects: NodeStore, 
+        version: int = 0,
+        edges: tuple = (),
+        components: tuple = (),
+        content_hash: int = 0
+    ) -> None:
+        """Immutable, versioned copy of every node and edge of the graph
+        
+        The solver, exporter and caches can work on it while the user keeps editing
+        
+        the original store. Only the position, id and flag columns are copied, which
+        
+        are flat arrays, the copies of single nodes and edges are built when they are read.
+
+        Args:
+            objects (NodeStore): Nodes of the graph
+            version (int, optional): Version of the graph the snapshot was taken of. Defaults to 0.
+            edges (tuple, optional): Every edge as a pair of indices into objects. Defaults to ().
+            components (tuple, optional): Component of each node, equal for nodes with a path between them. Defaults to ().
+            content_hash (int, optional): ContentHash of the graph the snapshot was taken of. Defaults to 0.
+        """
+        self.version = version
+        self.content_hash = content_hash
+        self.edges = tuple(edges)
+        self.components = tuple(components)
+        
+        self.xs = objects.xs[:]
+        self.ys = objects.ys[:]
+        self.ids = objects.ids[:]
+        self.flags = objects.flags[:]
+        
+        self.points = SnapshotPoints(self)
+        self.lines = SnapshotLines(self)
+    
+    def __len__(self) -> int:
+        """Returns the amount of nodes
+
+        Returns:
+            int: Amount of nodes
+        """
+        return len(self.ids)
\ No newline at end of file
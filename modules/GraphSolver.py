@@ -1,20 +1,247 @@
 import math
+import json
+import time
 import heapq
+import bisect
+import tracemalloc
 import modules.core as core
-from PyQt5.QtGui import(
-    QColor,
-)
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import modules.palette as palette
+import modules.NodeOrder as node_order
 from typing import Union
 from modules.QGraphicsViewManager import QGraphicsViewManager
 
+PROGRESS_INTERVAL = 1024 # settled nodes between two progress reports
+HEURISTIC_SCALE = 0.999 # keeps the A* heuristic below edge weights that were rounded down
+
+class SolveCancelled(Exception):
+    """Raised inside the GraphSolver when the running query was cancelled"""
+
+
+class SolverStats:
+    PHASES = ('order', 'build', 'weight', 'search', 'path', 'routes')
+    
+    def __init__(self) -> None:
+        """Collects timings and counters of a single query of the GraphSolver
+        
+        Timings are stored in nanoseconds for every phase in PHASES.
+        """
+        self.timings = {phase: 0 for phase in self.PHASES}
+        
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.settled = 0
+        self.relaxations = 0
+        self.edges_scanned = 0
+        self.spur_searches = 0
+        self.spur_tree_hits = 0 # spur paths taken straight from the shortest-path tree
+        
+        self.nodes = 0
+        self.edges = 0
+        self.start_index = None
+        self.end_index = None
+        self.sources = 0
+        self.targets = 0
+        self.distance = math.inf
+        self.path_length = 0
+        self.unreachable = False # no target shares a component with a source
+        self.routes = 0
+    
+    def total_ns(self) -> int:
+        """Returns the summed up time of every phase
+
+        Returns:
+            int: Time in nanoseconds
+        """
+        return sum(self.timings.values())
+    
+    def to_dict(self) -> dict:
+        """Returns the stats as a dictionary
+
+        Returns:
+            dict: Stats
+        """
+        return {
+            'query': {
+                'start_index': self.start_index,
+                'end_index': self.end_index,
+                'sources': self.sources,
+                'targets': self.targets,
+                'nodes': self.nodes,
+                'edges': self.edges
+            },
+            'result': {
+                'distance': self.distance if self.distance != math.inf else None,
+                'path_length': self.path_length,
+                'routes': self.routes,
+                'unreachable': self.unreachable
+            },
+            'timings_ns': dict(self.timings, total=self.total_ns()),
+            'counters': {
+                'pushes': self.pushes,
+                'pops': self.pops,
+                'stale_pops': self.stale_pops,
+                'settled': self.settled,
+                'relaxations': self.relaxations,
+                'edges_scanned': self.edges_scanned,
+                'spur_searches': self.spur_searches,
+                'spur_tree_hits': self.spur_tree_hits
+            }
+        }
+    
+    def to_json(
+        self, 
+        filename: str
+    ) -> None:
+        """Writes the stats into a .json file
+
+        Args:
+            filename (str): Filename
+        """
+        with open(f"{filename}", "w") as j:
+            json.dump(self.to_dict(), j, indent=4)
+    
+    def summary(self) -> str:
+        """Returns a one line summary of the phase timings and counters
+
+        Returns:
+            str: Summary
+        """
+        timings = " ".join(f"{phase}={self.timings[phase] / 1e6:.3f}ms" for phase in self.PHASES)
+        return (
+            f"{timings} | pushes={self.pushes} pops={self.pops} stale={self.stale_pops} "
+            f"settled={self.settled} relaxed={self.relaxations}"
+        )
+
+
+class ExplorationTrace:
+    def __init__(
+        self, 
+        points: tuple
+    ) -> None:
+        """Compact record of the order in which the search explored the graph
+        
+        Step k settles settled[k] and relaxes every edge between
+        
+        relax_offsets[k] and relax_offsets[k + 1] in relaxed_from / relaxed_to.
+
+        Args:
+            points (tuple): Nodes the indices of the trace refer to
+        """
+        self.points = points
+        
+        self.settled = array('l')
+        self.relax_offsets = array('l')
+        self.relaxed_from = array('l')
+        self.relaxed_to = array('l')
+    
+    def relaxations(
+        self, 
+        step: int
+    ) -> range:
+        """Returns the positions of the edges relaxed in a step
+
+        Args:
+            step (int): Step
+
+        Returns:
+            range: Positions in relaxed_from / relaxed_to
+        """
+        end = self.relax_offsets[step + 1] if step + 1 < len(self.relax_offsets) else len(self.relaxed_from)
+        return range(self.relax_offsets[step], end)
+    
+    def __len__(self) -> int:
+        """Returns the amount of steps
+
+        Returns:
+            int: Amount of settled nodes
+        """
+        return len(self.settled)
+
+
+class RangeResult:
+    def __init__(
+        self, 
+        points: tuple, 
+        thresholds: tuple
+    ) -> None:
+        """Nodes within the largest threshold of the sources, nearest first
+        
+        Node k of the result is indices[k] at distances[k] and lies in band bands[k],
+        
+        band b holds the nodes farther than thresholds[b - 1] but not farther than thresholds[b].
+
+        Args:
+            points (tuple): Nodes the indices of the result refer to
+            thresholds (tuple): Ascending distance limits of the bands
+        """
+        self.points = points
+        self.thresholds = thresholds
+        
+        self.indices = array('l')
+        self.distances = array('d')
+        self.bands = array('B')
+    
+    def by_band(self) -> list[list[int]]:
+        """Groups the nodes by their band
+
+        Returns:
+            list[list[int]]: Indices of the nodes of each band
+        """
+        groups = [[] for _ in self.thresholds]
+        for index, band in zip(self.indices, self.bands):
+            groups[band].append(index)
+        return groups
+    
+    def __len__(self) -> int:
+        """Returns the amount of nodes in range
+
+        Returns:
+            int: Amount of nodes
+        """
+        return len(self.indices)
+
+
+class EngineRun:
+    def __init__(
+        self, 
+        engine: str, 
+        result: tuple, 
+        explored: array, 
+        wall_ns: int, 
+        peak_bytes: int
+    ) -> None:
+        """Outcome of one engine of GraphSolver.compare_engines
+
+        Args:
+            engine (str): Name of the engine, one of GraphSolver.ENGINES
+            result (tuple): Path, distance and SolverStats the engine returned
+            explored (array): Indices of the settled nodes in the order they were settled
+            wall_ns (int): Wall time of the search and path in nanoseconds
+            peak_bytes (int): Peak of the memory allocated during the search
+        """
+        self.engine = engine
+        self.path, self.distance, self.stats = result
+        self.explored = explored
+        self.wall_ns = wall_ns
+        self.peak_bytes = peak_bytes
+
+
 class GraphSolver:
+    ENGINES = {'dijkstra': 'solve_graph', 'astar': 'solve_astar', 'bidirectional': 'solve_bidirectional'} # engine -> method
+    
     def __init__(
         self, 
         start: core.Knoten, 
         end: core.Knoten, 
         points: list, 
         lines: list,
-        graphicsView: QGraphicsViewManager
+        graphicsView: QGraphicsViewManager,
+        edges: tuple = None,
+        components: tuple = None,
+        weights: dict = None
     ):
         """Handles solving the graph
 
@@ -24,6 +251,12 @@ class GraphSolver:
             points (list): list of nodes
             lines (list): list of lines
             graphicsView (QGraphicsViewManager): QGraphicsView
+            edges (tuple, optional): Every edge as a pair of indices into points. Defaults to None,
+                then the edges are taken from the lines by matching positions.
+            components (tuple, optional): Component of each node. Defaults to None,
+                then unreachable targets are only noticed once the search ran dry.
+            weights (dict, optional): Weights of a solver on the same graph, they are shared and
+                set_neighbors is not needed. Defaults to None.
         """
         self.start = start
         self.start_index = 0
@@ -31,11 +264,49 @@ class GraphSolver:
         self.end_index = 0
         self.points = points
         self.lines = lines
-        self.weights = {i: {} for i in range(len(self.points))}
+        self.edges = edges
+        self.components = components
+        self.weights = weights if weights is not None else {i: {} for i in range(len(self.points))}
         self.graphicsView = graphicsView
+        self.stats = SolverStats()
+        
+        self.cancelled = False
+        self.progress_callback = None
+        self.record_trace = False
+        self.trace = None
+        
+        self.sources = [] # indices of every start node, the search starts at all of them
+        self.targets = [] # indices of every end node
+        self.all_targets = False # whether the search goes on until every target is settled
+        self.target_routes = [] # (source index, target index, path, distance) for each reached target
+        
+        self.order = None # one of NodeOrder.ORDERS, set_neighbors renumbers the nodes in that order if set
+        self.original_points = None # points before renumbering, None if the nodes were not renumbered
+        self.original_indices = None # index in original_points of each renumbered node
+        
+        self.thresholds = () # distance limits of the bands, range_query is run instead of solve_graph if set
+        self.engines = () # engines compare_engines is run with instead of solve_graph if set
+        self.running = None # fork of compare_engines that is solving right now
+        
+        self.routes = 1 # amount of routes find_alternatives looks for
+        self.max_overlap = 1.0
+        self.parallel_spurs = False
+        self.path_indices = []
+        self.alternatives = []
         
         self.current_line = None
     
+    def cancel(self) -> None:
+        """Cancels the query, the running phase raises SolveCancelled
+        
+        as soon as it notices.
+        """
+        self.cancelled = True
+        
+        running = self.running
+        if running is not None:
+            running.cancel()
+    
     def extract_end_nodes(
         self, 
         start: tuple[int, core.Knoten], 
@@ -52,6 +323,35 @@ class GraphSolver:
         
         self.start = start[1]
         self.end = end[1]
+        
+        self.sources = [self.start_index]
+        self.targets = [self.end_index]
+        
+        self.stats.start_index = self.start_index
+        self.stats.end_index = self.end_index
+        self.stats.sources = 1
+        self.stats.targets = 1
+    
+    def extract_terminals(
+        self, 
+        starts: list[tuple[int, core.Knoten]], 
+        ends: list[tuple[int, core.Knoten]]
+    ) -> None:
+        """Extracts every start and end node, the search is seeded with all start nodes
+        
+        and looks for the nearest end node or all of them if all_targets is set.
+
+        Args:
+            starts (list[tuple[int, core.Knoten]]): Index and node of each start node
+            ends (list[tuple[int, core.Knoten]]): Index and node of each end node
+        """
+        self.extract_end_nodes(starts[0], ends[0])
+        
+        self.sources = [i for i, _ in starts]
+        self.targets = [i for i, _ in ends]
+        
+        self.stats.sources = len(self.sources)
+        self.stats.targets = len(self.targets)
     
     def calculate_distance(
         self, 
@@ -69,35 +369,140 @@ class GraphSolver:
         """
         return round(math.sqrt(math.pow(point2.x() - point1.x(), 2) + math.pow(point2.y() - point1.y(), 2)), 4)
     
-    def calculate_weights(self) -> None:
-        """Calculates the weight of each edge and appends it to the weights
+    def calculate_weights(
+        self, 
+        neighbors: dict
+    ) -> None:
+        """Calculates the weight of each edge and stores it in the weights
+
+        Args:
+            neighbors (dict): Index of each node mapped to a list of (neighbor index, neighbor node)
         """
+        timestamp_start = time.perf_counter_ns()
+        
         for i, p in enumerate(self.points):
-            for neighbor in self.weights[i]['neighbors']:
-                distance = self.calculate_distance(p, neighbor)
-                self.weights[i]['weights'].append(distance)
+            if self.cancelled:
+                raise SolveCancelled()
+            
+            for neighbor_index, neighbor in neighbors[i]:
+                self.weights[i][neighbor_index] = self.calculate_distance(p, neighbor)
+        
+        self.stats.timings['weight'] = time.perf_counter_ns() - timestamp_start
+        self.stats.edges = sum(len(w) for w in self.weights.values())
+    
+    def renumber(
+        self, 
+        order: array
+    ) -> None:
+        """Renumbers the nodes, so neighbours of the search lie close to each other in memory
+        
+        Points, edges, components and the indices of the start and end nodes are rearranged,
+        
+        paths are still lists of the same nodes. Traces, range results and the start and end index
+        
+        of the stats refer to original_points again, so they can be used like without renumbering.
+        
+        Has to be called before the weights are built.
+
+        Args:
+            order (array): Index of the node at each new position, returned by NodeOrder.node_order
+        """
+        new_index = array('l', [0]) * len(order)
+        for position, i in enumerate(order):
+            new_index[i] = position
+        
+        self.original_points = self.points
+        self.original_indices = order
+        self.points = tuple(self.points[i] for i in order)
+        if self.edges is not None:
+            self.edges = tuple((new_index[i], new_index[j]) for i, j in self.edges)
+        if self.components:
+            self.components = tuple(self.components[i] for i in order)
+        
+        self.start_index = new_index[self.start_index]
+        self.end_index = new_index[self.end_index]
+        self.sources = [new_index[i] for i in self.sources]
+        self.targets = [new_index[i] for i in self.targets]
+        self.weights = {i: {} for i in range(len(self.points))}
+    
+    def _restore_trace(self) -> None:
+        """Makes the indices of the trace refer to the original points again
+        """
+        trace = self.trace
+        if trace is None or self.original_indices is None:
+            return
+        
+        original = self.original_indices
+        restored = ExplorationTrace(self.original_points)
+        restored.settled = array('l', (original[i] for i in trace.settled))
+        restored.relax_offsets = trace.relax_offsets
+        restored.relaxed_from = array('l', (original[i] for i in trace.relaxed_from))
+        restored.relaxed_to = array('l', (original[i] for i in trace.relaxed_to))
+        self.trace = restored
     
     def set_neighbors(self):
         """Sets the neighbor nodes of each node
+        
+        If edges were given both ends of every edge become neighbors of each other.
+        
+        Otherwise nodes are matched by position. Every node on the position of a line end
+        
+        gets the first node on the other end as neighbor. If an order is set and edges
+        
+        were given, the nodes are renumbered in that order first.
         """
-        for i, p1 in enumerate(self.points):
-            for line in self.lines:
-                if line.pos1.pos[0] == p1.pos[0] and line.pos1.pos[1] == p1.pos[1]:
-                    neighbor_index = self.graphicsView.find_object(line.pos2, self.points)
-                    weight = self.calculate_distance(p1, line.pos2)
-                    self.weights[i][neighbor_index] = weight
+        timestamp_start = time.perf_counter_ns()
+        if self.order is not None and self.edges is not None and self.original_indices is None:
+            self.renumber(node_order.node_order(self.order, self.points, self.edges))
+            self.stats.timings['order'] = time.perf_counter_ns() - timestamp_start
+            timestamp_start = time.perf_counter_ns()
+        
+        neighbors = {i: [] for i in range(len(self.points))}
+        
+        if self.edges is not None:
+            for i, j in self.edges:
+                if self.cancelled:
+                    raise SolveCancelled()
+                
+                neighbors[i].append((j, self.points[j]))
+                neighbors[j].append((i, self.points[i]))
+            
+            self.stats.timings['build'] = time.perf_counter_ns() - timestamp_start
+            self.stats.nodes = len(self.points)
+            self.calculate_weights(neighbors)
+            return
+        
+        on_position = {} # position -> indices of every node on it
+        for i, p in enumerate(self.points):
+            on_position.setdefault((p.pos[0], p.pos[1]), []).append(i)
+        
+        for line in self.lines:
+            if self.cancelled:
+                raise SolveCancelled()
+            
+            pos1 = (line.pos1.pos[0], line.pos1.pos[1])
+            pos2 = (line.pos2.pos[0], line.pos2.pos[1])
+            nodes1 = on_position.get(pos1)
+            nodes2 = on_position.get(pos2)
+            
+            if nodes1 and nodes2:
+                for i in nodes1:
+                    neighbors[i].append((nodes2[0], line.pos2))
                 
-                elif line.pos2.pos[0] == p1.pos[0] and line.pos2.pos[1] == p1.pos[1]:
-                    neighbor_index = self.graphicsView.find_object(line.pos1, self.points)
-                    weight = self.calculate_distance(p1, line.pos1)
-                    self.weights[i][neighbor_index] = weight
+                if pos1 != pos2:
+                    for i in nodes2:
+                        neighbors[i].append((nodes1[0], line.pos1))
+        
+        self.stats.timings['build'] = time.perf_counter_ns() - timestamp_start
+        self.stats.nodes = len(self.points)
+        self.calculate_weights(neighbors)
     
     def draw_connections(self) -> None:
         """Draw connection between each node and neighbor node
         """
         for i, p in enumerate(self.points):
             for neighbor in self.weights[i]['neighbors']:
-                self.connect_points(p, neighbor, QColor(0, 255, 255, 255))
+                self.connect_points(p, neighbor, palette.RELAXED)
     
     def draw_net(self) -> None:
         """Connects every node with each node
@@ -112,71 +517,773 @@ class GraphSolver:
         self, 
         point1: core.Knoten, 
         point2: core.Knoten, 
-        color: QColor = None
+        state: int = palette.NORMAL
     ) -> None:
-        """Connect two nodes with each other with a given color
+        """Connect two nodes with each other in the color of a given state
 
         Args:
             point1 (core.Knoten): First node
             point2 (core.Knoten): Second node
-            color (QColor, optional): QColor. Defaults to None.
+            state (int, optional): State like palette.PATH. Defaults to palette.NORMAL.
         """
-        kante = core.Kante(point1, point2, color)
+        kante = core.Kante(point1, point2, state)
         self.graphicsView.add_item(kante)
     
-    def solve_graph(self) -> tuple[list, float]:
+    def reachable_targets(self) -> list[int]:
+        """Returns the targets that share a component with any source
+        
+        Costs one lookup per source and target, no search is needed.
+
+        Returns:
+            list[int]: Indices of the reachable targets, every target if the components are unknown
+        """
+        targets = self.targets or [self.end_index]
+        if not self.components:
+            return targets
+        
+        source_components = {self.components[source] for source in self.sources or [self.start_index]}
+        return [target for target in targets if self.components[target] in source_components]
+    
+    def solve_graph(self) -> tuple[list, float, SolverStats]:
         """Creates a list of nodes containing the path from the start node
         
         until the end node.
+        
+        The search starts at every source at distance 0 and stops at the first settled target,
+        
+        so the path leads from the nearest source to the nearest target. If all_targets is set
+        
+        it goes on until every target is settled, the route to each one is in target_routes.
+        
+        Targets in other components than every source are dropped before searching,
+        
+        if none is left the query is answered as unreachable right away.
 
         Returns:
-            tuple[list, float]: List with the path and float with the distance in pixels
+            tuple[list, float, SolverStats]: List with the path, float with the distance in pixels and the stats of the query
         """
-        nodes_traveled = 0
+        stats = self.stats
+        trace = ExplorationTrace(self.points) if self.record_trace else None
+        self.trace = trace
+        timestamp_start = time.perf_counter_ns()
+        
+        targets = self.reachable_targets()
+        if not targets:
+            stats.timings['search'] = time.perf_counter_ns() - timestamp_start
+            return self.finalize_pathing({}, {}, [])
         
         distances = {node: math.inf for node in self.weights} # shortest distance to each node
         predecessors = {node: None for node in self.weights} # predecessor for each node
-        distances[self.start_index] = 0
-        priority_queue = [(0, self.start_index)] # min-heap queue
+        sources = self.sources or [self.start_index]
+        remaining = set(targets) # targets that are not settled yet
+        reached = []
+        
+        for source in sources:
+            distances[source] = 0
+        priority_queue = [(0, source) for source in sources] # min-heap queue
+        heapq.heapify(priority_queue)
+        stats.pushes += len(priority_queue)
         
         while priority_queue:
+            if self.cancelled:
+                raise SolveCancelled()
+            
             current_distance, current_node = heapq.heappop(priority_queue)
+            stats.pops += 1
             
-            if current_node == self.end_index:
-                break
+            if current_distance > distances[current_node]: # outdated entry of an already settled node
+                stats.stale_pops += 1
+                continue
+            stats.settled += 1
+            
+            if trace is not None:
+                trace.settled.append(current_node)
+                trace.relax_offsets.append(len(trace.relaxed_from))
+            
+            if self.progress_callback and stats.settled % PROGRESS_INTERVAL == 0:
+                self.progress_callback(stats.settled)
+            
+            if current_node in remaining:
+                remaining.discard(current_node)
+                reached.append(current_node)
+                
+                if not self.all_targets or not remaining:
+                    break
             
             for neighbor, weight in self.weights[current_node].items():
-                nodes_traveled += 1
+                stats.edges_scanned += 1
                 
                 distance = current_distance + weight
                 if distance < distances[neighbor]:
                     distances[neighbor] = distance
                     predecessors[neighbor] = current_node
                     heapq.heappush(priority_queue, (distance, neighbor))
+                    stats.relaxations += 1
+                    stats.pushes += 1
+                    
+                    if trace is not None:
+                        trace.relaxed_from.append(current_node)
+                        trace.relaxed_to.append(neighbor)
+        
+        stats.timings['search'] = time.perf_counter_ns() - timestamp_start
+        return self.finalize_pathing(predecessors, distances, reached)
+    
+    def range_query(
+        self, 
+        thresholds: list[float]
+    ) -> RangeResult:
+        """Finds every node within the largest threshold of any source in one bounded search
+        
+        Nodes are never pushed past the largest threshold, so only the area in range is explored.
+        
+        Each node is put into the band of the first threshold its distance does not exceed.
+
+        Args:
+            thresholds (list[float]): Distance limits of the bands
+
+        Returns:
+            RangeResult: Nodes in range with their distances and bands, nearest first
+        """
+        stats = self.stats
+        timestamp_start = time.perf_counter_ns()
+        
+        thresholds = tuple(sorted(thresholds))
+        limit = thresholds[-1]
+        result = RangeResult(self.points, thresholds)
+        
+        distances = {}
+        priority_queue = [(0, source) for source in self.sources or [self.start_index]]
+        heapq.heapify(priority_queue)
+        for _, source in priority_queue:
+            distances[source] = 0
+        stats.pushes += len(priority_queue)
+        
+        while priority_queue:
+            if self.cancelled:
+                raise SolveCancelled()
+            
+            current_distance, current_node = heapq.heappop(priority_queue)
+            stats.pops += 1
+            
+            if current_distance > distances[current_node]:
+                stats.stale_pops += 1
+                continue
+            stats.settled += 1
+            
+            result.indices.append(current_node)
+            result.distances.append(current_distance)
+            result.bands.append(bisect.bisect_left(thresholds, current_distance))
+            
+            if self.progress_callback and stats.settled % PROGRESS_INTERVAL == 0:
+                self.progress_callback(stats.settled)
+            
+            for neighbor, weight in self.weights[current_node].items():
+                stats.edges_scanned += 1
+                
+                distance = current_distance + weight
+                if distance <= limit and distance < distances.get(neighbor, math.inf):
+                    distances[neighbor] = distance
+                    heapq.heappush(priority_queue, (distance, neighbor))
+                    stats.relaxations += 1
+                    stats.pushes += 1
         
-        return self.finalize_pathing(predecessors, distances, nodes_traveled)
+        if self.original_indices is not None:
+            result.points = self.original_points
+            result.indices = array('l', (self.original_indices[i] for i in result.indices))
+        
+        stats.timings['search'] = time.perf_counter_ns() - timestamp_start
+        return result
+    
+    def solve_astar(self) -> tuple[list, float, SolverStats]:
+        """Finds the shortest path from the start node to the end node with A*
+        
+        The queue is ordered by the distance so far plus the straight line distance to the end node,
+        
+        scaled by HEURISTIC_SCALE so it never overestimates. Queries with several start or end nodes
+        
+        are answered by solve_graph, the heuristic only knows a single end node.
+
+        Returns:
+            tuple[list, float, SolverStats]: List with the path, float with the distance in pixels and the stats of the query
+        """
+        if len(self.sources) > 1 or len(self.targets) > 1: # the first end node may be unreachable while another is not
+            return self.solve_graph()
+        
+        stats = self.stats
+        trace = ExplorationTrace(self.points) if self.record_trace else None
+        self.trace = trace
+        timestamp_start = time.perf_counter_ns()
+        
+        if not self.reachable_targets():
+            stats.timings['search'] = time.perf_counter_ns() - timestamp_start
+            return self.finalize_pathing({}, {}, [])
+        
+        end_x, end_y = self.points[self.end_index].pos
+        points = self.points
+        heuristic = lambda node: HEURISTIC_SCALE * math.hypot(points[node].pos[0] - end_x, points[node].pos[1] - end_y)
+        
+        distances = {self.start_index: 0}
+        predecessors = {self.start_index: None}
+        priority_queue = [(heuristic(self.start_index), 0, self.start_index)]
+        stats.pushes += 1
+        reached = []
+        
+        while priority_queue:
+            if self.cancelled:
+                raise SolveCancelled()
+            
+            _, current_distance, current_node = heapq.heappop(priority_queue)
+            stats.pops += 1
+            
+            if current_distance > distances[current_node]:
+                stats.stale_pops += 1
+                continue
+            stats.settled += 1
+            
+            if trace is not None:
+                trace.settled.append(current_node)
+                trace.relax_offsets.append(len(trace.relaxed_from))
+            
+            if self.progress_callback and stats.settled % PROGRESS_INTERVAL == 0:
+                self.progress_callback(stats.settled)
+            
+            if current_node == self.end_index:
+                reached.append(current_node)
+                break
+            
+            for neighbor, weight in self.weights[current_node].items():
+                stats.edges_scanned += 1
+                
+                distance = current_distance + weight
+                if distance < distances.get(neighbor, math.inf):
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current_node
+                    heapq.heappush(priority_queue, (distance + heuristic(neighbor), distance, neighbor))
+                    stats.relaxations += 1
+                    stats.pushes += 1
+                    
+                    if trace is not None:
+                        trace.relaxed_from.append(current_node)
+                        trace.relaxed_to.append(neighbor)
+        
+        stats.timings['search'] = time.perf_counter_ns() - timestamp_start
+        return self.finalize_pathing(predecessors, distances, reached)
+    
+    def solve_bidirectional(self) -> tuple[list, float, SolverStats]:
+        """Finds the shortest path from the start node to the end node with a search from either end
+        
+        Each step settles a node of the side whose queue has the smaller top. Every relaxed edge
+        
+        that reaches a node of the other side is a candidate path, the search stops once the tops
+        
+        of both queues add up to at least the best candidate. Queries with several start or end nodes
+        
+        are answered by solve_graph, each side only starts at a single node.
+
+        Returns:
+            tuple[list, float, SolverStats]: List with the path, float with the distance in pixels and the stats of the query
+        """
+        if len(self.sources) > 1 or len(self.targets) > 1: # the first end node may be unreachable while another is not
+            return self.solve_graph()
+        
+        stats = self.stats
+        trace = ExplorationTrace(self.points) if self.record_trace else None
+        self.trace = trace
+        timestamp_start = time.perf_counter_ns()
+        
+        if not self.reachable_targets():
+            stats.timings['search'] = time.perf_counter_ns() - timestamp_start
+            return self.finalize_pathing({}, {}, [])
+        
+        # index 0 searches from the start node, index 1 from the end node
+        distances = ({self.start_index: 0}, {self.end_index: 0})
+        predecessors = ({self.start_index: None}, {self.end_index: None})
+        queues = ([(0, self.start_index)], [(0, self.end_index)])
+        stats.pushes += 2
+        
+        best = 0 if self.start_index == self.end_index else math.inf
+        meeting = self.start_index if best == 0 else None
+        
+        while queues[0] and queues[1] and queues[0][0][0] + queues[1][0][0] < best:
+            if self.cancelled:
+                raise SolveCancelled()
+            
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            own, other = distances[side], distances[1 - side]
+            
+            current_distance, current_node = heapq.heappop(queues[side])
+            stats.pops += 1
+            
+            if current_distance > own[current_node]:
+                stats.stale_pops += 1
+                continue
+            stats.settled += 1
+            
+            if trace is not None:
+                trace.settled.append(current_node)
+                trace.relax_offsets.append(len(trace.relaxed_from))
+            
+            if self.progress_callback and stats.settled % PROGRESS_INTERVAL == 0:
+                self.progress_callback(stats.settled)
+            
+            for neighbor, weight in self.weights[current_node].items():
+                stats.edges_scanned += 1
+                
+                distance = current_distance + weight
+                if distance < own.get(neighbor, math.inf):
+                    own[neighbor] = distance
+                    predecessors[side][neighbor] = current_node
+                    heapq.heappush(queues[side], (distance, neighbor))
+                    stats.relaxations += 1
+                    stats.pushes += 1
+                    
+                    if trace is not None:
+                        trace.relaxed_from.append(current_node)
+                        trace.relaxed_to.append(neighbor)
+                
+                if neighbor in other and distance + other[neighbor] < best:
+                    best = distance + other[neighbor]
+                    meeting = neighbor
+        
+        stats.timings['search'] = time.perf_counter_ns() - timestamp_start
+        if meeting is None:
+            return self.finalize_pathing({}, {}, [])
+        
+        # the path is the start side up to the meeting node followed by the end side after it
+        path = self._path_to(predecessors[0], meeting)
+        current = predecessors[1][meeting]
+        while current is not None:
+            path.append(current)
+            current = predecessors[1][current]
+        
+        joined = {path[0]: None}
+        for i in range(1, len(path)):
+            joined[path[i]] = path[i - 1]
+        return self.finalize_pathing(joined, {self.end_index: best}, [self.end_index])
+    
+    def fork(self) -> "GraphSolver":
+        """Returns a solver for the same start and end node that shares the weights
+        
+        but collects its own stats, set_neighbors has to be called before.
+
+        Returns:
+            GraphSolver: Solver that can be solved right away
+        """
+        solver = GraphSolver(
+            start = self.start, 
+            end = self.end, 
+            points = self.points, 
+            lines = self.lines, 
+            graphicsView = self.graphicsView, 
+            edges = self.edges, 
+            components = self.components, 
+            weights = self.weights
+        )
+        solver.progress_callback = self.progress_callback
+        solver.extract_end_nodes((self.start_index, self.start), (self.end_index, self.end))
+        solver.original_points = self.original_points
+        solver.original_indices = self.original_indices
+        
+        solver.stats.nodes = self.stats.nodes
+        solver.stats.edges = self.stats.edges
+        solver.stats.timings['order'] = self.stats.timings['order']
+        solver.stats.timings['build'] = self.stats.timings['build']
+        solver.stats.timings['weight'] = self.stats.timings['weight']
+        return solver
+    
+    def compare_engines(
+        self, 
+        engines: tuple = None
+    ) -> list[EngineRun]:
+        """Runs every engine on the start and end node, each on a fork of this solver
+        
+        Every engine runs three times: once for the wall time, once with tracemalloc for the peak
+        
+        memory and once recording a trace for the explored region, so neither measurement skews another.
+
+        Args:
+            engines (tuple, optional): Names of the engines, keys of ENGINES. Defaults to every engine.
+
+        Returns:
+            list[EngineRun]: One run per engine in the given order
+        """
+        runs = []
+        
+        for engine in engines or self.ENGINES:
+            solve = self.ENGINES[engine]
+            
+            timed = self._run_fork()
+            timestamp_start = time.perf_counter_ns()
+            result = getattr(timed, solve)()
+            wall_ns = time.perf_counter_ns() - timestamp_start
+            
+            measured = self._run_fork()
+            tracing = tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+            try:
+                baseline = tracemalloc.get_traced_memory()[0]
+                getattr(measured, solve)()
+                peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+            finally:
+                if not tracing:
+                    tracemalloc.stop()
+            
+            traced = self._run_fork()
+            traced.record_trace = True
+            getattr(traced, solve)()
+            
+            runs.append(EngineRun(engine, result, traced.trace.settled, wall_ns, peak_bytes))
+        
+        self.running = None
+        return runs
+    
+    def _run_fork(self) -> "GraphSolver":
+        """Forks the solver for one run of compare_engines, cancel reaches the running fork
+
+        Returns:
+            GraphSolver: Fork
+        """
+        self.running = self.fork()
+        if self.cancelled:
+            raise SolveCancelled()
+        return self.running
+    
+    def engines_agree(
+        self, 
+        runs: list[EngineRun]
+    ) -> bool:
+        """Returns whether or not every engine found a path of the same distance
+
+        Args:
+            runs (list[EngineRun]): Runs returned by compare_engines
+
+        Returns:
+            bool: True if all distances are equal up to rounding
+        """
+        return all(math.isclose(run.distance, runs[0].distance, rel_tol=1e-9, abs_tol=1e-6) for run in runs)
     
     def finalize_pathing(
         self, 
         predecessors: list, 
-        distances: list,
-        nodes_traveled: int
-    ) -> tuple[list, float]:
+        distances: list, 
+        reached: list = None
+    ) -> tuple[list, float, SolverStats]:
         """Puts the path together and returns it
 
         Args:
             predecessors (list): List of predecessors
             distances (list): List of distances of nodes to each other
+            reached (list, optional): Settled targets, nearest first. Defaults to None, then the end node is assumed to be settled.
+                An empty list means no target could be reached.
+
+        Returns:
+            tuple[list, float, SolverStats]: Path, total distance and the stats of the query, an empty path if no target was reached
+        """
+        timestamp_start = time.perf_counter_ns()
+        self._restore_trace()
+        
+        if reached is not None and not reached:
+            self.target_routes = []
+            self.path_indices = []
+            self.stats.timings['path'] = time.perf_counter_ns() - timestamp_start
+            self.stats.unreachable = True
+            self.stats.distance = math.inf
+            self.stats.path_length = 0
+            return ([], math.inf, self.stats)
+        
+        if reached:
+            self.end_index = reached[0]
+            self.end = self.points[self.end_index]
+        
+        self.target_routes = []
+        for target in reached or []:
+            route = self._path_to(predecessors, target)
+            self.target_routes.append((route[0], target, [self.points[i] for i in route], distances[target]))
+        
+        self.path_indices = self._path_to(predecessors, self.end_index)
+        path = [self.points[i] for i in self.path_indices]
+        
+        self.stats.timings['path'] = time.perf_counter_ns() - timestamp_start
+        self.stats.start_index = self.path_indices[0]
+        self.stats.end_index = self.end_index
+        if self.original_indices is not None:
+            self.stats.start_index = self.original_indices[self.stats.start_index]
+            self.stats.end_index = self.original_indices[self.stats.end_index]
+        self.stats.distance = distances[self.end_index]
+        self.stats.path_length = len(path)
+        return (path, distances[self.end_index], self.stats)
+    
+    def _path_to(
+        self, 
+        predecessors: list, 
+        target: int
+    ) -> list[int]:
+        """Follows the predecessors from a node back to the source it was reached from
+
+        Args:
+            predecessors (list): List of predecessors
+            target (int): Index of the node
 
         Returns:
-            tuple[list, float]: Path and total distance
+            list[int]: Indices of the path, starting at the source
         """
         path = []
-        current = self.end_index
+        current = target
         
         while current is not None:
-            path.append(self.points[current])
+            path.append(current)
             current = predecessors[current]
         
         path.reverse()
-        return (path, distances[self.end_index], nodes_traveled)
\ No newline at end of file
+        return path
+    
+    def find_alternatives(self) -> list[tuple[list, float]]:
+        """Looks for self.routes routes with the settings of the solver, has to be called after solve_graph
+
+        Returns:
+            list[tuple[list, float]]: Routes as list of nodes and distance, shortest first
+        """
+        self.alternatives = self.k_shortest_paths(self.routes, self.max_overlap, self.parallel_spurs)
+        return self.alternatives
+    
+    def k_shortest_paths(
+        self, 
+        k: int, 
+        max_overlap: float = 1.0, 
+        parallel: bool = False, 
+        max_candidates: int = None
+    ) -> list[tuple[list, float]]:
+        """Yen's k shortest loopless paths between the source and target of the path of solve_graph
+        
+        The path of solve_graph is the first route. Every spur search uses the tree of
+        
+        shortest distances to the end node: if the tree path from the spur node avoids every
+        
+        removed node and edge it is taken as is, otherwise an A* search guided by the tree
+        
+        distances is run that drops every node that can not beat the candidates still needed.
+        
+        Routes that share more than max_overlap of their length with a better route are skipped.
+
+        Args:
+            k (int): Amount of routes
+            max_overlap (float, optional): Share of a route that may lie on a better route, 0 to 1. Defaults to 1.0.
+            parallel (bool, optional): Whether the spur searches of a route run in a thread pool. Defaults to False.
+            max_candidates (int, optional): Maximum amount of loopless paths that are looked at. Defaults to k * 10.
+
+        Returns:
+            list[tuple[list, float]]: Routes as list of nodes and distance, shortest first
+        """
+        if not self.path_indices or self.stats.distance == math.inf:
+            return []
+        
+        timestamp_start = time.perf_counter_ns()
+        max_candidates = max_candidates or k * 10
+        to_end, next_hop = self._tree_to(self.end_index)
+        
+        first = (tuple(self.path_indices), self.stats.distance)
+        found = [first] # every route Yen produced, also the ones skipped for their overlap
+        accepted = [first]
+        candidates = [] # min-heap of (distance, path)
+        seen = {first[0]}
+        
+        executor = ThreadPoolExecutor() if parallel else None
+        try:
+            while len(accepted) < k and len(found) < max_candidates:
+                last = found[-1][0]
+                bound = self._candidate_bound(candidates, max_candidates - len(found) if max_overlap < 1 else k - len(found))
+                jobs = []
+                root_cost = 0
+                
+                for i in range(len(last) - 1):
+                    root = last[:i + 1]
+                    removed = {(path[i], path[i + 1]) for path, _ in found if path[:i + 1] == root}
+                    jobs.append((root, root_cost, set(root[:-1]), removed))
+                    root_cost += self.weights[last[i]][last[i + 1]]
+                
+                spur_search = lambda job: self._spur_path(job[0][-1], job[2], job[3], to_end, next_hop, bound - job[1])
+                spurs = executor.map(spur_search, jobs) if executor else map(spur_search, jobs)
+                self.stats.spur_searches += len(jobs)
+                
+                for (root, root_cost, _, _), spur in zip(jobs, spurs):
+                    if spur is None:
+                        continue
+                    
+                    self.stats.spur_tree_hits += spur[2]
+                    path = root[:-1] + tuple(spur[0])
+                    if path not in seen:
+                        seen.add(path)
+                        heapq.heappush(candidates, (root_cost + spur[1], path))
+                
+                if not candidates:
+                    break
+                
+                distance, path = heapq.heappop(candidates)
+                found.append((path, distance))
+                
+                if all(self.route_overlap(path, other) <= max_overlap for other, _ in accepted):
+                    accepted.append((path, distance))
+        finally:
+            if executor:
+                executor.shutdown()
+        
+        self.stats.routes = len(accepted)
+        self.stats.timings['routes'] = time.perf_counter_ns() - timestamp_start
+        return [([self.points[i] for i in path], distance) for path, distance in accepted]
+    
+    def _candidate_bound(
+        self, 
+        candidates: list, 
+        needed: int
+    ) -> float:
+        """Returns the distance a new candidate has to stay below to still be of use
+
+        Args:
+            candidates (list): Heap of (distance, path)
+            needed (int): Amount of routes that are still needed
+
+        Returns:
+            float: Distance of the worst candidate that may still be needed, math.inf if there are too few
+        """
+        if needed <= 0 or len(candidates) < needed:
+            return math.inf
+        return heapq.nsmallest(needed, candidates)[-1][0]
+    
+    def _tree_to(
+        self, 
+        target: int
+    ) -> tuple[dict, dict]:
+        """Runs a full search from the target node, edges are undirected so this
+        
+        gives the distance of every node to the target
+
+        Args:
+            target (int): Index of the target node
+
+        Returns:
+            tuple[dict, dict]: Distance to the target and next node on the way to the target for each reachable node
+        """
+        distances = {target: 0}
+        next_hop = {target: None}
+        priority_queue = [(0, target)]
+        
+        while priority_queue:
+            if self.cancelled:
+                raise SolveCancelled()
+            
+            current_distance, current_node = heapq.heappop(priority_queue)
+            if current_distance > distances[current_node]:
+                continue
+            
+            for neighbor, weight in self.weights[current_node].items():
+                distance = current_distance + weight
+                if distance < distances.get(neighbor, math.inf):
+                    distances[neighbor] = distance
+                    next_hop[neighbor] = current_node
+                    heapq.heappush(priority_queue, (distance, neighbor))
+        return (distances, next_hop)
+    
+    def _spur_path(
+        self, 
+        spur: int, 
+        blocked: set, 
+        removed: set, 
+        to_end: dict, 
+        next_hop: dict, 
+        bound: float
+    ) -> Union[tuple[list, float, bool], None]:
+        """Returns the shortest path from the spur node to the end node that avoids
+        
+        the blocked nodes and removed edges
+
+        Args:
+            spur (int): Index of the spur node
+            blocked (set): Indices of the nodes of the root path
+            removed (set): (from, to) edges used by earlier routes with the same root path
+            to_end (dict): Distance of each node to the end node
+            next_hop (dict): Next node on the way to the end node
+            bound (float): Paths longer than this are of no use
+
+        Returns:
+            Union[tuple[list, float, bool], None]: Path, distance and whether it was taken from the tree
+                or None if there is none below the bound
+        """
+        if spur not in to_end or to_end[spur] > bound:
+            return None
+        
+        path = [spur]
+        
+        while path[-1] != self.end_index:
+            current = path[-1]
+            following = next_hop[current]
+            
+            if following in blocked or (current, following) in removed:
+                break
+            path.append(following)
+        else:
+            return (path, to_end[spur], True)
+        
+        distances = {spur: 0}
+        predecessors = {spur: None}
+        priority_queue = [(to_end[spur], 0, spur)]
+        
+        while priority_queue:
+            if self.cancelled:
+                raise SolveCancelled()
+            
+            _, current_distance, current_node = heapq.heappop(priority_queue)
+            if current_distance > distances[current_node]:
+                continue
+            
+            if current_node == self.end_index:
+                path = []
+                while current_node is not None:
+                    path.append(current_node)
+                    current_node = predecessors[current_node]
+                path.reverse()
+                return (path, current_distance, False)
+            
+            for neighbor, weight in self.weights[current_node].items():
+                if neighbor in blocked or (current_node, neighbor) in removed or neighbor not in to_end:
+                    continue
+                
+                distance = current_distance + weight
+                if distance + to_end[neighbor] > bound: # can not beat the candidates that are still needed
+                    continue
+                
+                if distance < distances.get(neighbor, math.inf):
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current_node
+                    heapq.heappush(priority_queue, (distance + to_end[neighbor], distance, neighbor))
+        return None
+    
+    def route_overlap(
+        self, 
+        path: tuple, 
+        other: tuple
+    ) -> float:
+        """Returns the share of the length of a path that lies on another path
+
+        Args:
+            path (tuple): Indices of the nodes of the path
+            other (tuple): Indices of the nodes of the other path
+
+        Returns:
+            float: 0 if they share no edge, 1 if the path lies completely on the other one
+        """
+        shared_edges = set()
+        for i in range(1, len(other)):
+            shared_edges.add((other[i - 1], other[i]))
+            shared_edges.add((other[i], other[i - 1]))
+        
+        total = 0
+        shared = 0
+        for i in range(1, len(path)):
+            weight = self.weights[path[i - 1]][path[i]]
+            total += weight
+            if (path[i - 1], path[i]) in shared_edges:
+                shared += weight
+        return shared / total if total else 1.0
\ No newline at end of file
@@ -0,0 +1,308 @@
+import sys
+import json
+import tracemalloc
+from array import array
+from typing import Callable
+import modules.GraphSolver as gs
+from modules.GraphSnapshot import PointSnapshot
+
+# C++ side of a scene item including its share of the BSP index, measured as growth of the resident
+# memory per item with Qt 5.15 on 64-bit Linux. tracemalloc and sys.getsizeof only see the Python wrapper.
+ELLIPSE_ITEM_BYTES = 820
+LINE_ITEM_BYTES = 620
+
+def deep_sizeof(
+    obj: object,
+    seen: set = None,
+    follow: tuple = ()
+) -> int:
+    """Returns the size of an object and everything it holds in bytes
+    
+    Dictionaries, lists, tuples and sets are followed, other objects are counted
+    
+    with their __dict__ but without following their attributes, unless they are an
+    
+    instance of follow. Objects in seen are skipped, so shared objects are counted once.
+
+    Args:
+        obj (object): Object
+        seen (set, optional): Ids of the objects that were counted already, is extended. Defaults to None.
+        follow (tuple, optional): Types whose attributes are followed. Defaults to ().
+
+    Returns:
+        int: Bytes
+    """
+    seen = set() if seen is None else seen
+    stack = [obj]
+    total = 0
+    
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif isinstance(current, (str, bytes, int, float, bool, array)) or current is None:
+            continue
+        elif isinstance(current, follow):
+            if hasattr(current, '__dict__'):
+                stack.append(current.__dict__)
+            stack.extend(getattr(current, slot) for slot in getattr(type(current), '__slots__', ()))
+        elif hasattr(current, '__dict__') and id(current.__dict__) not in seen:
+            seen.add(id(current.__dict__))
+            total += sys.getsizeof(current.__dict__)
+    return total
+
+def traced_sizeof(func: Callable) -> tuple[object, int]:
+    """Calls a function and returns its result and the bytes it allocated that are still alive
+    
+    The allocations are the difference of two tracemalloc snapshots taken around the call.
+
+    Args:
+        func (Callable): Function without arguments
+
+    Returns:
+        tuple[object, int]: Result of the function and bytes
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    
+    try:
+        before = tracemalloc.take_snapshot()
+        result = func()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    
+    ignored = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(ignored).compare_to(before.filter_traces(ignored), 'filename')
+    return (result, sum(stat.size_diff for stat in stats))
+
+class MemoryReport:
+    CATEGORIES = ('model', 'solver', 'scene', 'io')
+    
+    def __init__(
+        self,
+        QGVM: "QGraphicsViewManager",
+        file_manager: "FileManager" = None,
+        trace: "ExplorationTrace" = None
+    ) -> None:
+        """Estimates how much memory the loaded graph costs, broken down by subsystem
+        
+        Data structures are measured with deep_sizeof, scene items with the measured size of
+        
+        their C++ side. The solver state and the save buffer only exist while a query or a save
+        
+        is running, they are built once on the current graph and measured with tracemalloc snapshots.
+
+        Args:
+            QGVM (QGraphicsViewManager): QGraphicsViewManager holding the graph
+            file_manager (FileManager, optional): FileManager of the graph. Defaults to None.
+            trace (ExplorationTrace, optional): Trace that is kept for playback. Defaults to None.
+        """
+        self.qgvm = QGVM
+        self.file_manager = file_manager
+        self.trace = trace
+        
+        self.entries = [] # (category, name, bytes, 'node', 'edge' or None for what the bytes grow with)
+        self.nodes = 0
+        self.edges = 0
+    
+    def add(
+        self,
+        category: str,
+        name: str,
+        size: int,
+        unit: str = None
+    ) -> None:
+        """Adds a measured structure to the report
+
+        Args:
+            category (str): One of CATEGORIES
+            name (str): Name of the structure
+            size (int): Bytes
+            unit (str, optional): 'node' or 'edge' if the structure grows with the nodes or edges. Defaults to None.
+        """
+        self.entries.append((category, name, size, unit))
+    
+    def measure(self) -> "MemoryReport":
+        """Measures every subsystem, entries of an earlier measurement are replaced
+
+        Returns:
+            MemoryReport: The report itself
+        """
+        self.entries = []
+        self.nodes = len(self.qgvm.objects)
+        self.edges = len(self.qgvm.edges)
+        
+        self._measure_model()
+        self._measure_solver()
+        self._measure_scene()
+        self._measure_io()
+        return self
+    
+    def _measure_model(self) -> None:
+        """Measures the node columns, the edge set, the adjacency, the components and the content hash
+        """
+        objects = self.qgvm.objects
+        edges = self.qgvm.edges
+        
+        columns = sum(sys.getsizeof(column) for column in (objects.xs, objects.ys, objects.ids, objects.flags, objects.states))
+        self.add('model', "node columns", columns + sys.getsizeof(objects.items) + deep_sizeof(objects._id_index), 'node')
+        self.add('model', "edge set", deep_sizeof(edges.edges) + deep_sizeof(edges.undrawn), 'edge')
+        self.add('model', "adjacency", deep_sizeof(edges.incident), 'edge')
+        self.add('model', "components", deep_sizeof(edges.components.parent) + deep_sizeof(edges.components.size), 'node')
+        self.add('model', "content hash", deep_sizeof(self.qgvm.content_hash.terms), 'node')
+    
+    def _measure_solver(self) -> None:
+        """Measures the snapshot the solver works on, the neighbors and weights of a query and the kept trace
+        """
+        snapshot = self.qgvm.snapshot()
+        seen = set()
+        follow = (PointSnapshot,)
+        
+        columns = sum(sys.getsizeof(column) for column in (snapshot.xs, snapshot.ys, snapshot.ids, snapshot.flags))
+        points = columns + deep_sizeof(snapshot.points._points, seen, follow) + deep_sizeof(snapshot.components, seen)
+        lines = deep_sizeof(snapshot.edges, seen)
+        self.add('solver', "snapshot nodes", points, 'node')
+        self.add('solver', "snapshot edges", lines, 'edge')
+        
+        if snapshot.points:
+            def solver_with_neighbors() -> gs.GraphSolver:
+                graph_solver = gs.GraphSolver(
+                    start = (0, snapshot.points[0]),
+                    end = (0, snapshot.points[0]),
+                    points = snapshot.points,
+                    lines = snapshot.lines,
+                    graphicsView = self.qgvm,
+                    edges = snapshot.edges,
+                    components = snapshot.components
+                )
+                graph_solver.set_neighbors()
+                return graph_solver
+            
+            _, weights = traced_sizeof(solver_with_neighbors)
+            self.add('solver', "neighbors and weights", weights, 'edge')
+        
+        if self.trace is not None:
+            trace = self.trace
+            self.add('solver', "exploration trace", sum(sys.getsizeof(column) for column in (trace.settled, trace.relax_offsets, trace.relaxed_from, trace.relaxed_to)))
+    
+    def _measure_scene(self) -> None:
+        """Measures the items of the nodes and edges and the scene of the clusters
+        """
+        node_items = [item for item in self.qgvm.objects.items if item is not None]
+        line_items = [line.graphics_item for line in self.qgvm.edges.edges.values() if line is not None]
+        
+        self.add('scene', "node items", sum(sys.getsizeof(item) + ELLIPSE_ITEM_BYTES for item in node_items), 'node')
+        self.add('scene', "edge items", sum(sys.getsizeof(item) + LINE_ITEM_BYTES for item in line_items), 'edge')
+        
+        lod = self.qgvm.lod
+        pyramid = deep_sizeof(lod.positions) + deep_sizeof(lod.pending) + sum(deep_sizeof(level.cells) + deep_sizeof(level.bundles) for level in lod.levels)
+        glyphs = len(lod.glyphs) * ELLIPSE_ITEM_BYTES + len(lod.bundles) * LINE_ITEM_BYTES
+        self.add('scene', "cluster pyramid and items", pyramid + glyphs)
+    
+    def _measure_io(self) -> None:
+        """Measures the dictionary a save builds, the journal buffer and the resident tiles
+        """
+        if self.file_manager is not None:
+            snapshot = self.qgvm.snapshot()
+            _, save_buffer = traced_sizeof(lambda: self.file_manager.snapshot_to_dict(snapshot))
+            self.add('io', "save dictionary (while saving)", save_buffer)
+            
+            tiles = self.file_manager.tiles
+            if tiles is not None:
+                self.add('io', "tile cache", deep_sizeof(tiles.resident) + deep_sizeof(tiles.reader.index))
+        
+        journal = self.qgvm.journal
+        if journal is not None and journal._file is not None:
+            self.add('io', "journal buffer", journal.buffer_size)
+    
+    def total(
+        self,
+        category: str = None
+    ) -> int:
+        """Returns the summed up bytes of a category or of every category
+
+        Args:
+            category (str, optional): One of CATEGORIES. Defaults to None, then every category is summed up.
+
+        Returns:
+            int: Bytes
+        """
+        return sum(size for entry_category, _, size, _ in self.entries if category in (None, entry_category))
+    
+    def per_unit(
+        self,
+        unit: str
+    ) -> float:
+        """Returns the bytes of the structures that grow with the nodes or edges per node or edge
+
+        Args:
+            unit (str): 'node' or 'edge'
+
+        Returns:
+            float: Bytes per node or edge, 0 for an empty graph
+        """
+        count = self.nodes if unit == 'node' else self.edges
+        if not count:
+            return 0.0
+        return sum(size for _, _, size, entry_unit in self.entries if entry_unit == unit) / count
+    
+    def to_dict(self) -> dict:
+        """Returns the report as a dictionary
+
+        Returns:
+            dict: Report
+        """
+        return {
+            'nodes': self.nodes,
+            'edges': self.edges,
+            'total': self.total(),
+            'per_node': self.per_unit('node'),
+            'per_edge': self.per_unit('edge'),
+            'categories': {
+                category: {
+                    'total': self.total(category),
+                    'structures': {name: size for entry_category, name, size, _ in self.entries if entry_category == category}
+                } for category in self.CATEGORIES
+            }
+        }
+    
+    def to_json(
+        self,
+        filename: str
+    ) -> None:
+        """Writes the report into a .json file
+
+        Args:
+            filename (str): Filename
+        """
+        with open(f"{filename}", "w") as j:
+            json.dump(self.to_dict(), j, indent=4)
+    
+    def report(self) -> str:
+        """Returns the bytes of each category and structure
+
+        Returns:
+            str: One line per category followed by its structures, largest first
+        """
+        lines = [
+            f"{self.nodes} nodes, {self.edges} edges: {self.total() / 1024:.1f}KiB total, "
+            f"{self.per_unit('node'):.0f}B per node, {self.per_unit('edge'):.0f}B per edge"
+        ]
+        
+        for category in self.CATEGORIES:
+            lines.append(f"{category}: {self.total(category) / 1024:.1f}KiB")
+            entries = [entry for entry in self.entries if entry[0] == category]
+            for _, name, size, unit in sorted(entries, key=lambda entry: entry[2], reverse=True):
+                lines.append(f"    {name}: {size / 1024:.1f}KiB" + (f" (per {unit})" if unit else ""))
+        return "\n".join(lines)
\ No newline at end of file
@@ -1,9 +1,9 @@
 from modules.QGraphicsViewManager import QGraphicsViewManager
 from modules.core import Knoten
-import modules.utils as utils
-from PyQt5.QtGui import(
-    QColor, 
-    QMouseEvent
+import modules.palette as palette
+from PyQt5.QtCore import(
+    QPointF,
+    QRectF
 )
 
 class MoveAgent:
@@ -13,45 +13,144 @@ class MoveAgent:
     ) -> None:
         """Initializes the MoveAgent"""
         self.selected_objects = []
+        self.selected_ids = set() # ids of the selected nodes, for membership tests
+        self.highlighted = set() # indices of the nodes that are drawn as selected
         self.qgvm = QGVM
     
     def select_objects(
         self, 
-        cursor: QMouseEvent
+        cursor: QPointF, 
+        extend: bool = False
     ) -> None:
         """Selects all objects on the cursor position
 
         Args:
-            cursor (QMouseEvent): Mouse cursor
+            cursor (QPointF): Mouse cursor in scene coordinates
+            extend (bool, optional): Adds the objects to the selection, or removes them if they are selected already. Defaults to False.
         """
         node_pos = Knoten([cursor.x(), cursor.y()])
-        self.selected_objects = self.qgvm.get_all_objects_on_pos(node_pos)
+        clicked = self.qgvm.get_all_objects_on_pos(node_pos)
+        
+        if not extend:
+            self.selected_objects = clicked
+        elif clicked and all(obj.id in self.selected_ids for obj in clicked):
+            removed = {obj.id for obj in clicked}
+            self.selected_objects = [obj for obj in self.selected_objects if obj.id not in removed]
+        else:
+            self.selected_objects += [obj for obj in clicked if obj.id not in self.selected_ids]
+        
+        self.selected_ids = {obj.id for obj in self.selected_objects}
+    
+    def select_area(
+        self, 
+        rect: QRectF, 
+        extend: bool = False
+    ) -> None:
+        """Selects every node whose centre lies inside the rectangle
+
+        Args:
+            rect (QRectF): Rubber band in scene coordinates
+            extend (bool, optional): Adds the nodes to the selection. Defaults to False.
+        """
+        indices = self.qgvm.objects.in_rect(rect.left() - 5, rect.top() - 5, rect.right() - 5, rect.bottom() - 5) # positions are top left corners
+        self._select_indices(indices, extend)
+    
+    def select_lasso(
+        self, 
+        polygon: list[QPointF], 
+        extend: bool = False
+    ) -> None:
+        """Selects every node whose centre lies inside the lasso
+
+        Args:
+            polygon (list[QPointF]): Corners of the lasso in scene coordinates
+            extend (bool, optional): Adds the nodes to the selection. Defaults to False.
+        """
+        indices = self.qgvm.objects.in_polygon([(point.x() - 5, point.y() - 5) for point in polygon])
+        self._select_indices(indices, extend)
+    
+    def _select_indices(
+        self, 
+        indices: list, 
+        extend: bool
+    ) -> None:
+        """Selects the nodes at the given indices
+
+        Args:
+            indices (list): Indices of the nodes
+            extend (bool): Adds the nodes to the selection instead of replacing it
+        """
+        objects = self.qgvm.objects
+        nodes = [objects[i] for i in indices]
+        
+        if extend:
+            self.selected_objects += [node for node in nodes if node.id not in self.selected_ids]
+        else:
+            self.selected_objects = nodes
+        self.selected_ids = {obj.id for obj in self.selected_objects}
     
     def highlight_selected_objects(self) -> None:
         """Highlights the selected objects
+        
+        Only the nodes whose selection changed get a new state, all of them in one batch.
         """
-        for obj in self.qgvm.objects:
-            if obj in self.selected_objects:
-                obj.setColor(QColor(255, 0, 0, 255))
-            else:
-                obj.setColor(QColor(0, 0, 0, 255))
-        self.qgvm.refresh_scene()
+        objects = self.qgvm.objects
+        selected = {objects.index(obj) for obj in self.selected_objects}
+        
+        with self.qgvm.held_updates():
+            for i in self.highlighted - selected:
+                if i < len(objects):
+                    node = objects[i]
+                    node.setState(palette.node_state(node))
+            
+            objects.set_states(selected, palette.SELECTED) # unchanged nodes are skipped
+        self.highlighted = selected
+    
+    def clear_selection(self) -> None:
+        """Deselects every node, also the ones whose index changed since they were highlighted
+        """
+        self.selected_objects = []
+        self.selected_ids = set()
+        self.highlighted = set()
+        
+        for node in self.qgvm.objects:
+            if node.state == palette.SELECTED:
+                node.setState(palette.node_state(node))
     
     def move_selected_objects(
         self, 
-        cursor: QMouseEvent
+        cursor: QPointF
     ) -> None:
-        """Moves the selected objects
+        """Moves the selected objects as a group, the first selected node ends up under the cursor
+        
+        The other nodes keep their offsets to it. If the first node lands on a node outside of the
+        
+        selection the whole group snaps so both lie on top of each other. Only the items of the
+        
+        moved nodes and their edges are updated.
 
         Args:
-            cursor (QMouseEvent): Mouse cursor
+            cursor (QPointF): Mouse cursor in scene coordinates
         """
+        if not self.selected_objects:
+            return
+        
+        objects = self.qgvm.objects
+        anchor = self.selected_objects[0]
+        dx = cursor.x() - 5 - anchor.x()
+        dy = cursor.y() - 5 - anchor.y()
+        
+        target = Knoten([anchor.x() + dx, anchor.y() + dy])
+        for other_point in self.qgvm.nodes_at(target):
+            if other_point.id not in self.selected_ids:
+                dx = other_point.x() - anchor.x()
+                dy = other_point.y() - anchor.y()
+                break
+        
+        indices = [objects.index(obj) for obj in self.selected_objects]
+        objects.translate(indices, dx, dy)
+        self.qgvm.update_nodes(indices)
+        
         for obj in self.selected_objects:
-            obj.setX(cursor.x() - 5)
-            obj.setY(cursor.y() - 5)
-            
-            for other_point in self.qgvm.objects:
-                if utils.rectangle_collide(obj, other_point):
-                    obj.setX(other_point.x())
-                    obj.setY(other_point.y())
-        self.qgvm.refresh_scene()
\ No newline at end of file
+            self.qgvm.record_edit("move", node = obj)
+        self.qgvm.mark_changed()
\ No newline at end of file
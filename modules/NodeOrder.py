@@ -0,0 +1,163 @@
+from array import array
+from collections import deque
+import modules.utils as utils
+
+np = utils.lazy_import("numpy") # numpy is optional, the keys are computed node by node without it
+
+CURVE_BITS = 16 # bits per axis positions are quantized to before they are put on a curve
+
+def _quantize(points: tuple) -> tuple:
+    """Scales the positions of the nodes onto a grid of 2^CURVE_BITS cells per axis
+
+    Args:
+        points (tuple): Nodes
+
+    Returns:
+        tuple: x and y cells, numpy arrays if numpy is installed, lists otherwise
+    """
+    side = (1 << CURVE_BITS) - 1
+    xs = [point.pos[0] for point in points]
+    ys = [point.pos[1] for point in points]
+    min_x, min_y = min(xs), min(ys)
+    scale = side / max(max(xs) - min_x, max(ys) - min_y, 1e-9) # one scale for both axes keeps the curve square
+    
+    if np is not None:
+        cells_x = ((np.asarray(xs, dtype=np.float64) - min_x) * scale).astype(np.int64)
+        cells_y = ((np.asarray(ys, dtype=np.float64) - min_y) * scale).astype(np.int64)
+        return (cells_x, cells_y)
+    return ([int((x - min_x) * scale) for x in xs], [int((y - min_y) * scale) for y in ys])
+
+def hilbert_key(
+    x,
+    y
+):
+    """Returns the position of a cell along the Hilbert curve
+    
+    Only bit operations are used, so x and y may be ints or numpy arrays of int64.
+
+    Args:
+        x (int or np.ndarray): x cell below 2^CURVE_BITS
+        y (int or np.ndarray): y cell below 2^CURVE_BITS
+
+    Returns:
+        int or np.ndarray: Position on the curve
+    """
+    side = (1 << CURVE_BITS) - 1
+    key = x * 0
+    
+    for bit in range(CURVE_BITS - 1, -1, -1):
+        rx = (x >> bit) & 1
+        ry = (y >> bit) & 1
+        key = key + (((3 * rx) ^ ry) << (2 * bit))
+        
+        # rotate the quadrant so the curve continues where the previous one ended
+        flip = -(rx & (ry ^ 1)) & side
+        x = x ^ flip
+        y = y ^ flip
+        swap = (x ^ y) & -(ry ^ 1)
+        x = x ^ swap
+        y = y ^ swap
+    return key
+
+def zorder_key(
+    x,
+    y
+):
+    """Returns the position of a cell along the Z-order curve by interleaving the bits of x and y
+
+    Args:
+        x (int or np.ndarray): x cell below 2^CURVE_BITS
+        y (int or np.ndarray): y cell below 2^CURVE_BITS
+
+    Returns:
+        int or np.ndarray: Position on the curve
+    """
+    key = x * 0
+    for bit in range(CURVE_BITS):
+        key = key | (((x >> bit) & 1) << (2 * bit)) | (((y >> bit) & 1) << (2 * bit + 1))
+    return key
+
+def curve_order(
+    points: tuple,
+    key
+) -> array:
+    """Returns the indices of the nodes sorted by their position along a space-filling curve
+
+    Args:
+        points (tuple): Nodes
+        key (Callable): hilbert_key or zorder_key
+
+    Returns:
+        array: Index of the node at each new position
+    """
+    if not points:
+        return array('l')
+    
+    cells_x, cells_y = _quantize(points)
+    if np is not None:
+        return array('l', np.argsort(key(cells_x, cells_y), kind='stable').tolist())
+    
+    keys = [key(x, y) for x, y in zip(cells_x, cells_y)]
+    return array('l', sorted(range(len(points)), key=keys.__getitem__))
+
+def bfs_order(
+    count: int,
+    edges: tuple
+) -> array:
+    """Returns the indices of the nodes in breadth-first order, component after component
+    
+    Neighbours end up close to each other, which also works for graphs that are not spatial.
+
+    Args:
+        count (int): Amount of nodes
+        edges (tuple): Every edge as a pair of indices
+
+    Returns:
+        array: Index of the node at each new position
+    """
+    neighbors = [[] for _ in range(count)]
+    for i, j in edges:
+        neighbors[i].append(j)
+        neighbors[j].append(i)
+    
+    seen = bytearray(count)
+    order = array('l')
+    for root in range(count):
+        if seen[root]:
+            continue
+        
+        seen[root] = 1
+        queue = deque([root])
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            for neighbor in neighbors[current]:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    queue.append(neighbor)
+    return order
+
+ORDERS = ('hilbert', 'zorder', 'bfs')
+
+def node_order(
+    name: str,
+    points: tuple,
+    edges: tuple
+) -> array:
+    """Returns a cache-friendly order of the nodes
+
+    Args:
+        name (str): One of ORDERS
+        points (tuple): Nodes
+        edges (tuple): Every edge as a pair of indices into points
+
+    Returns:
+        array: Index of the node at each new position
+    """
+    if name == 'hilbert':
+        return curve_order(points, hilbert_key)
+    if name == 'zorder':
+        return curve_order(points, zorder_key)
+    if name == 'bfs':
+        return bfs_order(len(points), edges)
+    raise ValueError(f"unknown node order {name}, expected one of {', '.join(ORDERS)}")
\ No newline at end of file
@@ -0,0 +1,535 @@
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QGraphicsEllipseItem
+from array import array
+from typing import Union
+import modules.core as core
+import modules.utils as utils
+import modules.palette as palette
+
+np = utils.lazy_import("numpy") # numpy is optional, the bulk operations fall back to plain loops without it
+
+START = 1
+END = 2
+
+class NodeView:
+    __slots__ = ('store', 'index')
+    width = 10
+    height = 10
+    
+    def __init__(
+        self,
+        store: "NodeStore",
+        index: int
+    ) -> None:
+        """Lightweight view of a single node inside a NodeStore
+
+        Behaves like a core.Knoten but reads and writes the columns of the store.
+
+        A view is only valid as long as no node before it is removed.
+
+        Args:
+            store (NodeStore): Store the node lives in
+            index (int): Index of the node
+        """
+        self.store = store
+        self.index = index
+    
+    @property
+    def id(self) -> int:
+        return self.store.ids[self.index]
+    
+    @id.setter
+    def id(self, value: int) -> None:
+        self.store.ids[self.index] = value
+        self.store._id_index = None
+        self.store.layout += 1
+        
+        if self.graphics_item is not None:
+            self.graphics_item.setData(core.NODE_ID_KEY, value)
+    
+    @property
+    def pos(self) -> list:
+        return [self.store.xs[self.index], self.store.ys[self.index]]
+    
+    @pos.setter
+    def pos(self, value: list) -> None:
+        self.store.xs[self.index] = value[0]
+        self.store.ys[self.index] = value[1]
+    
+    @property
+    def is_start(self) -> bool:
+        return bool(self.store.flags[self.index] & START)
+    
+    @is_start.setter
+    def is_start(self, value: bool) -> None:
+        self.store.set_flag(self.index, START, value)
+    
+    @property
+    def is_end(self) -> bool:
+        return bool(self.store.flags[self.index] & END)
+    
+    @is_end.setter
+    def is_end(self, value: bool) -> None:
+        self.store.set_flag(self.index, END, value)
+    
+    @property
+    def state(self) -> int:
+        return self.store.states[self.index]
+    
+    @state.setter
+    def state(self, value: int) -> None:
+        self.store.states[self.index] = value
+    
+    @property
+    def color(self) -> QColor:
+        return palette.color(self.store.states[self.index])
+    
+    @property
+    def graphics_item(self) -> QGraphicsEllipseItem:
+        return self.store.items[self.index]
+    
+    @graphics_item.setter
+    def graphics_item(self, value: QGraphicsEllipseItem) -> None:
+        self.store.items[self.index] = value
+    
+    def x(self) -> float:
+        """Returns the x position of the node
+
+        Returns:
+            float: x position
+        """
+        return self.store.xs[self.index]
+    
+    def y(self) -> float:
+        """Returns the y position of the node
+
+        Returns:
+            float: y position
+        """
+        return self.store.ys[self.index]
+    
+    def setX(
+        self,
+        x: Union[int, float]
+    ) -> None:
+        """Changes the x value with the given int or float
+
+        Args:
+            x (Union[int, float]): new x position
+        """
+        self.store.xs[self.index] = x
+    
+    def setY(
+        self,
+        y: Union[int, float]
+    ) -> None:
+        """Changes the y value with the given int or float
+
+        Args:
+            y (Union[int, float]): new y position
+        """
+        self.store.ys[self.index] = y
+    
+    def setState(
+        self,
+        state: int
+    ) -> None:
+        """Changes the state of the node, the pen is only set if it changed
+
+        Args:
+            state (int): new state like palette.SELECTED
+        """
+        self.store.set_state(self.index, state)
+    
+    def _set_graphics_item(self) -> None:
+        """Creates a QGraphicsItem for the node
+        """
+        self.graphics_item = QGraphicsEllipseItem(self.x(), self.y(), self.width, self.height)
+        self.graphics_item.setPen(palette.pen(self.state))
+        self.graphics_item.setBrush(palette.brush(self.state))
+        self.graphics_item.setData(core.NODE_ID_KEY, self.id)
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, NodeView) and other.store is self.store and other.index == self.index
+    
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.index))
+    
+    def __repr__(self) -> str:
+        """Returns a string identifying the node
+
+        Returns:
+            str: the string
+        """
+        return f"Knoten(id={self.id}, pos={self.pos})"
+
+
+class NodeStore:
+    def __init__(self) -> None:
+        """List of nodes stored as columns instead of one object per node
+
+        Positions, ids, flags and palette states live in arrays, accessing
+
+        a node returns a NodeView. Only the graphics items are kept per node.
+        """
+        self.xs = array('d')
+        self.ys = array('d')
+        self.ids = array('q')
+        self.flags = array('B')
+        self.states = array('B') # state of the palette like palette.SELECTED
+        self.items = []
+        
+        self._id_index = None # id -> index, built on demand
+        self.layout = 0 # bumped whenever nodes are added, removed or get another id, index data built for one layout stays valid while nodes only move
+    
+    def set_state(
+        self,
+        index: int,
+        state: int
+    ) -> None:
+        """Changes the state of a node, its item is only touched if the state changed
+
+        Args:
+            index (int): Index of the node
+            state (int): new state like palette.SELECTED
+        """
+        if self.states[index] == state:
+            return
+        
+        self.states[index] = state
+        item = self.items[index]
+        if item is not None:
+            item.setPen(palette.pen(state))
+            item.setBrush(palette.brush(state))
+    
+    def set_states(
+        self,
+        indices: list,
+        state: int
+    ) -> None:
+        """Changes the state of many nodes at once, the pen and brush are looked up once
+
+        Args:
+            indices (list): Indices of the nodes
+            state (int): new state like palette.SELECTED
+        """
+        states = self.states
+        items = self.items
+        pen, brush = palette.pen(state), palette.brush(state)
+        
+        for i in indices:
+            if states[i] == state:
+                continue
+            
+            states[i] = state
+            if items[i] is not None:
+                items[i].setPen(pen)
+                items[i].setBrush(brush)
+    
+    def set_flag(
+        self,
+        index: int,
+        flag: int,
+        value: bool
+    ) -> None:
+        """Sets or clears a flag of a node
+
+        Args:
+            index (int): Index of the node
+            flag (int): START or END
+            value (bool): Whether the flag is set
+        """
+        if value:
+            self.flags[index] |= flag
+        else:
+            self.flags[index] &= ~flag
+    
+    def _flags_of(
+        self,
+        node: core.Knoten
+    ) -> int:
+        """Returns the flags of a node as one int
+
+        Args:
+            node (core.Knoten): Node
+
+        Returns:
+            int: Flags
+        """
+        return (START if node.is_start else 0) | (END if node.is_end else 0)
+    
+    def _tag(
+        self,
+        node: core.Knoten
+    ) -> QGraphicsEllipseItem:
+        """Stores the id of a node in its graphics item, so items found in the scene lead back to it
+
+        Args:
+            node (core.Knoten): Node
+
+        Returns:
+            QGraphicsEllipseItem: Graphics item of the node
+        """
+        if node.graphics_item is not None:
+            node.graphics_item.setData(core.NODE_ID_KEY, node.id)
+        return node.graphics_item
+    
+    def insert(
+        self,
+        index: int,
+        node: core.Knoten
+    ) -> None:
+        """Copies a node into the store at the given index
+
+        Args:
+            index (int): Index
+            node (core.Knoten): Node, its graphics item is taken over
+        """
+        self.xs.insert(index, node.x())
+        self.ys.insert(index, node.y())
+        self.ids.insert(index, node.id)
+        self.flags.insert(index, self._flags_of(node))
+        self.states.insert(index, node.state)
+        self.items.insert(index, self._tag(node))
+        self._id_index = None
+        self.layout += 1
+    
+    def append(
+        self,
+        node: core.Knoten
+    ) -> None:
+        """Copies a node to the end of the store
+
+        Args:
+            node (core.Knoten): Node, its graphics item is taken over
+        """
+        self.xs.append(node.x())
+        self.ys.append(node.y())
+        self.ids.append(node.id)
+        self.flags.append(self._flags_of(node))
+        self.states.append(node.state)
+        self.items.append(self._tag(node))
+        self.layout += 1
+        
+        if self._id_index is not None:
+            self._id_index[node.id] = len(self.ids) - 1
+    
+    def extend(
+        self,
+        nodes: list
+    ) -> None:
+        """Copies every node to the end of the store
+
+        Args:
+            nodes (list): Nodes
+        """
+        for node in nodes:
+            self.append(node)
+    
+    def pop(
+        self,
+        index: int = -1
+    ) -> None:
+        """Removes the node at the given index
+
+        Args:
+            index (int, optional): Index. Defaults to -1.
+        """
+        self.xs.pop(index)
+        self.ys.pop(index)
+        self.ids.pop(index)
+        self.flags.pop(index)
+        self.states.pop(index)
+        self.items.pop(index)
+        self._id_index = None
+        self.layout += 1
+    
+    def remove(
+        self,
+        indices: list
+    ) -> None:
+        """Removes the nodes at the given indices in one pass over the columns
+
+        Args:
+            indices (list): Indices of the nodes
+        """
+        removed = set(indices)
+        if not removed:
+            return
+        
+        keep = [i for i in range(len(self)) if i not in removed]
+        self.xs = array('d', [self.xs[i] for i in keep])
+        self.ys = array('d', [self.ys[i] for i in keep])
+        self.ids = array('q', [self.ids[i] for i in keep])
+        self.flags = array('B', [self.flags[i] for i in keep])
+        self.states = array('B', [self.states[i] for i in keep])
+        self.items = [self.items[i] for i in keep]
+        self._id_index = None
+        self.layout += 1
+    
+    def clear(self) -> None:
+        """Removes every node
+        """
+        for column in (self.xs, self.ys, self.ids, self.flags, self.states):
+            del column[:]
+        self.items.clear()
+        self._id_index = None
+        self.layout += 1
+    
+    def index(
+        self,
+        node: Union[NodeView, core.Knoten]
+    ) -> int:
+        """Returns the index of a node
+
+        Args:
+            node (Union[NodeView, core.Knoten]): View of this store or node with the same graphics item
+
+        Returns:
+            int: Index
+        """
+        if isinstance(node, NodeView) and node.store is self:
+            return node.index
+        return self.items.index(node.graphics_item)
+    
+    def index_of_id(
+        self,
+        node_id: int
+    ) -> int:
+        """Returns the index of the node with the given id
+
+        Args:
+            node_id (int): Id of the node
+
+        Returns:
+            int: Index or None if there is no such node
+        """
+        if self._id_index is None:
+            self._id_index = {node_id: i for i, node_id in enumerate(self.ids)}
+        return self._id_index.get(node_id)
+    
+    def in_rect(
+        self,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float
+    ) -> list:
+        """Returns the indices of every node whose position lies inside the rectangle
+
+        Args:
+            x1 (float): Left
+            y1 (float): Top
+            x2 (float): Right
+            y2 (float): Bottom
+
+        Returns:
+            list: Indices
+        """
+        if np is not None and len(self.xs):
+            xs = np.frombuffer(self.xs, dtype=np.float64)
+            ys = np.frombuffer(self.ys, dtype=np.float64)
+            indices = np.flatnonzero((xs >= x1) & (xs <= x2) & (ys >= y1) & (ys <= y2)).tolist()
+            del xs, ys # release the buffers so the arrays can grow again
+            return indices
+        
+        return [i for i, (x, y) in enumerate(zip(self.xs, self.ys)) if x1 <= x <= x2 and y1 <= y <= y2]
+    
+    def in_polygon(
+        self,
+        polygon: list
+    ) -> list:
+        """Returns the indices of every node whose position lies inside the polygon
+        
+        Only the nodes inside the bounding rectangle are tested, with the even-odd rule.
+
+        Args:
+            polygon (list): Corners of the polygon as (x, y)
+
+        Returns:
+            list: Indices
+        """
+        if len(polygon) < 3:
+            return []
+        
+        xs_polygon = [x for x, _ in polygon]
+        ys_polygon = [y for _, y in polygon]
+        candidates = self.in_rect(min(xs_polygon), min(ys_polygon), max(xs_polygon), max(ys_polygon))
+        edges = list(zip(polygon, polygon[1:] + polygon[:1]))
+        
+        if np is not None and candidates:
+            index_array = np.asarray(candidates, dtype=np.intp)
+            px = np.frombuffer(self.xs, dtype=np.float64)[index_array]
+            py = np.frombuffer(self.ys, dtype=np.float64)[index_array]
+            inside = np.zeros(len(candidates), dtype=bool)
+            
+            with np.errstate(divide='ignore', invalid='ignore'): # horizontal edges never cross
+                for (x1, y1), (x2, y2) in edges:
+                    crosses = (y1 > py) != (y2 > py)
+                    inside ^= crosses & (px < x1 + (py - y1) * (x2 - x1) / (y2 - y1))
+            return index_array[inside].tolist()
+        
+        indices = []
+        for i in candidates:
+            x, y = self.xs[i], self.ys[i]
+            inside = False
+            for (x1, y1), (x2, y2) in edges:
+                if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                    inside = not inside
+            if inside:
+                indices.append(i)
+        return indices
+    
+    def translate(
+        self,
+        indices: list,
+        dx: float,
+        dy: float
+    ) -> None:
+        """Moves the given nodes by the same offset
+
+        Args:
+            indices (list): Indices of the nodes
+            dx (float): Offset on the x axis
+            dy (float): Offset on the y axis
+        """
+        if np is not None and len(indices):
+            index_array = np.asarray(indices, dtype=np.intp)
+            xs = np.frombuffer(self.xs, dtype=np.float64)
+            ys = np.frombuffer(self.ys, dtype=np.float64)
+            xs[index_array] += dx
+            ys[index_array] += dy
+            del xs, ys
+            return
+        
+        for i in indices:
+            self.xs[i] += dx
+            self.ys[i] += dy
+    
+    def __len__(self) -> int:
+        return len(self.xs)
+    
+    def __iter__(self):
+        for i in range(len(self.xs)):
+            yield NodeView(self, i)
+    
+    def __contains__(self, node: object) -> bool:
+        if isinstance(node, NodeView):
+            return node.store is self and 0 <= node.index < len(self)
+        return getattr(node, 'graphics_item', None) in self.items
+    
+    def __getitem__(
+        self,
+        index: Union[int, slice]
+    ) -> Union[NodeView, list]:
+        if isinstance(index, slice):
+            return [NodeView(self, i) for i in range(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("NodeStore index out of range")
+        return NodeView(self, index)
+    
+    def __repr__(self) -> str:
+        return f"NodeStore({len(self)} nodes)"
\ No newline at end of file
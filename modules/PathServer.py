@@ -0,0 +1,524 @@
+import os
+import json
+import time
+import socket
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+import modules.GraphSolver as gs
+import modules.TiledGraph as tg
+from modules.EdgeStore import Components
+from modules.GraphSnapshot import PointSnapshot
+
+LATENCY_WINDOW = 10_000 # latest requests the latency percentiles are computed over
+MAX_PIPELINE = 256 # requests of one connection that may be in flight before it is no longer read
+MAX_LINE = 64 * 1024 * 1024 # bytes of a single request, a query takes about 20, asyncio allows 64 KiB by default
+
+def load_ens(filename: str) -> dict:
+    """Reads a .ens file into a single dictionary, every tile of a tiled file is read
+
+    Args:
+        filename (str): Filename
+
+    Returns:
+        dict: .ens content like FileManager.snapshot_to_dict returns it
+    """
+    if not tg.is_tiled(filename):
+        with open(filename, "r") as j:
+            return json.load(j)
+    
+    reader = tg.TileReader(filename)
+    data = {'points': {}, 'edges': []}
+    seen = set()
+    
+    for key in reader.index:
+        tile = reader.read_tile(key)
+        for node in tile['points'].values():
+            data['points'][len(data['points'])] = node
+        for u, v in tile['edges']: # edges between two tiles are stored in both
+            if (u, v) not in seen:
+                seen.add((u, v))
+                data['edges'].append([u, v])
+    return data
+
+class GraphIndex:
+    def __init__(
+        self,
+        data: dict,
+        order: str = None
+    ) -> None:
+        """Graph of a .ens file with the weights and components built once for every query
+        
+        With an order the nodes are renumbered once while the weights are built,
+        
+        points and index_of follow the renumbered solver.
+
+        Args:
+            data (dict): .ens content, files of the legacy format have to be saved again with the editor first
+            order (str, optional): One of NodeOrder.ORDERS. Defaults to None, then the order of the file is kept.
+        """
+        if 'edges' not in data:
+            raise ValueError("legacy .ens files without edges are not supported, save the file again with the editor")
+        
+        self.points = tuple(PointSnapshot.from_dict(node) for node in data['points'].values())
+        self.index_of = {point.id: i for i, point in enumerate(self.points)}
+        self.edges = tuple((self.index_of[u], self.index_of[v]) for u, v in data['edges'] if u in self.index_of and v in self.index_of)
+        
+        components = Components()
+        components.rebuild(self.edges)
+        self.components = tuple(components.find(i) for i in range(len(self.points)))
+        
+        self.solver = None
+        if self.points:
+            self.solver = gs.GraphSolver(
+                start = (0, self.points[0]),
+                end = (0, self.points[0]),
+                points = self.points,
+                lines = (),
+                graphicsView = None,
+                edges = self.edges,
+                components = self.components
+            )
+            self.solver.order = order
+            self.solver.set_neighbors()
+            
+            if self.solver.original_indices is not None:
+                self.points = self.solver.points
+                self.index_of = {point.id: i for i, point in enumerate(self.points)}
+                self.edges = self.solver.edges
+                self.components = self.solver.components
+    
+    @classmethod
+    def load(
+        cls,
+        filename: str,
+        order: str = None
+    ) -> "GraphIndex":
+        """Loads a .ens file, plain or tiled
+
+        Args:
+            filename (str): Filename
+            order (str, optional): One of NodeOrder.ORDERS the nodes are renumbered in. Defaults to None.
+
+        Returns:
+            GraphIndex: Index of the graph
+        """
+        return cls(load_ens(filename), order)
+    
+    def solve_batch(
+        self,
+        queries: list
+    ) -> list[dict]:
+        """Answers a batch of (source id, target id) queries
+        
+        Queries that share a source are answered by a single search that goes on until
+        
+        each of their targets is settled, a source with a single target is searched with A*.
+        
+        Safe to call from several threads at once,
+        
+        every search works on its own fork of the solver.
+
+        Args:
+            queries (list): Pairs of node ids
+
+        Returns:
+            list[dict]: Result of each query in the order of the queries, with the distance and the path as node ids,
+                a distance of None if the target can not be reached or an error for unknown ids
+        """
+        results = [None] * len(queries)
+        by_source = {} # source index -> [(position in the batch, target index)]
+        
+        for position, query in enumerate(queries):
+            try:
+                source_id, target_id = query
+                source, target = self.index_of[source_id], self.index_of[target_id]
+            except (TypeError, ValueError, KeyError):
+                results[position] = {'error': f"unknown query {query}"}
+                continue
+            by_source.setdefault(source, []).append((position, target))
+        
+        for source, entries in by_source.items():
+            solver = self.solver.fork()
+            solver.extract_terminals([(source, self.points[source])], [(target, self.points[target]) for _, target in entries])
+            if len(entries) == 1:
+                solver.solve_astar()
+            else:
+                solver.all_targets = True
+                solver.solve_graph()
+            
+            routes = {target: (path, distance) for _, target, path, distance in solver.target_routes}
+            for position, target in entries:
+                if target in routes:
+                    path, distance = routes[target]
+                    results[position] = {'distance': distance, 'path': [point.id for point in path]}
+                else:
+                    results[position] = {'distance': None, 'path': []}
+        return results
+
+class ServerMetrics:
+    def __init__(
+        self,
+        window: int = LATENCY_WINDOW
+    ) -> None:
+        """Throughput and latency of a PathServer
+        
+        Latency is the time from reading a request until its response is written,
+        
+        so it includes the time the request waited behind earlier requests of its connection.
+
+        Args:
+            window (int, optional): Latest requests the latency percentiles are computed over. Defaults to LATENCY_WINDOW.
+        """
+        self.started = time.perf_counter()
+        self.connections = 0 # open right now
+        self.total_connections = 0
+        self.requests = 0
+        self.queries = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window) # nanoseconds
+    
+    def record(
+        self,
+        latency_ns: int,
+        queries: int,
+        failed: bool = False
+    ) -> None:
+        """Records an answered request
+
+        Args:
+            latency_ns (int): Time from reading the request until its response was written
+            queries (int): Amount of path queries in the request
+            failed (bool, optional): Whether or not the request was answered with an error. Defaults to False.
+        """
+        self.requests += 1
+        self.queries += queries
+        self.errors += failed
+        self.latencies.append(latency_ns)
+    
+    def percentile(
+        self,
+        share: float
+    ) -> float:
+        """Returns a percentile of the latencies in the window
+
+        Args:
+            share (float): 0.5 for the median, 0.99 for the 99th percentile
+
+        Returns:
+            float: Latency in milliseconds, 0 if nothing was answered yet
+        """
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(share * len(ordered)))] / 1e6
+    
+    def to_dict(self) -> dict:
+        """Returns the metrics as a dictionary
+
+        Returns:
+            dict: Metrics
+        """
+        uptime = time.perf_counter() - self.started
+        return {
+            'uptime_s': uptime,
+            'connections': self.connections,
+            'total_connections': self.total_connections,
+            'requests': self.requests,
+            'queries': self.queries,
+            'errors': self.errors,
+            'throughput': {
+                'requests_per_s': self.requests / uptime,
+                'queries_per_s': self.queries / uptime
+            },
+            'latency_ms': {
+                'p50': self.percentile(0.5),
+                'p95': self.percentile(0.95),
+                'p99': self.percentile(0.99),
+                'max': max(self.latencies, default=0) / 1e6
+            }
+        }
+
+class PathServer:
+    def __init__(
+        self,
+        index: GraphIndex,
+        workers: int = None,
+        line_limit: int = MAX_LINE
+    ) -> None:
+        """Answers path queries on a loaded graph over newline-delimited JSON
+        
+        Every line a client sends is one request, every line the server sends back is the response
+        
+        to one request, in the order of the requests. Connections stay open for as many requests
+        
+        as the client likes and requests may be sent before the earlier ones were answered.
+        
+            {"id": 1, "op": "paths", "queries": [[source id, target id], ...]}
+            
+            {"id": 2, "op": "metrics"}
+            
+            {"id": 3, "op": "ping"}
+            
+        The searches run in a thread pool, so the event loop keeps reading and answering metrics meanwhile.
+
+        Args:
+            index (GraphIndex): Loaded graph
+            workers (int, optional): Threads of the pool the searches run in. Defaults to the amount of CPUs.
+            line_limit (int, optional): Bytes a single request may have, longer ones are answered with an error. Defaults to MAX_LINE.
+        """
+        self.index = index
+        self.line_limit = line_limit
+        self.metrics = ServerMetrics()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.server = None
+    
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = None
+    ) -> None:
+        """Starts listening on a Unix socket if a path is given, on a local TCP port otherwise
+
+        Args:
+            host (str, optional): Host of the TCP socket. Defaults to "127.0.0.1".
+            port (int, optional): Port of the TCP socket, 0 picks a free one. Defaults to 0.
+            path (str, optional): Path of the Unix socket. Defaults to None.
+        """
+        if path is not None:
+            if os.path.exists(path):
+                os.remove(path)
+            self.server = await asyncio.start_unix_server(self._handle, path=path, limit=self.line_limit)
+        else:
+            self.server = await asyncio.start_server(self._handle, host=host, port=port, limit=self.line_limit)
+    
+    def address(self) -> Union[str, tuple]:
+        """Returns the address the server listens on
+
+        Returns:
+            Union[str, tuple]: Path of the Unix socket or (host, port)
+        """
+        return self.server.sockets[0].getsockname()
+    
+    async def serve_forever(self) -> None:
+        """Answers requests until the server is closed
+        """
+        async with self.server:
+            await self.server.serve_forever()
+    
+    async def close(self) -> None:
+        """Stops listening and waits for the running searches
+        """
+        self.server.close()
+        await self.server.wait_closed()
+        self.executor.shutdown(wait=True)
+    
+    async def _handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Reads the requests of a connection and hands them to the sender in their order
+        
+        A request longer than the line limit is skipped and answered with an error, the connection stays open.
+
+        Args:
+            reader (asyncio.StreamReader): Reader of the connection
+            writer (asyncio.StreamWriter): Writer of the connection
+        """
+        self.metrics.connections += 1
+        self.metrics.total_connections += 1
+        in_flight = asyncio.Queue(MAX_PIPELINE) # full queues stop the reading until responses were sent
+        sender = asyncio.create_task(self._send(in_flight, writer))
+        
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial # last request without a newline
+                except asyncio.LimitOverrunError:
+                    await in_flight.put((time.perf_counter_ns(), asyncio.create_task(self._reject(f"requests are limited to {self.line_limit} bytes"))))
+                    if not await self._skip_line(reader):
+                        break
+                    continue
+                if not line:
+                    break
+                if line.strip():
+                    await in_flight.put((time.perf_counter_ns(), asyncio.create_task(self._answer(line))))
+        except ConnectionError:
+            pass
+        finally:
+            await in_flight.put(None)
+            await sender
+            self.metrics.connections -= 1
+            writer.close()
+    
+    async def _send(
+        self,
+        in_flight: asyncio.Queue,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Writes the responses of a connection in the order of its requests
+
+        Args:
+            in_flight (asyncio.Queue): (time the request was read, task answering it), None once the connection is done
+            writer (asyncio.StreamWriter): Writer of the connection
+        """
+        while True:
+            entry = await in_flight.get()
+            if entry is None:
+                return
+            
+            received, task = entry
+            response, queries = await task
+            try:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+            except ConnectionError:
+                continue # the client is gone, the remaining answers are thrown away
+            self.metrics.record(time.perf_counter_ns() - received, queries, 'error' in response)
+    
+    async def _skip_line(
+        self,
+        reader: asyncio.StreamReader
+    ) -> bool:
+        """Throws away the rest of a request that is longer than the line limit
+
+        Args:
+            reader (asyncio.StreamReader): Reader of the connection
+
+        Returns:
+            bool: True if the end of the request was found, False if the connection was closed before
+        """
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return True
+            except asyncio.LimitOverrunError as e:
+                await reader.readexactly(e.consumed)
+            except asyncio.IncompleteReadError:
+                return False
+    
+    async def _reject(
+        self,
+        message: str
+    ) -> tuple[dict, int]:
+        """Answers a request that could not be read
+
+        Args:
+            message (str): Error
+
+        Returns:
+            tuple[dict, int]: Response and no path queries
+        """
+        return ({'id': None, 'error': message}, 0)
+    
+    async def _answer(
+        self,
+        line: bytes
+    ) -> tuple[dict, int]:
+        """Answers a single request
+
+        Args:
+            line (bytes): Request as JSON
+
+        Returns:
+            tuple[dict, int]: Response and the amount of path queries it answered
+        """
+        try:
+            request = json.loads(line)
+            op = request.get('op', 'paths')
+        except (ValueError, AttributeError):
+            return ({'error': "requests have to be JSON objects"}, 0)
+        
+        response = {'id': request.get('id')}
+        if op == 'ping':
+            return (response, 0)
+        if op == 'metrics':
+            response['metrics'] = self.metrics.to_dict()
+            return (response, 0)
+        if op != 'paths':
+            response['error'] = f"unknown op {op}"
+            return (response, 0)
+        
+        queries = request.get('queries')
+        if not isinstance(queries, list):
+            response['error'] = "paths requests need a list of [source id, target id] queries"
+            return (response, 0)
+        if self.index.solver is None:
+            response['error'] = "the graph is empty"
+            return (response, 0)
+        
+        loop = asyncio.get_running_loop()
+        try:
+            response['results'] = await loop.run_in_executor(self.executor, self.index.solve_batch, queries)
+        except Exception as e:
+            response['error'] = f"solving failed: {e}"
+        return (response, len(queries))
+
+class PathClient:
+    def __init__(
+        self,
+        address: Union[str, tuple]
+    ) -> None:
+        """Blocking client of a PathServer that keeps its connection open
+
+        Args:
+            address (Union[str, tuple]): Path of a Unix socket or (host, port)
+        """
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        self.socket.connect(address)
+        self.file = self.socket.makefile("rwb")
+        self.next_id = 0
+    
+    def pipeline(
+        self,
+        requests: list[dict]
+    ) -> list[dict]:
+        """Sends every request before reading any response
+
+        Args:
+            requests (list[dict]): Requests, ids are added where they are missing
+
+        Returns:
+            list[dict]: Responses in the order of the requests
+        """
+        for request in requests:
+            if 'id' not in request:
+                self.next_id += 1
+                request = dict(request, id=self.next_id)
+            self.file.write(json.dumps(request).encode() + b"\n")
+        self.file.flush()
+        return [json.loads(self.file.readline()) for _ in requests]
+    
+    def paths(
+        self,
+        queries: list
+    ) -> list[dict]:
+        """Answers a batch of path queries
+
+        Args:
+            queries (list): Pairs of (source id, target id)
+
+        Returns:
+            list[dict]: Result of each query, see GraphIndex.solve_batch
+        """
+        return self.pipeline([{'op': 'paths', 'queries': queries}])[0]['results']
+    
+    def metrics(self) -> dict:
+        """Returns the metrics of the server
+
+        Returns:
+            dict: ServerMetrics.to_dict of the server
+        """
+        return self.pipeline([{'op': 'metrics'}])[0]['metrics']
+    
+    def close(self) -> None:
+        """Closes the connection
+        """
+        self.file.close()
+        self.socket.close()
\ No newline at end of file
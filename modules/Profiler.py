@@ -0,0 +1,117 @@
+import time
+import cProfile
+import functools
+from typing import Callable
+
+class Profiler:
+    def __init__(self) -> None:
+        """Profiles the event handlers of the editor
+
+        Handlers have to be wrapped once, afterwards they are only measured
+
+        while the profiler is enabled. When it is disabled a wrapped handler costs one attribute lookup.
+        """
+        self.enabled = False
+        self.profile = cProfile.Profile()
+        self.handlers = {} # name -> [calls, cumulative time in ns]
+        
+        self._depth = 0
+    
+    def set_enabled(
+        self,
+        enabled: bool
+    ) -> None:
+        """Enables or disables the profiler
+
+        Args:
+            enabled (bool): Whether or not handlers should be profiled
+        """
+        self.enabled = enabled
+    
+    def reset(self) -> None:
+        """Throws away everything that has been collected so far
+        """
+        self.profile = cProfile.Profile()
+        self.handlers.clear()
+    
+    def wrap(
+        self,
+        name: str,
+        func: Callable
+    ) -> Callable:
+        """Wraps a handler so its calls and cumulative time are collected
+
+        Args:
+            name (str): Name the handler is reported as
+            func (Callable): Handler
+
+        Returns:
+            Callable: Wrapped handler
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            
+            self._depth += 1
+            if self._depth == 1:
+                self.profile.enable()
+            
+            timestamp_start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - timestamp_start
+                entry = self.handlers.setdefault(name, [0, 0])
+                entry[0] += 1
+                entry[1] += elapsed
+                
+                self._depth -= 1
+                if self._depth == 0:
+                    self.profile.disable()
+        
+        return wrapper
+    
+    def instrument(
+        self,
+        obj: object,
+        names: list[str],
+        prefix: str = None
+    ) -> None:
+        """Replaces the given methods of an object with wrapped ones
+
+        Args:
+            obj (object): Object whose methods are wrapped
+            names (list[str]): Names of the methods
+            prefix (str, optional): Prefix for the reported names. Defaults to the class name.
+        """
+        prefix = prefix or type(obj).__name__
+        
+        for name in names:
+            setattr(obj, name, self.wrap(f"{prefix}.{name}", getattr(obj, name)))
+    
+    def report(self) -> str:
+        """Returns the calls and cumulative times of each handler
+
+        Returns:
+            str: One line per handler, slowest first
+        """
+        lines = []
+        
+        for name, (calls, total) in sorted(self.handlers.items(), key=lambda item: item[1][1], reverse=True):
+            lines.append(f"{name}: {calls} calls, {total / 1e6:.3f}ms total, {total / calls / 1e6:.3f}ms avg")
+        return "\n".join(lines)
+    
+    def dump_stats(
+        self,
+        filename: str
+    ) -> None:
+        """Writes the collected profile into a .pstats file
+
+        The file can be opened with pstats, snakeviz or converted for flamegraphs.
+
+        Args:
+            filename (str): Filename
+        """
+        self.profile.create_stats()
+        self.profile.dump_stats(filename)
\ No newline at end of file
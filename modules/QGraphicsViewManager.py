@@ -2,12 +2,30 @@ from PyQt5.QtWidgets import(
     QGraphicsScene,
     QGraphicsView,
 )
+from PyQt5.QtCore import(
+    QPointF,
+    QRectF
+)
 from PyQt5.QtGui import QMouseEvent
 from typing import Union
+from contextlib import contextmanager
+import math
 import modules.core as core
 import modules.utils as utils
+import modules.palette as palette
+from modules.NodeStore import NodeStore
+from modules.EdgeStore import EdgeStore
+from modules.GraphSnapshot import GraphSnapshot
+from modules.ClusterLOD import ClusterLOD
+from modules.ResultCache import ContentHash
 import random
 
+CANVAS_SIZE = 100_000 # width and height of the scene, the view only shows a part of it
+ZOOM_STEP = 1.25 # scale factor of one wheel notch
+MIN_ZOOM = 0.01
+MAX_ZOOM = 20.0
+ITEMS_PER_LEAF = 16 # items the BSP index of the scene should hold per leaf
+
 class QGraphicsViewManager:
     def __init__(
         self, 
@@ -18,34 +36,485 @@ class QGraphicsViewManager:
         Args:
             graphicsView (QGraphicsView): GraphicsView object
         """
-        self.objects = []
-        self.lines = []
+        self.objects = NodeStore()
+        self.edges = EdgeStore()
+        self.last_node = None # id of the node the next drawn node is connected to
         self.graphicsView = graphicsView
         
+        self.version = 0
+        self._snapshot = None
+        self._indices = None # (node layout, edge version, edge indices, component labels) they were built for
+        self.content_hash = ContentHash()
+        
+        self.journal = None
+        self.edit_listeners = [] # called with every edit like record_edit, e.g. to pin the tiles of edited nodes
+        
         self.scene = QGraphicsScene(self.graphicsView)
+        self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.bsp_depth = 0
         self.graphicsView.setScene(self.scene)
-        self.scene.setSceneRect(self.graphicsView.x(), self.graphicsView.y(), self.graphicsView.width(), self.graphicsView.height())
+        self.graphicsView.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
+        
+        # the scene is far larger than the widget, the view starts where widget and scene coordinates match
+        width, height = self.graphicsView.width(), self.graphicsView.height()
+        self.scene.setSceneRect(width / 2 - CANVAS_SIZE / 2, height / 2 - CANVAS_SIZE / 2, CANVAS_SIZE, CANVAS_SIZE)
+        self.reset_view()
+        
+        self.lod = ClusterLOD(self)
     
-    def add_point(
+    def reset_view(self) -> None:
+        """Resets the zoom and scrolls the view so the top left corner of the viewport shows the scene origin
+        
+        Has to be called again once the widget is shown, before that the viewport has no final size.
+        """
+        viewport = self.graphicsView.viewport()
+        self.graphicsView.resetTransform()
+        self.graphicsView.centerOn(viewport.width() / 2, viewport.height() / 2)
+    
+    def map_to_scene(
         self, 
         event: QMouseEvent
+    ) -> QPointF:
+        """Returns the position of a mouse event in scene coordinates
+
+        Args:
+            event (QMouseEvent): Mouse event of the graphicsView
+
+        Returns:
+            QPointF: Position in the scene
+        """
+        return self.graphicsView.mapToScene(event.pos())
+    
+    def visible_rect(self) -> QRectF:
+        """Returns the part of the scene that is visible in the viewport
+
+        Returns:
+            QRectF: Visible area in scene coordinates
+        """
+        return self.graphicsView.mapToScene(self.graphicsView.viewport().rect()).boundingRect()
+    
+    def zoom(
+        self, 
+        steps: float
     ) -> None:
-        """Adds a node to the graphicsView
+        """Zooms in or out around the mouse cursor
 
         Args:
-            event (QMouseEvent): Mouse cursor
+            steps (float): Wheel notches, negative values zoom out
         """
-        point = core.Knoten([event.x() - 5, event.y() - 5])
+        current = self.graphicsView.transform().m11()
+        factor = ZOOM_STEP ** steps
+        factor = max(MIN_ZOOM / current, min(MAX_ZOOM / current, factor))
+        self.graphicsView.scale(factor, factor)
+        self.lod.update()
+    
+    def pan(
+        self, 
+        dx: int, 
+        dy: int
+    ) -> None:
+        """Moves the visible part of the scene
+
+        Args:
+            dx (int): Pixels on the x axis
+            dy (int): Pixels on the y axis
+        """
+        horizontal = self.graphicsView.horizontalScrollBar()
+        vertical = self.graphicsView.verticalScrollBar()
+        horizontal.setValue(horizontal.value() - dx)
+        vertical.setValue(vertical.value() - dy)
+    
+    def tune_index(self) -> None:
+        """Sets the depth of the BSP index of the scene for the current amount of items
+        
+        The scene is only re-indexed if the depth changes.
+        """
+        items = len(self.objects) + len(self.edges)
+        depth = max(5, min(16, math.ceil(math.log2(max(1, items / ITEMS_PER_LEAF)))))
+        
+        if depth != self.bsp_depth:
+            self.bsp_depth = depth
+            self.scene.setBspTreeDepth(depth)
+    
+    def nodes_at(
+        self, 
+        pos: Union[QPointF, core.Knoten]
+    ) -> list:
+        """Returns every node whose rectangle collides with the rectangle at the position
+        
+        Only the items the BSP index of the scene returns for that area are looked at.
+
+        Args:
+            pos (Union[QPointF, core.Knoten]): Top left corner of the rectangle in scene coordinates
+
+        Returns:
+            list: Nodes in the order of self.objects
+        """
+        size = 10 # width and height of a node like in utils.rectangle_collide
+        area = QRectF(pos.x() - size, pos.y() - size, 3 * size, 3 * size)
+        indices = set()
         
-        for other_point in self.objects:
-            if utils.rectangle_collide(point, other_point):
-                point.setX(other_point.x())
-                point.setY(other_point.y())
-                point._set_graphics_item()
+        for item in self.scene.items(area):
+            node_id = item.data(core.NODE_ID_KEY)
+            if node_id is None:
+                continue
+            
+            index = self.objects.index_of_id(node_id)
+            if index is not None and utils.rectangle_collide(pos, self.objects[index]):
+                indices.add(index)
+        return [self.objects[i] for i in sorted(indices)]
+    
+    def add_point(
+        self, 
+        pos: QPointF
+    ) -> None:
+        """Adds a node to the graphicsView and connects it with the previous one
+        
+        Clicking on an existing node connects it instead of stacking a new node on top of it.
+
+        Args:
+            pos (QPointF): Mouse cursor in scene coordinates
+        """
+        point = core.Knoten([pos.x() - 5, pos.y() - 5])
+        
+        nodes = self.nodes_at(point)
+        if nodes:
+            if self.last_node is not None:
+                self.add_edge(self.last_node, nodes[0].id)
+            self.last_node = nodes[0].id
+            self.redraw_objects()
+            return
         
         self.objects.append(point)
+        self.mark_changed()
+        self.record_edit("add", node = point)
+        
+        if self.last_node is not None:
+            self.add_edge(self.last_node, point.id)
+        self.last_node = point.id
         self.redraw_objects()
     
+    def add_edge(
+        self, 
+        u: int, 
+        v: int
+    ) -> bool:
+        """Connects two nodes, the line is drawn with the next redraw
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+
+        Returns:
+            bool: True if the edge is new
+        """
+        if self.objects.index_of_id(u) is None or self.objects.index_of_id(v) is None:
+            return False
+        if not self.edges.add(u, v):
+            return False
+        
+        self.mark_changed()
+        self.record_edit("link", edge = (u, v))
+        return True
+    
+    def remove_edge(
+        self, 
+        u: int, 
+        v: int
+    ) -> bool:
+        """Disconnects two nodes and removes their line from the scene
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+
+        Returns:
+            bool: True if there was an edge
+        """
+        if not self.edges.has(u, v):
+            return False
+        
+        line = self.edges.remove(u, v)
+        if line is not None and line.graphics_item.scene() == self.scene:
+            self.scene.removeItem(line.graphics_item)
+        
+        self.mark_changed()
+        self.record_edit("unlink", edge = (u, v))
+        return True
+    
+    def toggle_edge(
+        self, 
+        u: int, 
+        v: int
+    ) -> None:
+        """Connects two nodes or disconnects them if they are connected already
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+        """
+        if not self.remove_edge(u, v):
+            self.add_edge(u, v)
+            self.redraw_objects()
+    
+    def remove_nodes(
+        self, 
+        ids: list
+    ) -> None:
+        """Removes nodes together with their edges from the graph and the scene
+
+        Args:
+            ids (list): Ids of the nodes
+        """
+        indices = sorted((self.objects.index_of_id(node_id) for node_id in ids), reverse=True)
+        indices = [i for i in indices if i is not None]
+        
+        for i in indices:
+            node = self.objects[i]
+            for v in self.edges.neighbors(node.id):
+                self.content_hash.remove_edge(node.id, v)
+            self.record_edit("delete", node = node) # highest index first, so replaying the pops matches, before the edges are gone
+            for line in self.edges.remove_node(node.id):
+                if line.graphics_item.scene() == self.scene:
+                    self.scene.removeItem(line.graphics_item)
+            if node.graphics_item is not None and node.graphics_item.scene() == self.scene:
+                self.scene.removeItem(node.graphics_item)
+        
+        self.objects.remove(indices)
+        self._repoint_lines()
+        if self.last_node in ids:
+            self.last_node = None
+        self.mark_changed()
+    
+    def unload_nodes(
+        self,
+        ids: list
+    ) -> None:
+        """Removes nodes that were only loaded for the viewport, like the ones of an evicted tile
+        
+        This is no edit, nothing is journaled and the content hash is left alone, it is rebuilt
+        
+        once every tile is loaded. The version is still bumped, the indices of the other nodes shift.
+
+        Args:
+            ids (list): Ids of the nodes
+        """
+        indices = sorted((self.objects.index_of_id(node_id) for node_id in ids), reverse=True)
+        indices = [i for i in indices if i is not None]
+        
+        for i in indices:
+            self.lod.note_edit("delete", node = self.objects[i]) # the clusters still have to lose the nodes
+            for line in self.edges.remove_node(self.objects.ids[i]):
+                if line.graphics_item.scene() == self.scene:
+                    self.scene.removeItem(line.graphics_item)
+            item = self.objects.items[i]
+            if item is not None and item.scene() == self.scene:
+                self.scene.removeItem(item)
+        
+        self.objects.remove(indices)
+        self._repoint_lines()
+        if self.last_node in ids:
+            self.last_node = None
+        self.mark_changed()
+        if self.journal is not None:
+            self.journal.stale = True # the journal does not know the nodes are gone
+    
+    def _repoint_lines(self) -> None:
+        """Points the ends of every drawn line at the views of its nodes again
+        
+        The views are index based, once nodes in front of them were removed they would show other nodes.
+        """
+        objects = self.objects
+        for (u, v), line in self.edges.edges.items():
+            if line is not None:
+                line.pos1 = objects[objects.index_of_id(u)]
+                line.pos2 = objects[objects.index_of_id(v)]
+    
+    def mark_changed(self) -> None:
+        """Bumps the version of the graph
+        
+        Has to be called after nodes were added, moved, removed or flagged.
+        """
+        self.version += 1
+    
+    def clear_objects(self) -> None:
+        """Removes every node and edge from the graph and the scene
+        """
+        self.scene.clear()
+        self.objects.clear()
+        self.edges.clear()
+        self.last_node = None
+        self.mark_changed()
+        self.record_edit("clear")
+    
+    def record_edit(
+        self, 
+        op: str, 
+        node: core.Knoten = None, 
+        edge: tuple[int, int] = None
+    ) -> None:
+        """Updates the content hash, tells the edit listeners and writes an edit into the journal if one is attached
+
+        Args:
+            op (str): Operation, one of EditJournal.OPERATIONS
+            node (core.Knoten, optional): Node the operation was applied to. Defaults to None.
+            edge (tuple[int, int], optional): Ids of the nodes of the edge the operation was applied to. Defaults to None.
+        """
+        self.content_hash.apply(op, node, edge)
+        for listener in self.edit_listeners:
+            listener(op, node, edge)
+        if self.journal is not None:
+            self.journal.append(op, node, edge)
+    
+    def snapshot(self) -> GraphSnapshot:
+        """Returns an immutable snapshot of the current graph
+        
+        The snapshot is only taken again if the graph changed since the last one.
+
+        Returns:
+            GraphSnapshot: Snapshot stamped with the current version and content hash
+        """
+        if self._snapshot is None or self._snapshot.version != self.version:
+            self._snapshot = GraphSnapshot(self.objects, self.version, self.edge_indices(), self.component_labels(), self.content_hash.value)
+        return self._snapshot
+    
+    def edge_indices(self) -> tuple:
+        """Returns every edge as a pair of indices into self.objects
+
+        Returns:
+            tuple: ((i, j), ...)
+        """
+        return self._index_data()[2]
+    
+    def component_labels(self) -> tuple:
+        """Returns the component of every node, nodes share it if there is a path between them
+
+        Returns:
+            tuple: Component of each node in the order of self.objects
+        """
+        return self._index_data()[3]
+    
+    def _index_data(self) -> tuple:
+        """Returns the edge indices and component labels, they are only built again
+        
+        once nodes were added or removed or edges changed, moving nodes keeps them.
+
+        Returns:
+            tuple: (node layout, edge version, edge indices, component labels)
+        """
+        layout, version = self.objects.layout, self.edges.version
+        if self._indices is None or self._indices[:2] != (layout, version):
+            index_of_id = self.objects.index_of_id
+            component = self.edges.component
+            edges = tuple((index_of_id(u), index_of_id(v)) for u, v in self.edges)
+            labels = tuple(component(node_id) for node_id in self.objects.ids)
+            self._indices = (layout, version, edges, labels)
+        return self._indices
+    
+    def color_components(self) -> int:
+        """Colours every node and line with the colour of its component until the next refresh
+        
+        The largest component gets the first colour of palette.COMPONENT_COLORS.
+
+        Returns:
+            int: Amount of components
+        """
+        labels = self.component_labels()
+        sizes = {}
+        for label in labels:
+            sizes[label] = sizes.get(label, 0) + 1
+        rank = {label: i for i, label in enumerate(sorted(sizes, key=sizes.get, reverse=True))}
+        
+        for node, label in zip(self.objects, labels):
+            if node.graphics_item is not None:
+                node.graphics_item.setPen(palette.component_pen(rank[label]))
+        
+        for (u, v), line in self.edges.edges.items():
+            if line is not None:
+                line.graphics_item.setPen(palette.component_pen(rank[self.edges.component(u)]))
+        return len(sizes)
+    
+    def color_bands(
+        self, 
+        result: "RangeResult"
+    ) -> None:
+        """Colours the nodes of a range query by band until the next refresh
+        
+        The items are updated band by band with the repaints of the view held back.
+
+        Args:
+            result (RangeResult): Result of GraphSolver.range_query on the current version of the graph
+        """
+        items = self.objects.items
+        
+        with self.held_updates():
+            for band, indices in enumerate(result.by_band()):
+                pen, brush = palette.band_pen(band), palette.band_brush(band)
+                for i in indices:
+                    items[i].setPen(pen)
+                    items[i].setBrush(brush)
+    
+    def color_explored(
+        self, 
+        runs: list
+    ) -> None:
+        """Colours the nodes explored by each engine of a comparison until the next refresh
+        
+        The largest region is coloured first, so the smaller regions stay visible on top of it.
+
+        Args:
+            runs (list): EngineRun of each engine, returned by GraphSolver.compare_engines on the current version of the graph
+        """
+        items = self.objects.items
+        ranked = sorted(enumerate(runs), key=lambda entry: len(entry[1].explored), reverse=True)
+        
+        with self.held_updates():
+            for rank, run in ranked:
+                pen, brush = palette.engine_pen(rank), palette.engine_brush(rank)
+                for i in run.explored:
+                    items[i].setPen(pen)
+                    items[i].setBrush(brush)
+    
+    @contextmanager
+    def bulk_load(self):
+        """Loads nodes and edges from a file or tile without journaling them one by one
+        
+        The content hash is still updated, the journal is marked stale instead, so it is
+        
+        compacted into a snapshot that contains the loaded graph once afterwards.
+        """
+        journal, self.journal = self.journal, None
+        try:
+            yield
+        finally:
+            self.journal = journal
+            if journal is not None:
+                journal.stale = True
+    
+    @contextmanager
+    def held_updates(self):
+        """Holds back the repaints of the view while many items are changed
+        
+        The view is repainted once afterwards instead of once per item. Nested uses
+        
+        leave the repaints held back until the outermost one is done.
+        """
+        enabled = self.graphicsView.updatesEnabled()
+        self.graphicsView.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.graphicsView.setUpdatesEnabled(enabled)
+    
+    @property
+    def lines(self) -> list:
+        """Returns every drawn edge of the edge store
+
+        Returns:
+            list: List of edges
+        """
+        return self.edges.lines()
+    
     def add_item(
         self, 
         obj: Union[core.Knoten, core.Kante]
@@ -62,40 +531,63 @@ class QGraphicsViewManager:
         """
         for line in self.lines: self.scene.removeItem(line.graphics_item)
     
-    def get_lines(self) -> list:
-        """Returns a list of edges
+    def create_lines(self) -> None:
+        """Creates the lines of every edge that was added since the last redraw
+        
+        Lines keep the nodes as ends, so they follow the nodes when they are redrawn.
+        """
+        for u, v in list(self.edges.undrawn):
+            node1 = self.objects[self.objects.index_of_id(u)]
+            node2 = self.objects[self.objects.index_of_id(v)]
+            self.edges.set_line(u, v, core.Kante(node1, node2))
+    
+    def update_nodes(
+        self, 
+        indices: list
+    ) -> None:
+        """Moves the items of the given nodes and of their edges to the stored positions
+        
+        Only these items are touched, the rest of the scene is left as it is.
 
-        Returns:
-            list: List of edges
+        Args:
+            indices (list): Indices of the moved nodes
         """
-        lines = []
+        objects = self.objects
+        moved = set()
+        
+        for i in indices:
+            node = objects[i]
+            if node.graphics_item is not None:
+                node.graphics_item.setRect(node.x(), node.y(), node.width, node.height)
+            moved.add(node.id)
         
-        for i, obj in enumerate(self.objects):
-            if i > 0:
-                line = core.Kante(
-                    core.Knoten([obj.x(), obj.y()]),
-                    core.Knoten([self.objects[i - 1].x(), self.objects[i - 1].y()])
-                )
-                lines.append(line)
-        return lines
+        index_of_id = objects.index_of_id
+        for u in moved:
+            for v in self.edges.neighbors(u):
+                line = self.edges.line(u, v)
+                if line is None or (v in moved and v < u): # edges between two moved nodes are updated once
+                    continue
+                
+                i, j = index_of_id(u), index_of_id(v)
+                line.graphics_item.setLine(objects.xs[i], objects.ys[i], objects.xs[j], objects.ys[j])
+        
+        if self.lod.active:
+            self.lod.update()
     
     def get_clicked_object(
         self, 
-        event: QMouseEvent
+        pos: QPointF
     ) -> Union[bool, core.Knoten, core.Kante]:
         """Returns the object you clicked on
 
         Args:
-            event (QMouseEvent): Mouse cursor
+            pos (QPointF): Mouse cursor in scene coordinates
 
         Returns:
             Union[bool, core.Knoten, core.Kante]: False if no object found. Else either Knoten or Kante
         """
-        for obj in self.objects:
-            if utils.rectangle_collide((event.x(), event.y()), obj):
-                return obj
-        
-        return False
+        nodes = self.nodes_at(pos)
+        return nodes[0] if nodes else False
     
     def get_all_objects_on_pos(self, pos: core.Knoten) -> list:
         """Returns all objects on a position
@@ -106,12 +598,7 @@ class QGraphicsViewManager:
         Returns:
             list: List of objects
         """
-        objects = []
-        
-        for obj in self.objects:
-            if utils.rectangle_collide(pos, obj.pos):
-                objects.append(obj)
-        return objects
+        return self.nodes_at(pos)
     
     def find_object(
         self, 
@@ -144,14 +631,21 @@ class QGraphicsViewManager:
         self.redraw_objects()
     
     def refresh_objects(self) -> None:
-        """Refreshes the graphics_item of each object in self.objects
+        """Refreshes the graphics_item of each object in self.objects and self.lines
         """
         for obj in self.objects: obj._set_graphics_item()
+        for line in self.lines: line._set_graphics_item()
     
     def redraw_objects(self) -> None:
         """Redraws every object in lines and objects
+        
+        Only edges that are new since the last redraw get a new line.
         """
-        self.lines = self.get_lines()
+        self.create_lines()
+        self.tune_index()
+        
+        if self.lod.active:
+            self.lod.update()
         
         for line in self.lines:
             if not line.graphics_item.scene() == self.scene:
@@ -0,0 +1,303 @@
+import os
+import json
+import struct
+import hashlib
+from collections import OrderedDict
+
+MAX_ENTRIES = 4096 # results kept before the least recently used ones are dropped
+_MASK = (1 << 64) - 1
+
+def _digest(
+    kind: bytes,
+    payload: bytes
+) -> int:
+    """Returns a 64-bit hash of a node or edge that is equal in every session
+
+    Args:
+        kind (bytes): b'n' for a node, b'e' for an edge
+        payload (bytes): Packed values of the node or edge
+
+    Returns:
+        int: Hash
+    """
+    return int.from_bytes(hashlib.blake2b(kind + payload, digest_size=8).digest(), "little")
+
+class ContentHash:
+    def __init__(self) -> None:
+        """Hash of the positions and edges of the graph that is updated with every edit
+        
+        The hash is the sum of one term per node and edge modulo 2^64, so adding or removing
+        
+        one of them costs one term and the order they were added in does not matter.
+        
+        Flags are left out, they do not change the distance between two given nodes.
+        """
+        self.value = 0
+        self.terms = {} # node id -> term of the node, needed to take a moved node out again
+    
+    def set_node(
+        self,
+        node_id: int,
+        x: float,
+        y: float
+    ) -> None:
+        """Adds a node or replaces the term of a node that was moved
+
+        Args:
+            node_id (int): Id of the node
+            x (float): x position
+            y (float): y position
+        """
+        term = _digest(b'n', struct.pack('<qdd', node_id, x, y))
+        self.value = (self.value - self.terms.get(node_id, 0) + term) & _MASK
+        self.terms[node_id] = term
+    
+    def remove_node(
+        self,
+        node_id: int
+    ) -> None:
+        """Removes a node, its edges have to be removed separately
+
+        Args:
+            node_id (int): Id of the node
+        """
+        self.value = (self.value - self.terms.pop(node_id, 0)) & _MASK
+    
+    def add_edge(
+        self,
+        u: int,
+        v: int
+    ) -> None:
+        """Adds an edge
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+        """
+        self.value = (self.value + self._edge_term(u, v)) & _MASK
+    
+    def remove_edge(
+        self,
+        u: int,
+        v: int
+    ) -> None:
+        """Removes an edge
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+        """
+        self.value = (self.value - self._edge_term(u, v)) & _MASK
+    
+    def _edge_term(
+        self,
+        u: int,
+        v: int
+    ) -> int:
+        """Returns the term of an edge, equal for both directions
+
+        Args:
+            u (int): Id of the first node
+            v (int): Id of the second node
+
+        Returns:
+            int: Term
+        """
+        return _digest(b'e', struct.pack('<qq', min(u, v), max(u, v)))
+    
+    def apply(
+        self,
+        op: str,
+        node: "core.Knoten" = None,
+        edge: tuple[int, int] = None
+    ) -> None:
+        """Updates the hash with an edit as it is written into the journal
+
+        Args:
+            op (str): Operation, one of EditJournal.OPERATIONS
+            node (core.Knoten, optional): Node after the edit. Defaults to None.
+            edge (tuple[int, int], optional): Ids of the nodes of a linked or unlinked edge. Defaults to None.
+        """
+        if op in ("add", "move"):
+            self.set_node(node.id, node.x(), node.y())
+        elif op == "delete":
+            self.remove_node(node.id)
+        elif op == "link":
+            self.add_edge(*edge)
+        elif op == "unlink":
+            self.remove_edge(*edge)
+        elif op == "clear":
+            self.clear()
+    
+    def rebuild(
+        self,
+        objects: list,
+        edges: "EdgeStore"
+    ) -> None:
+        """Hashes the whole graph again, needed after it was changed without journaled edits
+
+        Args:
+            objects (list): List of nodes
+            edges (EdgeStore): Edges of the graph
+        """
+        self.clear()
+        for node in objects:
+            self.set_node(node.id, node.x(), node.y())
+        for u, v in edges:
+            self.add_edge(u, v)
+    
+    def clear(self) -> None:
+        """Resets the hash to the one of an empty graph
+        """
+        self.value = 0
+        self.terms.clear()
+    
+    def hexdigest(self) -> str:
+        """Returns the hash as 16 hex digits
+
+        Returns:
+            str: Hash
+        """
+        return f"{self.value:016x}"
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        path: str = None
+    ) -> None:
+        """Least recently used cache of the shortest paths between two nodes of a graph
+        
+        Results are keyed by the content hash of the graph, the ids of the source and
+        
+        the target and the engine, so they stay valid when the same file is opened again.
+
+        Args:
+            max_entries (int, optional): Results kept at most. Defaults to MAX_ENTRIES.
+            path (str, optional): File the cache is loaded from and saved to. Defaults to None, then it is kept in memory only.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        
+        self.entries = OrderedDict() # (hash, source id, target id, engine) -> (distance, ids of the path), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(
+        self,
+        content_hash: int,
+        source: int,
+        target: int,
+        engine: str = "dijkstra"
+    ) -> tuple[float, list]:
+        """Returns a cached result and marks it as recently used
+
+        Args:
+            content_hash (int): ContentHash of the graph
+            source (int): Id of the start node
+            target (int): Id of the end node
+            engine (str, optional): Engine, one of GraphSolver.ENGINES. Defaults to "dijkstra".
+
+        Returns:
+            tuple[float, list]: Distance and ids of the nodes of the path, None on a miss
+        """
+        key = (content_hash, source, target, engine)
+        result = self.entries.get(key)
+        
+        if result is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+    
+    def put(
+        self,
+        content_hash: int,
+        source: int,
+        target: int,
+        distance: float,
+        path: list,
+        engine: str = "dijkstra"
+    ) -> None:
+        """Stores a result, the least recently used ones are dropped once the cache is full
+
+        Args:
+            content_hash (int): ContentHash of the graph
+            source (int): Id of the start node
+            target (int): Id of the end node
+            distance (float): Distance of the path
+            path (list): Ids of the nodes of the path
+            engine (str, optional): Engine, one of GraphSolver.ENGINES. Defaults to "dijkstra".
+        """
+        key = (content_hash, source, target, engine)
+        self.entries[key] = (distance, list(path))
+        self.entries.move_to_end(key)
+        
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drops every result, the statistics are kept
+        """
+        self.entries.clear()
+    
+    def hit_rate(self) -> float:
+        """Returns the share of lookups that were hits
+
+        Returns:
+            float: Hit rate between 0 and 1, 0 before the first lookup
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def summary(self) -> str:
+        """Returns the statistics in one line
+
+        Returns:
+            str: Statistics
+        """
+        return (
+            f"{len(self.entries)}/{self.max_entries} results, {self.hits} hits, {self.misses} misses "
+            f"({self.hit_rate() * 100:.1f}%), {self.evictions} evicted"
+        )
+    
+    def load(self) -> int:
+        """Loads the results saved by an earlier session, a missing or broken file is ignored
+
+        Returns:
+            int: Amount of loaded results
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return 0
+        
+        try:
+            with open(f"{self.path}", "r") as j:
+                data = json.load(j)
+            for content_hash, source, target, engine, distance, path in data['entries']:
+                self.put(int(content_hash, 16), source, target, distance, path, engine)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.clear()
+            return 0
+        return len(self.entries)
+    
+    def save(self) -> None:
+        """Writes the results into the file of the cache, least recently used first
+        
+        The file is replaced at once, so a crash while saving keeps the previous one.
+        """
+        if self.path is None:
+            return
+        
+        entries = [
+            [f"{content_hash:016x}", source, target, engine, distance, path]
+            for (content_hash, source, target, engine), (distance, path) in self.entries.items()
+        ]
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as j:
+            json.dump({'entries': entries}, j)
+        os.replace(temporary, self.path)
\ No newline at end of file
@@ -0,0 +1,86 @@
+from PyQt5.QtCore import(
+    QObject,
+    QRunnable,
+    pyqtSignal
+)
+import modules.GraphSolver as gs
+
+class SolveSignals(QObject):
+    progress = pyqtSignal(int, int) # request id, settled nodes
+    finished = pyqtSignal(int, object) # request id, (path, distance, stats), RangeResult or list of EngineRun
+    cancelled = pyqtSignal(int) # request id
+    failed = pyqtSignal(int, str) # request id, error message
+
+
+class SolveWorker(QRunnable):
+    def __init__(
+        self, 
+        request_id: int, 
+        graph_solver: gs.GraphSolver,
+        version: int = None
+    ) -> None:
+        """Runs a GraphSolver inside a QThreadPool
+        
+        The solver has to work on a GraphSnapshot, the results are
+
+        delivered through the signals in the GUI thread.
+
+        Args:
+            request_id (int): Id of the request, used to ignore results of stale requests
+            graph_solver (gs.GraphSolver): GraphSolver that has not been solved yet
+            version (int, optional): Version of the graph the snapshot was taken of. Defaults to None.
+        """
+        super().__init__()
+        self.request_id = request_id
+        self.graph_solver = graph_solver
+        self.version = version
+        self.signals = SolveSignals()
+        self.setAutoDelete(False)
+        
+        self.graph_solver.progress_callback = self._report_progress
+    
+    def cancel(self) -> None:
+        """Cancels the worker. The GraphSolver stops at its next check
+        """
+        self.graph_solver.cancel()
+    
+    def _report_progress(
+        self, 
+        settled: int
+    ) -> None:
+        """Emits the amount of settled nodes
+
+        Args:
+            settled (int): Settled nodes
+        """
+        self.signals.progress.emit(self.request_id, settled)
+    
+    def run(self) -> None:
+        """Builds the neighbors and solves the graph, alternative routes are searched
+        
+        afterwards if the solver asks for more than one. Solvers with thresholds run
+        
+        a range query instead, its RangeResult is delivered through finished. Solvers with
+        
+        engines compare them instead and deliver the list of EngineRun.
+        """
+        try:
+            if self.graph_solver.engines:
+                self.graph_solver.set_neighbors()
+                result = self.graph_solver.compare_engines(self.graph_solver.engines)
+            elif self.graph_solver.thresholds:
+                self.graph_solver.set_neighbors()
+                result = self.graph_solver.range_query(self.graph_solver.thresholds)
+            else:
+                if self.graph_solver.reachable_targets(): # unreachable queries need no neighbors
+                    self.graph_solver.set_neighbors()
+                result = self.graph_solver.solve_graph()
+                
+                if self.graph_solver.routes > 1:
+                    self.graph_solver.find_alternatives()
+        except gs.SolveCancelled:
+            self.signals.cancelled.emit(self.request_id)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+        else:
+            self.signals.finished.emit(self.request_id, result)
\ No newline at end of file
@@ -0,0 +1,347 @@
+from PyQt5.QtCore import QRectF
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Callable
+import json
+import math
+
+MAGIC = b"ENS-TILES 1\n" # first line of a tiled .ens file
+TILE_SIZE = 2000 # width and height of a tile in scene units
+MEMORY_BUDGET = 64 * 1024 * 1024 # bytes of resident tiles, measured by their size on disk
+
+def is_tiled(filename: str) -> bool:
+    """Returns whether or not a .ens file uses the tiled layout
+
+    Args:
+        filename (str): Filename
+
+    Returns:
+        bool: True if the file starts with MAGIC
+    """
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def tile_of(
+    x: float,
+    y: float,
+    tile_size: float
+) -> tuple[int, int]:
+    """Returns the tile a position lies in
+
+    Args:
+        x (float): x position
+        y (float): y position
+        tile_size (float): Width and height of a tile
+
+    Returns:
+        tuple[int, int]: Column and row of the tile
+    """
+    return (math.floor(x / tile_size), math.floor(y / tile_size))
+
+def write_tiles(
+    filename: str,
+    data: dict,
+    tile_size: float = TILE_SIZE
+) -> None:
+    """Writes a .ens dictionary in the tiled layout
+
+    The file starts with MAGIC and a header line holding the tile index, followed by
+
+    one .ens dictionary per tile. Edges between two tiles are stored in both of them,
+
+    so either tile can connect them once the other one is loaded.
+
+    Args:
+        filename (str): Filename
+        data (dict): .ens content like FileManager.snapshot_to_dict returns it
+        tile_size (float, optional): Width and height of a tile. Defaults to TILE_SIZE.
+    """
+    tiles = {}
+    tile_of_id = {}
+    
+    for node in data['points'].values():
+        key = tile_of(node['x'], node['y'], tile_size)
+        tile = tiles.setdefault(key, {'points': {}, 'edges': []})
+        tile['points'][len(tile['points'])] = node
+        tile_of_id[node['id']] = key
+    
+    for u, v in data['edges']:
+        tiles[tile_of_id[u]]['edges'].append([u, v])
+        if tile_of_id[v] != tile_of_id[u]:
+            tiles[tile_of_id[v]]['edges'].append([u, v])
+    
+    payloads = []
+    index = {}
+    offset = 0
+    
+    for (tx, ty), tile in tiles.items():
+        payload = json.dumps(tile, separators=(",", ":")).encode()
+        index[f"{tx},{ty}"] = [offset, len(payload), len(tile['points'])]
+        payloads.append(payload)
+        offset += len(payload)
+    
+    header = {
+        'tile_size': tile_size,
+        'nodes': len(data['points']),
+        'edges': len(data['edges']),
+        'tiles': index
+    }
+    
+    with open(filename, "wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(header).encode() + b"\n")
+        for payload in payloads:
+            f.write(payload)
+
+class TileReader:
+    def __init__(
+        self,
+        filename: str
+    ) -> None:
+        """Reads the header of a tiled .ens file and single tiles on demand
+
+        Every read opens the file on its own, so tiles can be read from other threads.
+
+        Args:
+            filename (str): Filename
+        """
+        self.filename = filename
+        
+        with open(filename, "rb") as f:
+            if f.readline() != MAGIC:
+                raise ValueError(f"{filename} is not a tiled .ens file")
+            header = json.loads(f.readline())
+            self.data_offset = f.tell()
+        
+        self.tile_size = header['tile_size']
+        self.nodes = header['nodes']
+        self.edges = header['edges']
+        self.index = {tuple(map(int, key.split(","))): tuple(entry) for key, entry in header['tiles'].items()} # (tx, ty) -> (offset, length, nodes)
+    
+    def tiles_in(
+        self,
+        rect: QRectF,
+        margin: int = 0
+    ) -> set[tuple[int, int]]:
+        """Returns every stored tile that intersects the rectangle
+
+        Args:
+            rect (QRectF): Area in scene coordinates
+            margin (int, optional): Extra tiles added around the area. Defaults to 0.
+
+        Returns:
+            set[tuple[int, int]]: Keys of the tiles
+        """
+        tx1, ty1 = tile_of(rect.left(), rect.top(), self.tile_size)
+        tx2, ty2 = tile_of(rect.right(), rect.bottom(), self.tile_size)
+        tx1, ty1, tx2, ty2 = tx1 - margin, ty1 - margin, tx2 + margin, ty2 + margin
+        
+        if (tx2 - tx1 + 1) * (ty2 - ty1 + 1) > len(self.index): # zoomed out far, looking at the index is cheaper
+            return {key for key in self.index if tx1 <= key[0] <= tx2 and ty1 <= key[1] <= ty2}
+        return {(tx, ty) for tx in range(tx1, tx2 + 1) for ty in range(ty1, ty2 + 1) if (tx, ty) in self.index}
+    
+    def size(
+        self,
+        key: tuple[int, int]
+    ) -> int:
+        """Returns the size of a tile on disk
+
+        Args:
+            key (tuple[int, int]): Key of the tile
+
+        Returns:
+            int: Bytes
+        """
+        return self.index[key][1]
+    
+    def read_tile(
+        self,
+        key: tuple[int, int]
+    ) -> dict:
+        """Reads a single tile
+
+        Args:
+            key (tuple[int, int]): Key of the tile
+
+        Returns:
+            dict: .ens content of the tile
+        """
+        offset, length, nodes = self.index[key]
+        
+        with open(self.filename, "rb") as f:
+            f.seek(self.data_offset + offset)
+            return json.loads(f.read(length))
+
+class TileCache:
+    def __init__(
+        self,
+        reader: TileReader,
+        load: Callable,
+        unload: Callable,
+        budget: int = MEMORY_BUDGET
+    ) -> None:
+        """Keeps the tiles around the viewport resident and evicts the least recently used ones
+
+        Tiles that intersect the viewport are loaded right away, their neighbours are read
+
+        and parsed in the background so panning finds them ready. Tiles are evicted once
+        
+        the resident ones exceed the budget, visible tiles and tiles with edited nodes are never evicted.
+
+        Args:
+            reader (TileReader): Reader of the tiled file
+            load (Callable): Adds the nodes and edges of a tile dictionary to the graph
+            unload (Callable): Removes the nodes with the given ids from the graph without treating it as an edit
+            budget (int, optional): Bytes of resident tiles, measured by their size on disk. Defaults to MEMORY_BUDGET.
+        """
+        self.reader = reader
+        self.load = load
+        self.unload = unload
+        self.budget = budget
+        
+        self.resident = OrderedDict() # key -> ids of the nodes of the tile, least recently used first
+        self.resident_bytes = 0
+        self.pending = {} # key -> Future of a tile read in the background
+        self.pinned = set() # keys of the tiles with edited nodes, evicting them would throw the edits away
+        self.tile_of_id = {} # node id -> key of the resident tile it was loaded from
+        self.held = False # load_all keeps every tile resident until the save or solve is done
+        self._loading = False # the nodes added while a tile is loaded are no edits
+        
+        self._executor = ThreadPoolExecutor(max_workers=1)
+    
+    def update(
+        self,
+        rect: QRectF
+    ) -> bool:
+        """Loads the tiles of the viewport, prefetches their neighbours and evicts old tiles
+
+        Args:
+            rect (QRectF): Viewport in scene coordinates
+
+        Returns:
+            bool: True if tiles were loaded or evicted
+        """
+        visible = self.reader.tiles_in(rect)
+        loaded = False
+        
+        for key in visible:
+            if key in self.resident:
+                self.resident.move_to_end(key)
+            else:
+                self._load(key)
+                loaded = True
+        
+        neighbours = self.reader.tiles_in(rect, margin=1) - visible
+        for key in list(self.pending):
+            if key not in neighbours:
+                self.pending.pop(key).cancel()
+        for key in neighbours:
+            if key not in self.resident and key not in self.pending:
+                self.pending[key] = self._executor.submit(self.reader.read_tile, key)
+        
+        return self._evict(visible) or loaded
+    
+    def load_all(self) -> bool:
+        """Loads every tile and holds them until release, used before the whole graph is saved or solved
+
+        Returns:
+            bool: True if tiles were loaded
+        """
+        missing = [key for key in self.reader.index if key not in self.resident]
+        for key in missing:
+            self._load(key)
+        self.held = True
+        return bool(missing)
+    
+    def release(self) -> None:
+        """Lets the tiles held by load_all be evicted again, the next update shrinks the cache back to the budget
+        """
+        self.held = False
+    
+    def note_edit(
+        self,
+        op: str,
+        node: "core.Knoten" = None,
+        edge: tuple[int, int] = None
+    ) -> None:
+        """Pins the tiles of the nodes of an edit, so the edit is not thrown away by an eviction
+
+        Args:
+            op (str): Operation, one of EditJournal.OPERATIONS
+            node (core.Knoten, optional): Node the operation was applied to. Defaults to None.
+            edge (tuple[int, int], optional): Ids of the nodes of the edge the operation was applied to. Defaults to None.
+        """
+        if self._loading:
+            return
+        if op == "clear": # the nodes of the resident tiles are gone, there is nothing left to keep or evict
+            self.resident.clear()
+            self.resident_bytes = 0
+            self.pinned.clear()
+            self.tile_of_id.clear()
+            return
+        
+        for node_id in (edge if node is None else (node.id,)):
+            key = self.tile_of_id.get(node_id)
+            if key is not None:
+                self.pinned.add(key)
+    
+    def _load(
+        self,
+        key: tuple[int, int]
+    ) -> None:
+        """Adds a tile to the graph, a tile read in the background is used if there is one
+
+        Args:
+            key (tuple[int, int]): Key of the tile
+        """
+        future = self.pending.pop(key, None)
+        tile = future.result() if future is not None else self.reader.read_tile(key)
+        
+        self._loading = True
+        try:
+            self.load(tile)
+        finally:
+            self._loading = False
+        
+        self.resident[key] = [node['id'] for node in tile['points'].values()]
+        for node_id in self.resident[key]:
+            self.tile_of_id[node_id] = key
+        self.resident_bytes += self.reader.size(key)
+    
+    def _evict(
+        self,
+        visible: set
+    ) -> bool:
+        """Evicts the least recently used tiles until the resident ones fit into the budget
+
+        Args:
+            visible (set): Keys of the tiles in the viewport
+
+        Returns:
+            bool: True if a tile was evicted
+        """
+        if self.held:
+            return False
+        
+        evicted = []
+        for key in self.resident:
+            if self.resident_bytes <= self.budget:
+                break
+            if key not in visible and key not in self.pinned:
+                evicted.append(key)
+                self.resident_bytes -= self.reader.size(key)
+        
+        ids = [node_id for key in evicted for node_id in self.resident.pop(key)]
+        for node_id in ids:
+            self.tile_of_id.pop(node_id, None)
+        if ids:
+            self.unload(ids)
+        return bool(evicted)
+    
+    def close(self) -> None:
+        """Stops reading tiles in the background
+        """
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self._executor.shutdown(wait=False)
\ No newline at end of file
@@ -0,0 +1,193 @@
+from PyQt5.QtCore import(
+    QObject,
+    QTimer,
+    pyqtSignal
+)
+import modules.palette as palette
+from modules.QGraphicsViewManager import QGraphicsViewManager
+
+class TracePlayer(QObject):
+    step_changed = pyqtSignal(int)
+    FRAME_RATE = 30
+    
+    def __init__(
+        self,
+        QGVM: QGraphicsViewManager
+    ) -> None:
+        """Replays an ExplorationTrace by recolouring the existing items of the scene
+
+        Args:
+            QGVM (QGraphicsViewManager): QGraphicsViewManager whose items are recoloured
+        """
+        super().__init__()
+        self.qgvm = QGVM
+        
+        self.trace = None
+        self.version = None
+        self.position = 0 # amount of steps that are currently shown
+        self.speed = 1 # steps per frame
+        
+        self.timer = QTimer()
+        self.timer.setInterval(1000 // self.FRAME_RATE)
+        self.timer.timeout.connect(self._next_frame)
+    
+    def load(
+        self,
+        trace: "ExplorationTrace",
+        version: int
+    ) -> None:
+        """Loads a trace that was recorded on the given version of the graph
+
+        Args:
+            trace (ExplorationTrace): Recorded trace
+            version (int): Version of the QGraphicsViewManager the trace belongs to
+        """
+        self.unload()
+        self.trace = trace
+        self.version = version
+    
+    def unload(self) -> None:
+        """Stops the playback and restores the colour of every recoloured item
+        """
+        self.pause()
+        
+        if self.trace is not None and self._is_valid():
+            self._revert(0, self.position)
+        
+        self.trace = None
+        self.position = 0
+        self.step_changed.emit(0)
+    
+    def set_speed(
+        self,
+        speed: int
+    ) -> None:
+        """Changes how many steps are shown per frame
+
+        Args:
+            speed (int): Steps per frame
+        """
+        self.speed = max(1, speed)
+    
+    def is_playing(self) -> bool:
+        """Returns whether or not the trace is being played
+
+        Returns:
+            bool: True while playing
+        """
+        return self.timer.isActive()
+    
+    def play(self) -> None:
+        """Starts the playback, from the start if the end was reached
+        """
+        if self.trace is None or not self._is_valid():
+            return
+        
+        if self.position >= len(self.trace):
+            self.seek(0)
+        self.timer.start()
+    
+    def pause(self) -> None:
+        """Pauses the playback
+        """
+        self.timer.stop()
+    
+    def seek(
+        self,
+        step: int
+    ) -> None:
+        """Jumps to the given step, only the items in between are recoloured
+
+        Args:
+            step (int): Step
+        """
+        if self.trace is None or not self._is_valid():
+            self.pause()
+            return
+        
+        step = max(0, min(step, len(self.trace)))
+        
+        if step > self.position:
+            self._apply(self.position, step)
+        elif step < self.position:
+            self._revert(step, self.position)
+        
+        self.position = step
+        self.step_changed.emit(step)
+    
+    def _next_frame(self) -> None:
+        """Shows the next batch of steps
+        """
+        if self.trace is None or self.position + self.speed >= len(self.trace):
+            self.pause()
+        self.seek(self.position + self.speed)
+    
+    def _is_valid(self) -> bool:
+        """Returns whether or not the trace still matches the graph
+
+        Returns:
+            bool: False if the graph was edited since the trace was recorded
+        """
+        return self.version == self.qgvm.version
+    
+    def _line_item(
+        self,
+        u: int,
+        v: int
+    ):
+        """Returns the edge of the scene between two nodes of the trace
+
+        Args:
+            u (int): Index of the first node
+            v (int): Index of the second node
+
+        Returns:
+            core.Kante: Edge or None if there is none in the scene
+        """
+        points = self.trace.points
+        return self.qgvm.edges.line(points[u].id, points[v].id)
+    
+    def _apply(
+        self,
+        start: int,
+        end: int
+    ) -> None:
+        """Colours the items of the steps start until end
+
+        Args:
+            start (int): First step
+            end (int): Step after the last step
+        """
+        trace = self.trace
+        objects = self.qgvm.objects
+        
+        for step in range(start, end):
+            objects[trace.settled[step]].graphics_item.setPen(palette.pen(palette.EXPLORED))
+            
+            for i in trace.relaxations(step):
+                line = self._line_item(trace.relaxed_from[i], trace.relaxed_to[i])
+                if line is not None:
+                    line.graphics_item.setPen(palette.pen(palette.RELAXED))
+    
+    def _revert(
+        self,
+        start: int,
+        end: int
+    ) -> None:
+        """Restores the colour of the items of the steps start until end
+
+        Args:
+            start (int): First step
+            end (int): Step after the last step
+        """
+        trace = self.trace
+        objects = self.qgvm.objects
+        
+        for step in range(start, end):
+            node = objects[trace.settled[step]]
+            node.graphics_item.setPen(palette.pen(node.state))
+            
+            for i in trace.relaxations(step):
+                line = self._line_item(trace.relaxed_from[i], trace.relaxed_to[i])
+                if line is not None:
+                    line.graphics_item.setPen(palette.pen(line.state))
\ No newline at end of file
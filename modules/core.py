@@ -2,12 +2,36 @@ from PyQt5.QtGui import(
     QColor,
 )
 from PyQt5.QtCore import QRectF
+import modules.palette as palette
 from PyQt5.QtWidgets import(
     QGraphicsLineItem,
     QGraphicsEllipseItem
 )
 from typing import Union
 
+NODE_ID_KEY = 0 # key of the item data that holds the id of the node
+
+_last_id = 0
+
+def new_id() -> int:
+    """Returns an id no other node of this session has
+
+    Returns:
+        int: Id
+    """
+    global _last_id
+    _last_id += 1
+    return _last_id
+
+def reserve_id(node_id: int) -> None:
+    """Makes sure new_id never returns an id that was loaded from a file
+
+    Args:
+        node_id (int): Id in use
+    """
+    global _last_id
+    _last_id = max(_last_id, node_id)
+
 class Knoten:
     def __init__(
         self, 
@@ -18,10 +42,10 @@ class Knoten:
         Args:
             pos (list): list of x and y position
         """
-        self.id = id(self) % 1000
+        self.id = new_id() # edges refer to nodes by id
         
         self.graphics_item = None
-        self.color = QColor(0, 0, 0, 255)
+        self.state = palette.NORMAL
         
         self.pos = pos
         
@@ -54,20 +78,31 @@ class Knoten:
         """
         self.pos[1] = y
     
-    def setColor(
+    @property
+    def color(self) -> QColor:
+        """Returns the color of the state of the node
+
+        Returns:
+            QColor: Shared color, must not be changed
+        """
+        return palette.color(self.state)
+    
+    def setState(
         self,
-        color: QColor
+        state: int
     ) -> None:
-        """Changes the color of the node
+        """Changes the state of the node, the pen is only set if it changed
 
         Args:
-            color (QColor): new color
+            state (int): new state like palette.SELECTED
         """
-        try:
-            self.color = color
-            self.graphics_item.setPen(self.color)
-        except:
-            raise BaseException(f"Error setting color {color} for {self}")
+        if state == self.state:
+            return
+        
+        self.state = state
+        if self.graphics_item is not None:
+            self.graphics_item.setPen(palette.pen(state))
+            self.graphics_item.setBrush(palette.brush(state))
     
     def x(self) -> Union[int, float]:
         """Returns the x position of the node
@@ -89,7 +124,8 @@ class Knoten:
         """Creates a QGraphicsItem for the node
         """
         self.graphics_item = QGraphicsEllipseItem(self.x(), self.y(), self.width, self.height)
-        self.graphics_item.setPen(self.color)
+        self.graphics_item.setPen(palette.pen(self.state))
+        self.graphics_item.setBrush(palette.brush(self.state))
     
     def _toggle_visited(self) -> None:
         """Toggles whether or not the node was visited
@@ -110,21 +146,21 @@ class Kante:
         self, 
         pos1: Knoten, 
         pos2: Knoten, 
-        color: QColor = QColor(0, 0, 0, 255)
+        state: int = palette.NORMAL
     ) -> None:
         """Creates an Kante / edge
 
         Args:
             pos1 (Knoten): Node on the graph
             pos2 (Knoten): Second node on the graph
-            color (QColor, optional): Color of the edge. Defaults to QColor(0, 0, 0, 255) (Black).
+            state (int, optional): State of the edge. Defaults to palette.NORMAL (Black).
         """
         self.id = id(self) % 1000
         
         self.pos1 = pos1
         self.pos2 = pos2
         
-        self.color = color
+        self.state = state
         self.graphics_item = None
         
         self._set_graphics_item()
@@ -133,7 +169,7 @@ class Kante:
         """Creates a QGraphicsItem for the edge
         """
         self.graphics_item = QGraphicsLineItem(self.pos1.x(), self.pos1.y(), self.pos2.x(), self.pos2.y())
-        self.graphics_item.setPen(self.color)
+        self.graphics_item.setPen(palette.pen(self.state))
     
     def __repr__(self) -> str:
         """A string for identifying the edge
@@ -0,0 +1,223 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import(
+    QColor,
+    QPen,
+    QBrush
+)
+
+NORMAL = 0
+SELECTED = 1
+START = 2
+END = 3
+PATH = 4
+EXPLORED = 5
+RELAXED = 6
+ROUTE_2 = 7
+ROUTE_3 = 8
+ROUTE_4 = 9
+ROUTE_5 = 10
+CLUSTER = 11
+
+ROUTES = (PATH, ROUTE_2, ROUTE_3, ROUTE_4, ROUTE_5) # colors of the alternative routes, best first
+
+COLORS = {
+    NORMAL: (0, 0, 0, 255),
+    SELECTED: (255, 0, 0, 255),
+    START: (0, 255, 0, 255),
+    END: (255, 0, 0, 255),
+    PATH: (255, 0, 128, 255),
+    EXPLORED: (0, 128, 255, 255),
+    RELAXED: (0, 255, 255, 255),
+    ROUTE_2: (255, 128, 0, 255),
+    ROUTE_3: (128, 0, 255, 255),
+    ROUTE_4: (0, 160, 0, 255),
+    ROUTE_5: (160, 82, 45, 255),
+    CLUSTER: (96, 96, 96, 255)
+}
+
+COMPONENT_COLORS = ( # cycled through when the components of the graph are coloured
+    (31, 119, 180, 255),
+    (255, 127, 14, 255),
+    (44, 160, 44, 255),
+    (214, 39, 40, 255),
+    (148, 103, 189, 255),
+    (140, 86, 75, 255),
+    (227, 119, 194, 255),
+    (188, 189, 34, 255)
+)
+
+BAND_COLORS = ( # nearest band first, the last colour is repeated for further bands
+    (0, 170, 0, 255),
+    (160, 200, 0, 255),
+    (255, 170, 0, 255),
+    (255, 80, 0, 255),
+    (200, 0, 80, 255)
+)
+
+ENGINE_COLORS = ( # one per engine of an engine comparison, in the order the engines ran
+    (0, 120, 255, 255),
+    (230, 0, 160, 255),
+    (0, 190, 140, 255),
+    (255, 150, 0, 255)
+)
+
+_colors = {}
+_pens = {}
+_brushes = {}
+_bundle_pens = {}
+_component_pens = {}
+_band_pens = {}
+_band_brushes = {}
+_engine_pens = {}
+_engine_brushes = {}
+_rubber_band_pen = None
+
+def color(state: int) -> QColor:
+    """Returns the shared QColor of a state
+
+    Args:
+        state (int): State like NORMAL or SELECTED
+
+    Returns:
+        QColor: Color, must not be changed
+    """
+    if state not in _colors:
+        _colors[state] = QColor(*COLORS[state])
+    return _colors[state]
+
+def pen(state: int) -> QPen:
+    """Returns the shared QPen of a state
+
+    Args:
+        state (int): State like NORMAL or SELECTED
+
+    Returns:
+        QPen: Pen, must not be changed
+    """
+    if state not in _pens:
+        _pens[state] = QPen(color(state))
+    return _pens[state]
+
+def brush(state: int) -> QBrush:
+    """Returns the shared QBrush of a state, only selected nodes and clusters are filled
+
+    Args:
+        state (int): State like NORMAL or SELECTED
+
+    Returns:
+        QBrush: Brush, must not be changed
+    """
+    if state not in _brushes:
+        _brushes[state] = QBrush(color(state)) if state in (SELECTED, CLUSTER) else QBrush(Qt.NoBrush)
+    return _brushes[state]
+
+def bundle_pen(width: int) -> QPen:
+    """Returns the shared cosmetic QPen of bundled edges between clusters
+
+    Args:
+        width (int): Width in pixels, independent of the zoom
+
+    Returns:
+        QPen: Pen, must not be changed
+    """
+    if width not in _bundle_pens:
+        _bundle_pens[width] = QPen(color(CLUSTER), width)
+        _bundle_pens[width].setCosmetic(True)
+    return _bundle_pens[width]
+
+def component_pen(rank: int) -> QPen:
+    """Returns the shared QPen of a component
+
+    Args:
+        rank (int): Rank of the component, the colours repeat after COMPONENT_COLORS
+
+    Returns:
+        QPen: Pen, must not be changed
+    """
+    rank %= len(COMPONENT_COLORS)
+    if rank not in _component_pens:
+        _component_pens[rank] = QPen(QColor(*COMPONENT_COLORS[rank]), 2)
+    return _component_pens[rank]
+
+def band_pen(band: int) -> QPen:
+    """Returns the shared QPen of a band of a range query
+
+    Args:
+        band (int): Band, 0 is the nearest one
+
+    Returns:
+        QPen: Pen, must not be changed
+    """
+    band = min(band, len(BAND_COLORS) - 1)
+    if band not in _band_pens:
+        _band_pens[band] = QPen(QColor(*BAND_COLORS[band]), 2)
+    return _band_pens[band]
+
+def band_brush(band: int) -> QBrush:
+    """Returns the shared QBrush of a band of a range query, nodes in range are filled
+
+    Args:
+        band (int): Band, 0 is the nearest one
+
+    Returns:
+        QBrush: Brush, must not be changed
+    """
+    band = min(band, len(BAND_COLORS) - 1)
+    if band not in _band_brushes:
+        _band_brushes[band] = QBrush(QColor(*BAND_COLORS[band]))
+    return _band_brushes[band]
+
+def engine_pen(rank: int) -> QPen:
+    """Returns the shared QPen of an engine of an engine comparison
+
+    Args:
+        rank (int): Position of the engine in the comparison, the colours repeat after ENGINE_COLORS
+
+    Returns:
+        QPen: Pen, must not be changed
+    """
+    rank %= len(ENGINE_COLORS)
+    if rank not in _engine_pens:
+        _engine_pens[rank] = QPen(QColor(*ENGINE_COLORS[rank]), 2)
+    return _engine_pens[rank]
+
+def engine_brush(rank: int) -> QBrush:
+    """Returns the shared QBrush of an engine of an engine comparison, explored nodes are filled
+
+    Args:
+        rank (int): Position of the engine in the comparison, the colours repeat after ENGINE_COLORS
+
+    Returns:
+        QBrush: Brush, must not be changed
+    """
+    rank %= len(ENGINE_COLORS)
+    if rank not in _engine_brushes:
+        _engine_brushes[rank] = QBrush(QColor(*ENGINE_COLORS[rank]))
+    return _engine_brushes[rank]
+
+def rubber_band_pen() -> QPen:
+    """Returns the shared dashed QPen of the area selection
+
+    Returns:
+        QPen: Pen, must not be changed
+    """
+    global _rubber_band_pen
+    if _rubber_band_pen is None:
+        _rubber_band_pen = QPen(color(SELECTED), 1, Qt.DashLine)
+        _rubber_band_pen.setCosmetic(True)
+    return _rubber_band_pen
+
+def node_state(node) -> int:
+    """Returns the state a node has when it is not highlighted
+
+    Args:
+        node (core.Knoten): Node
+
+    Returns:
+        int: START, END or NORMAL
+    """
+    if node.is_start:
+        return START
+    if node.is_end:
+        return END
+    return NORMAL
\ No newline at end of file
@@ -2,6 +2,8 @@ from modules.core import(
     Knoten
 )
 from typing import Union
+import importlib.util
+import sys
 
 def rectangle_collide(pos1: Union[Knoten, tuple], pos2: Union[Knoten, tuple]) -> bool:
     RECTANGLE_WIDTH = 10
@@ -20,4 +22,30 @@ def rectangle_collide(pos1: Union[Knoten, tuple], pos2: Union[Knoten, tuple]) ->
     if x1 < x2 + RECTANGLE_WIDTH and x1 + RECTANGLE_WIDTH > x2 and y1 < y2 + RECTANGLE_HEIGHT and y1 + RECTANGLE_HEIGHT > y2:
         return True
     
-    return False
\ No newline at end of file
+    return False
+
+def lazy_import(name: str):
+    """Returns a module that is only executed once one of its attributes is used
+    
+    Modules that are not needed to show the window are imported like this, so the
+    
+    editor starts without paying for them.
+
+    Args:
+        name (str): Full name of the module like "modules.GraphSolver"
+
+    Returns:
+        module: Module, the already imported one if there is one or None if it is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
\ No newline at end of file
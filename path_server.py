@@ -0,0 +1,36 @@
+import sys
+import asyncio
+import argparse
+from typing import Union
+import modules.PathServer as ps
+import modules.NodeOrder as node_order
+
+async def serve(args: argparse.Namespace) -> None:
+    index = ps.GraphIndex.load(args.filename, args.order)
+    server = ps.PathServer(index, args.workers)
+    await server.start(args.host, args.port, args.socket)
+    
+    print(f"Serving {len(index.points)} nodes and {len(index.edges)} edges of {args.filename} on {server.address()}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+def main(argv: Union[list, None] = None) -> int:
+    parser = argparse.ArgumentParser(description = "Answers shortest path queries on a .ens file over newline-delimited JSON")
+    parser.add_argument("filename", help = "plain or tiled .ens file")
+    parser.add_argument("--socket", default = None, help = "path of a Unix socket, a local TCP port is used otherwise")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--workers", type = int, default = None, help = "threads the searches run in")
+    parser.add_argument("--order", choices = node_order.ORDERS, default = None, help = "renumbers the nodes once, so the searches touch less memory")
+    args = parser.parse_args(argv)
+    
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
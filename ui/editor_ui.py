@@ -149,6 +149,15 @@ class Ui_MainWindow(object):
         self.moveButton.setGeometry(QtCore.QRect(80, 6, 41, 31))
         self.moveButton.setStyleSheet("background-color: rgb(209, 209, 209);")
         self.moveButton.setObjectName("moveButton")
+        self.cancelButton = QtWidgets.QPushButton(self.mainTab)
+        self.cancelButton.setEnabled(False)
+        self.cancelButton.setGeometry(QtCore.QRect(260, 6, 41, 31))
+        self.cancelButton.setStyleSheet("background-color: rgb(209, 209, 209);")
+        self.cancelButton.setObjectName("cancelButton")
+        self.compareButton = QtWidgets.QPushButton(self.mainTab)
+        self.compareButton.setGeometry(QtCore.QRect(320, 6, 61, 31))
+        self.compareButton.setStyleSheet("background-color: rgb(209, 209, 209);")
+        self.compareButton.setObjectName("compareButton")
         self.toolbarTab.addTab(self.mainTab, "")
         self.generatorTab = QtWidgets.QWidget()
         self.generatorTab.setObjectName("generatorTab")
@@ -187,6 +196,70 @@ class Ui_MainWindow(object):
         self.maxConSpin.setProperty("value", 1)
         self.maxConSpin.setObjectName("maxConSpin")
         self.toolbarTab.addTab(self.generatorTab, "")
+        self.playbackTab = QtWidgets.QWidget()
+        self.playbackTab.setObjectName("playbackTab")
+        self.recordCheck = QtWidgets.QCheckBox(self.playbackTab)
+        self.recordCheck.setGeometry(QtCore.QRect(10, 12, 101, 17))
+        self.recordCheck.setStyleSheet("color: rgb(255, 255, 255);")
+        self.recordCheck.setObjectName("recordCheck")
+        self.playButton = QtWidgets.QPushButton(self.playbackTab)
+        self.playButton.setGeometry(QtCore.QRect(120, 6, 41, 31))
+        self.playButton.setStyleSheet("background-color: rgb(209, 209, 209);")
+        self.playButton.setObjectName("playButton")
+        self.traceSlider = QtWidgets.QSlider(self.playbackTab)
+        self.traceSlider.setGeometry(QtCore.QRect(170, 12, 241, 20))
+        self.traceSlider.setMaximum(0)
+        self.traceSlider.setOrientation(QtCore.Qt.Horizontal)
+        self.traceSlider.setObjectName("traceSlider")
+        self.speedSpin = QtWidgets.QSpinBox(self.playbackTab)
+        self.speedSpin.setGeometry(QtCore.QRect(420, 8, 141, 31))
+        self.speedSpin.setStyleSheet("background-color: rgb(255, 255, 255);")
+        self.speedSpin.setMinimum(1)
+        self.speedSpin.setMaximum(100000)
+        self.speedSpin.setObjectName("speedSpin")
+        self.toolbarTab.addTab(self.playbackTab, "")
+        self.routesTab = QtWidgets.QWidget()
+        self.routesTab.setObjectName("routesTab")
+        self.routeSpin = QtWidgets.QSpinBox(self.routesTab)
+        self.routeSpin.setGeometry(QtCore.QRect(10, 8, 111, 31))
+        self.routeSpin.setStyleSheet("background-color: rgb(255, 255, 255);")
+        self.routeSpin.setMinimum(1)
+        self.routeSpin.setMaximum(5)
+        self.routeSpin.setObjectName("routeSpin")
+        self.overlapLabel = QtWidgets.QLabel(self.routesTab)
+        self.overlapLabel.setGeometry(QtCore.QRect(140, 8, 81, 31))
+        self.overlapLabel.setStyleSheet("color: rgb(255, 255, 255);")
+        self.overlapLabel.setObjectName("overlapLabel")
+        self.overlapSpin = QtWidgets.QSpinBox(self.routesTab)
+        self.overlapSpin.setGeometry(QtCore.QRect(220, 8, 81, 31))
+        self.overlapSpin.setStyleSheet("background-color: rgb(255, 255, 255);")
+        self.overlapSpin.setMaximum(100)
+        self.overlapSpin.setProperty("value", 80)
+        self.overlapSpin.setObjectName("overlapSpin")
+        self.parallelCheck = QtWidgets.QCheckBox(self.routesTab)
+        self.parallelCheck.setGeometry(QtCore.QRect(320, 12, 131, 17))
+        self.parallelCheck.setStyleSheet("color: rgb(255, 255, 255);")
+        self.parallelCheck.setObjectName("parallelCheck")
+        self.allTargetsCheck = QtWidgets.QCheckBox(self.routesTab)
+        self.allTargetsCheck.setGeometry(QtCore.QRect(460, 12, 101, 17))
+        self.allTargetsCheck.setStyleSheet("color: rgb(255, 255, 255);")
+        self.allTargetsCheck.setObjectName("allTargetsCheck")
+        self.toolbarTab.addTab(self.routesTab, "")
+        self.rangeTab = QtWidgets.QWidget()
+        self.rangeTab.setObjectName("rangeTab")
+        self.bandLabel = QtWidgets.QLabel(self.rangeTab)
+        self.bandLabel.setGeometry(QtCore.QRect(10, 8, 51, 31))
+        self.bandLabel.setStyleSheet("color: rgb(255, 255, 255);")
+        self.bandLabel.setObjectName("bandLabel")
+        self.bandEdit = QtWidgets.QLineEdit(self.rangeTab)
+        self.bandEdit.setGeometry(QtCore.QRect(60, 8, 241, 31))
+        self.bandEdit.setStyleSheet("background-color: rgb(255, 255, 255);")
+        self.bandEdit.setObjectName("bandEdit")
+        self.rangeButton = QtWidgets.QPushButton(self.rangeTab)
+        self.rangeButton.setGeometry(QtCore.QRect(320, 6, 111, 31))
+        self.rangeButton.setStyleSheet("background-color: rgb(209, 209, 209);")
+        self.rangeButton.setObjectName("rangeButton")
+        self.toolbarTab.addTab(self.rangeTab, "")
         self.frameGV = QtWidgets.QFrame(self.centralwidget)
         self.frameGV.setGeometry(QtCore.QRect(30, 90, 571, 271))
         self.frameGV.setFrameShape(QtWidgets.QFrame.StyledPanel)
@@ -197,7 +270,7 @@ class Ui_MainWindow(object):
         self.graphicsView.setMouseTracking(True)
         self.graphicsView.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         self.graphicsView.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
-        self.graphicsView.setTransformationAnchor(QtWidgets.QGraphicsView.NoAnchor)
+        self.graphicsView.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
         self.graphicsView.setViewportUpdateMode(QtWidgets.QGraphicsView.SmartViewportUpdate)
         self.graphicsView.setObjectName("graphicsView")
         self.generateButton = QtWidgets.QPushButton(self.centralwidget)
@@ -210,6 +283,10 @@ class Ui_MainWindow(object):
         self.menubar.setObjectName("menubar")
         self.menuFile = QtWidgets.QMenu(self.menubar)
         self.menuFile.setObjectName("menuFile")
+        self.menuGraph = QtWidgets.QMenu(self.menubar)
+        self.menuGraph.setObjectName("menuGraph")
+        self.menuProfiling = QtWidgets.QMenu(self.menubar)
+        self.menuProfiling.setObjectName("menuProfiling")
         MainWindow.setMenuBar(self.menubar)
         self.statusbar = QtWidgets.QStatusBar(MainWindow)
         self.statusbar.setObjectName("statusbar")
@@ -222,9 +299,38 @@ class Ui_MainWindow(object):
         self.openAction.setObjectName("openAction")
         self.saveAction = QtWidgets.QAction(MainWindow)
         self.saveAction.setObjectName("saveAction")
+        self.saveTilesAction = QtWidgets.QAction(MainWindow)
+        self.saveTilesAction.setObjectName("saveTilesAction")
+        self.componentsAction = QtWidgets.QAction(MainWindow)
+        self.componentsAction.setObjectName("componentsAction")
+        self.profilingAction = QtWidgets.QAction(MainWindow)
+        self.profilingAction.setCheckable(True)
+        self.profilingAction.setObjectName("profilingAction")
+        self.handlerStatsAction = QtWidgets.QAction(MainWindow)
+        self.handlerStatsAction.setObjectName("handlerStatsAction")
+        self.memoryReportAction = QtWidgets.QAction(MainWindow)
+        self.memoryReportAction.setObjectName("memoryReportAction")
+        self.resultCacheAction = QtWidgets.QAction(MainWindow)
+        self.resultCacheAction.setObjectName("resultCacheAction")
+        self.saveProfileAction = QtWidgets.QAction(MainWindow)
+        self.saveProfileAction.setObjectName("saveProfileAction")
+        self.exportStatsAction = QtWidgets.QAction(MainWindow)
+        self.exportStatsAction.setObjectName("exportStatsAction")
         self.menuFile.addAction(self.openAction)
         self.menuFile.addAction(self.saveAction)
+        self.menuFile.addAction(self.saveTilesAction)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.exportStatsAction)
+        self.menuGraph.addAction(self.componentsAction)
+        self.menuProfiling.addAction(self.profilingAction)
+        self.menuProfiling.addAction(self.handlerStatsAction)
+        self.menuProfiling.addAction(self.saveProfileAction)
+        self.menuProfiling.addSeparator()
+        self.menuProfiling.addAction(self.memoryReportAction)
+        self.menuProfiling.addAction(self.resultCacheAction)
         self.menubar.addAction(self.menuFile.menuAction())
+        self.menubar.addAction(self.menuGraph.menuAction())
+        self.menubar.addAction(self.menuProfiling.menuAction())
 
         self.retranslateUi(MainWindow)
         self.tabWidget.setCurrentIndex(1)
@@ -250,15 +356,42 @@ class Ui_MainWindow(object):
         self.selectionButton.setText(_translate("MainWindow", "Select"))
         self.startButton.setText(_translate("MainWindow", "Run"))
         self.moveButton.setText(_translate("MainWindow", "Move"))
+        self.cancelButton.setText(_translate("MainWindow", "Stop"))
+        self.compareButton.setToolTip(_translate("MainWindow", "Runs every engine on the start and end node and compares them"))
+        self.compareButton.setText(_translate("MainWindow", "Compare"))
         self.toolbarTab.setTabText(self.toolbarTab.indexOf(self.mainTab), _translate("MainWindow", "Main"))
         self.maxLabel.setText(_translate("MainWindow", "Max nodes:"))
         self.conLabel.setText(_translate("MainWindow", "Max connections:"))
         self.maxNodeSpin.setSuffix(_translate("MainWindow", " nodes"))
         self.maxConSpin.setSuffix(_translate("MainWindow", " nodes"))
         self.toolbarTab.setTabText(self.toolbarTab.indexOf(self.generatorTab), _translate("MainWindow", "Generator"))
+        self.recordCheck.setText(_translate("MainWindow", "Record search"))
+        self.playButton.setText(_translate("MainWindow", "Play"))
+        self.speedSpin.setSuffix(_translate("MainWindow", " steps/frame"))
+        self.toolbarTab.setTabText(self.toolbarTab.indexOf(self.playbackTab), _translate("MainWindow", "Playback"))
+        self.routeSpin.setSuffix(_translate("MainWindow", " routes"))
+        self.overlapLabel.setText(_translate("MainWindow", "Max overlap:"))
+        self.overlapSpin.setSuffix(_translate("MainWindow", " %"))
+        self.parallelCheck.setText(_translate("MainWindow", "Parallel spur searches"))
+        self.allTargetsCheck.setText(_translate("MainWindow", "All end points"))
+        self.toolbarTab.setTabText(self.toolbarTab.indexOf(self.routesTab), _translate("MainWindow", "Routes"))
+        self.bandLabel.setText(_translate("MainWindow", "Bands:"))
+        self.bandEdit.setText(_translate("MainWindow", "100, 200, 300"))
+        self.rangeButton.setText(_translate("MainWindow", "Show range"))
+        self.toolbarTab.setTabText(self.toolbarTab.indexOf(self.rangeTab), _translate("MainWindow", "Range"))
         self.generateButton.setText(_translate("MainWindow", "Generate Random Graph"))
         self.menuFile.setTitle(_translate("MainWindow", "File"))
+        self.menuGraph.setTitle(_translate("MainWindow", "Graph"))
+        self.menuProfiling.setTitle(_translate("MainWindow", "Profiling"))
         self.actionSave_as.setText(_translate("MainWindow", "Save as..."))
         self.actionExit.setText(_translate("MainWindow", "Exit"))
         self.openAction.setText(_translate("MainWindow", "Open"))
         self.saveAction.setText(_translate("MainWindow", "Save"))
+        self.saveTilesAction.setText(_translate("MainWindow", "Save as tiles..."))
+        self.componentsAction.setText(_translate("MainWindow", "Colour components"))
+        self.profilingAction.setText(_translate("MainWindow", "Enable profiling"))
+        self.handlerStatsAction.setText(_translate("MainWindow", "Show handler stats"))
+        self.memoryReportAction.setText(_translate("MainWindow", "Show memory report"))
+        self.resultCacheAction.setText(_translate("MainWindow", "Show result cache statistics"))
+        self.saveProfileAction.setText(_translate("MainWindow", "Save profile..."))
+        self.exportStatsAction.setText(_translate("MainWindow", "Export solver stats..."))